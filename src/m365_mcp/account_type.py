@@ -9,28 +9,43 @@ Microsoft Graph API endpoints, as personal accounts have different API
 capabilities and limitations compared to work/school accounts.
 """
 
+import base64
+import functools
+import json
 import logging
 from typing import Any
-
-import jwt
+from urllib.parse import urlsplit
 
 logger = logging.getLogger(__name__)
 
+# Issuer host for Microsoft identity platform tokens
+ISSUER_HOST = "login.microsoftonline.com"
+
+# Tenant ID used in the issuer of personal (consumer) account tokens
+PERSONAL_TENANT_ID = "9188040d-6c67-4c5b-b112-36a304b66dad"
+
 # Personal Microsoft account domains
-PERSONAL_DOMAINS = {
-    "outlook.com",
-    "hotmail.com",
-    "live.com",
-    "msn.com",
-}
+PERSONAL_DOMAINS = frozenset(
+    {
+        "outlook.com",
+        "hotmail.com",
+        "live.com",
+        "msn.com",
+    }
+)
+
+# "@domain" suffixes for a str.endswith() check on lower-cased UPNs
+_PERSONAL_SUFFIXES = tuple(f"@{domain}" for domain in sorted(PERSONAL_DOMAINS))
 
 
 def detect_account_type(access_token: str, user_info: dict[str, Any]) -> str:
     """Detect whether a Microsoft account is personal or work/school.
 
-    This function uses a two-tier detection strategy:
-    1. Primary: Decode the JWT access token and check the issuer (iss) claim
-    2. Fallback: Check the userPrincipalName domain against known personal
+    This function uses a tiered detection strategy:
+    1. Shortcut: A userPrincipalName ending in a known personal domain
+       (for example ``@outlook.com``) is personal without decoding the token
+    2. Primary: Decode the JWT access token and check the issuer (iss) claim
+    3. Fallback: Check the userPrincipalName domain against known personal
        account domains
 
     Args:
@@ -51,17 +66,23 @@ def detect_account_type(access_token: str, user_info: dict[str, Any]) -> str:
         >>> print(account_type)
         "personal"
     """
-    # Try JWT token decoding first (most reliable method)
+    upn = user_info.get("userPrincipalName")
+
+    # Personal-domain UPNs need no token decode
+    if upn and upn.lower().endswith(_PERSONAL_SUFFIXES):
+        logger.info("Account type detected via domain: personal")
+        return "personal"
+
+    # Try JWT token decoding next (most reliable method)
     try:
         account_type = _decode_token_unverified(access_token)
         if account_type:
             logger.info(f"Account type detected via JWT: {account_type}")
             return account_type
-    except Exception as e:
+    except (ValueError, KeyError) as e:
         logger.warning(f"JWT token decoding failed, falling back to domain check: {e}")
 
     # Fallback to domain pattern matching
-    upn = user_info.get("userPrincipalName")
     if upn:
         account_type = _check_upn_domain(upn)
         if account_type:
@@ -95,43 +116,45 @@ def _decode_token_unverified(token: str) -> str | None:
         detection failed.
 
     Raises:
-        Exception: If JWT decoding fails due to malformed token.
+        ValueError: If the token is not a well-formed JWT (wrong number of
+            segments, invalid base64url, or a payload that is not a JSON
+            object).
     """
+    # Only the payload's "iss" claim is needed, so split the compact JWS
+    # form directly instead of going through a full JWT library decode.
+    # binascii.Error and json.JSONDecodeError are both ValueError subclasses.
     try:
-        # Decode without verification (see security note above)
-        payload = jwt.decode(
-            token,
-            options={
-                "verify_signature": False,
-                "verify_aud": False,
-                "verify_exp": False,
-            },
-        )
-
-        # Check issuer claim
-        issuer = payload.get("iss", "")
-
-        # Personal accounts use consumers tenant
-        # Example: https://login.microsoftonline.com/9188040d-6c67-4c5b-b112-36a304b66dad/v2.0
-        if "9188040d-6c67-4c5b-b112-36a304b66dad" in issuer:
-            return "personal"
-
-        # Work/school accounts use tenant-specific issuer
-        # Example: https://login.microsoftonline.com/{tenant-id}/v2.0
-        if "login.microsoftonline.com" in issuer:
-            return "work_school"
+        _header, payload_b64, _signature = token.split(".")
+        payload_b64 += "=" * (-len(payload_b64) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(payload_b64))
+    except ValueError as e:
+        logger.debug(f"JWT decode error: {e}")
+        raise ValueError("malformed access token") from e
 
+    if not isinstance(payload, dict):
+        raise ValueError("malformed access token")
+
+    # Check issuer claim: https://login.microsoftonline.com/{tenant-id}/v2.0
+    issuer = payload.get("iss", "")
+    parts = urlsplit(issuer) if isinstance(issuer, str) else None
+    tenant = parts.path[1:].partition("/")[0] if parts else ""
+    if parts is None or parts.netloc != ISSUER_HOST or not tenant:
         logger.debug(f"Unknown issuer format: {issuer}")
         return None
 
-    except jwt.DecodeError as e:
-        logger.debug(f"JWT decode error: {e}")
-        raise
+    # Personal accounts use the consumers tenant; every other tenant is
+    # a work/school directory
+    if tenant == PERSONAL_TENANT_ID:
+        return "personal"
+    return "work_school"
 
 
+@functools.lru_cache(maxsize=512)
 def _check_upn_domain(upn: str | None) -> str | None:
     """Check userPrincipalName domain to detect personal accounts.
 
+    The result depends only on the UPN string, so it is memoized.
+
     Args:
         upn: User Principal Name (email-like identifier), or None.
 
@@ -145,17 +168,20 @@ def _check_upn_domain(upn: str | None) -> str | None:
         >>> _check_upn_domain("user@contoso.com")
         "work_school"
     """
-    if not upn or "@" not in upn:
+    if not upn:
         return None
 
     # Extract domain (handle case-insensitivity)
-    domain = upn.split("@")[-1].lower()
+    at = upn.rfind("@")
+    if at < 0:
+        return None
+    domain = upn[at + 1 :].lower()
 
     # Remove any subdomains (e.g., user@mail.outlook.com -> outlook.com)
-    domain_parts = domain.split(".")
-    if len(domain_parts) >= 2:
-        # Get the last two parts (e.g., outlook.com)
-        domain = ".".join(domain_parts[-2:])
+    last_dot = domain.rfind(".")
+    if last_dot > 0:
+        # Keep the last two labels (e.g., outlook.com)
+        domain = domain[domain.rfind(".", 0, last_dot) + 1 :]
 
     # Check against known personal account domains
     if domain in PERSONAL_DOMAINS:
@@ -1,11 +1,31 @@
+from __future__ import annotations
+
+import atexit
+import contextlib
+import functools
 import pathlib as pl
-import json
 import logging
 import os
 import sys
-from typing import Any, NamedTuple
+import tempfile
+import threading
+import time
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+import orjson
+
+from .account_type import _check_upn_domain
 
-import msal
+# msal pulls in requests and cryptography, so it is imported inside the
+# functions that need it to keep CLI and server start-up fast.
+if TYPE_CHECKING:
+    import msal
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows has no fcntl
+    fcntl = None
 
 # Note: Environment variables should be loaded by the caller (server.py or authenticate.py)
 # before importing this module
@@ -15,13 +35,53 @@ CACHE_FILE = pl.Path.home() / ".m365_mcp_token_cache.json"
 METADATA_FILE = pl.Path.home() / ".m365_mcp_account_metadata.json"
 
 # MSAL treats OIDC scopes such as offline_access as reserved and adds them
-# internally, so callers must only provide Graph scopes.
-SCOPES = ["https://graph.microsoft.com/.default"]
+# internally, so callers must only provide Graph scopes. Tuples keep the
+# shared constants immutable; MSAL accepts any list, tuple, or set.
+SCOPES = ("https://graph.microsoft.com/.default",)
 DEVICE_FLOW_SCOPES = SCOPES
 INTERACTIVE_AUTH_ENV_VAR = "M365_MCP_INTERACTIVE_AUTH"
 
 logger = logging.getLogger(__name__)
 
+# Canonical account type strings. Values parsed from the metadata file are
+# swapped for these so later comparisons can short-circuit on identity.
+_ACCOUNT_TYPES = {
+    account_type: sys.intern(account_type)
+    for account_type in ("personal", "work_school", "unknown")
+}
+
+# Process-wide MSAL application, keyed by (client_id, tenant_id). Reusing the
+# same SerializableTokenCache keeps silent token lookups in memory.
+_APP_LOCK = threading.Lock()
+_APP_SINGLETON: (
+    tuple[str, str, msal.PublicClientApplication, msal.SerializableTokenCache] | None
+) = None
+# Fallback app for the "consumers" authority, tied to the token cache it
+# shares with the main app; dropped whenever that cache is replaced.
+_CONSUMER_APP: (
+    tuple[msal.SerializableTokenCache, msal.PublicClientApplication] | None
+) = None
+# (st_mtime_ns, st_size) of the token cache file as last read or written by
+# this process; a mismatch means another process updated it.
+_CACHE_SIGNATURE: tuple[int, int] | None = None
+# Token cache changes from silent refreshes in get_token() are written at
+# most once per interval; anything still pending is flushed at exit.
+TOKEN_CACHE_FLUSH_INTERVAL = 5.0
+_FLUSH_LOCK = threading.Lock()
+_PENDING_CACHE: msal.SerializableTokenCache | None = None
+_LAST_FLUSH = float("-inf")
+# Parent directories already created by _atomic_write_text().
+_READY_DIRS: set[pl.Path] = set()
+# Parsed account metadata keyed by (path, st_mtime_ns, st_size) of the file.
+_METADATA_CACHE: tuple[pl.Path, int, int, dict[str, dict]] | None = None
+# Account types detected since the last metadata write, keyed by account ID.
+# They are written in one batch once METADATA_FLUSH_THRESHOLD accumulate,
+# after explicit sign-ins, after list_accounts(), and at exit.
+METADATA_FLUSH_THRESHOLD = 8
+_PENDING_ACCOUNT_TYPES: dict[str, str] = {}
+# Account IDs whose type get_token() has already resolved in this process.
+_DETECTED_ACCOUNTS: set[str] = set()
+
 
 class Account(NamedTuple):
     username: str
@@ -41,12 +101,38 @@ class AccountRemovalResult(NamedTuple):
     database_cache_removed: dict[str, int]
 
 
+def _index_accounts(accounts: list[dict[str, str]]) -> dict[str, dict[str, str]]:
+    """Map lower-cased home account IDs and usernames to their accounts.
+
+    When several accounts share a key, the first one wins, matching a
+    front-to-back scan with ``_account_matches_identifier``.
+    """
+    index: dict[str, dict[str, str]] = {}
+    for account in accounts:
+        index.setdefault(account.get("home_account_id", "").lower(), account)
+        index.setdefault(account.get("username", "").lower(), account)
+    return index
+
+
 def _select_account(
     accounts: list[dict[str, str]],
     result: dict[str, Any],
     fallback: dict[str, str] | None,
+    accounts_by_key: dict[str, dict[str, str]] | None = None,
+    default_last: bool = False,
 ) -> dict[str, str] | None:
-    """Select the account that matches the token result, if possible."""
+    """Select the account that matches the token result, if possible.
+
+    Args:
+        accounts: Cached MSAL accounts.
+        result: Token result returned by MSAL.
+        fallback: Account to return when already known.
+        accounts_by_key: ``_index_accounts(accounts)``, if the caller already
+            built it; otherwise it is built here when needed.
+        default_last: Without a username match, return the most recently
+            added account instead of the first. Device-flow sign-ins use
+            this, since the account they just added is the newest.
+    """
     if fallback:
         return fallback
 
@@ -56,14 +142,29 @@ def _select_account(
         preferred_username = id_token_claims.get("preferred_username")
 
     if preferred_username:
-        for account in accounts:
-            if account.get("username", "").lower() == preferred_username.lower():
-                return account
+        if accounts_by_key is None:
+            accounts_by_key = _index_accounts(accounts)
+        account = accounts_by_key.get(preferred_username.lower())
+        if account is not None:
+            return account
+
+    if not accounts:
+        return None
+    return accounts[-1] if default_last else accounts[0]
 
-    return accounts[0] if accounts else None
+
+def _cache_file_signature() -> tuple[int, int] | None:
+    """Return the token cache file's (mtime_ns, size), or None if absent."""
+    try:
+        stat = CACHE_FILE.stat()
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
 
 
 def _read_cache() -> str | None:
+    global _CACHE_SIGNATURE
+    _CACHE_SIGNATURE = _cache_file_signature()
     try:
         return CACHE_FILE.read_text()
     except FileNotFoundError:
@@ -71,8 +172,10 @@ def _read_cache() -> str | None:
 
 
 def _write_cache(content: str) -> None:
-    CACHE_FILE.parent.mkdir(parents=True, exist_ok=True)
-    CACHE_FILE.write_text(content)
+    global _CACHE_SIGNATURE, _LAST_FLUSH
+    _atomic_write_text(CACHE_FILE, content)
+    _CACHE_SIGNATURE = _cache_file_signature()
+    _LAST_FLUSH = time.monotonic()
 
 
 def _interactive_auth_enabled() -> bool:
@@ -89,6 +192,39 @@ def _raise_interactive_auth_required(account_id: str | None) -> None:
     )
 
 
+@functools.lru_cache(maxsize=1)
+def _env_config() -> tuple[str, str]:
+    """Snapshot the client and tenant IDs from the environment.
+
+    Returns:
+        Tuple of (client_id, tenant_id); tenant_id defaults to "common".
+
+    Raises:
+        ValueError: If M365_MCP_CLIENT_ID is not set.
+    """
+    client_id = os.getenv("M365_MCP_CLIENT_ID")
+    if not client_id:
+        raise ValueError("M365_MCP_CLIENT_ID environment variable is required")
+    return client_id, os.getenv("M365_MCP_TENANT_ID", "common")
+
+
+def reset_env_cache() -> None:
+    """Forget the cached client and tenant IDs so the next call re-reads them."""
+    _env_config.cache_clear()
+
+
+def _load_token_cache() -> msal.SerializableTokenCache:
+    """Return a token cache hydrated from the on-disk cache file."""
+
+    import msal
+
+    cache = msal.SerializableTokenCache()
+    cache_content = _read_cache()
+    if cache_content:
+        cache.deserialize(cache_content)
+    return cache
+
+
 def _build_app(
     tenant_id: str, cache: msal.SerializableTokenCache | None = None
 ) -> msal.PublicClientApplication:
@@ -104,15 +240,11 @@ def _build_app(
         Initialized PublicClientApplication.
     """
 
-    client_id = os.getenv("M365_MCP_CLIENT_ID")
-    if not client_id:
-        raise ValueError("M365_MCP_CLIENT_ID environment variable is required")
+    import msal
 
-    cache_instance = cache or msal.SerializableTokenCache()
-    if cache is None:
-        cache_content = _read_cache()
-        if cache_content:
-            cache_instance.deserialize(cache_content)
+    client_id, _ = _env_config()
+
+    cache_instance = cache if cache is not None else _load_token_cache()
 
     authority = f"https://login.microsoftonline.com/{tenant_id}"
 
@@ -121,27 +253,217 @@ def _build_app(
     )
 
 
+def _consumer_app(
+    cache: msal.SerializableTokenCache | None,
+) -> msal.PublicClientApplication:
+    """Return a "consumers" authority app sharing the given token cache.
+
+    The app is reused for as long as the main app keeps the same cache, so
+    repeated device-flow fallbacks do not construct a new client each time.
+    """
+    global _CONSUMER_APP
+    if cache is None:
+        return _build_app("consumers")
+
+    with _APP_LOCK:
+        cached = _CONSUMER_APP
+        if cached is not None and cached[0] is cache:
+            return cached[1]
+        app = _build_app("consumers", cache=cache)
+        _CONSUMER_APP = (cache, app)
+        return app
+
+
+def _remember_metadata(metadata: dict[str, dict], stat: os.stat_result) -> None:
+    """Record parsed metadata against the metadata file's stat result."""
+    global _METADATA_CACHE
+    _METADATA_CACHE = (METADATA_FILE, stat.st_mtime_ns, stat.st_size, metadata)
+
+
 def _read_metadata() -> dict[str, dict]:
     """Read account metadata cache containing account types and other metadata.
 
+    The parsed file is kept in memory and reused until the file's mtime or
+    size changes, so repeated reads cost a single ``stat`` call.
+
+    Account types detected but not yet flushed are overlaid on the result.
+
     Returns:
         Dictionary mapping account_id to metadata dict with 'account_type' field.
     """
     try:
-        content = METADATA_FILE.read_text()
-        return json.loads(content)
-    except (FileNotFoundError, json.JSONDecodeError):
-        return {}
+        stat = METADATA_FILE.stat()
+    except FileNotFoundError:
+        if not _PENDING_ACCOUNT_TYPES:
+            return {}
+        return {
+            account_id: {"account_type": account_type}
+            for account_id, account_type in _PENDING_ACCOUNT_TYPES.items()
+        }
+
+    cached = _METADATA_CACHE
+    if cached is not None and cached[:3] == (
+        METADATA_FILE,
+        stat.st_mtime_ns,
+        stat.st_size,
+    ):
+        return cached[3]
+
+    try:
+        metadata = orjson.loads(METADATA_FILE.read_bytes())
+    except (FileNotFoundError, orjson.JSONDecodeError):
+        # Unreadable file: still report pending types so a flush keeps them
+        metadata = {}
+
+    for entry in metadata.values():
+        account_type = entry.get("account_type")
+        if isinstance(account_type, str):
+            entry["account_type"] = _ACCOUNT_TYPES.get(account_type, account_type)
+
+    for account_id, account_type in _PENDING_ACCOUNT_TYPES.items():
+        metadata.setdefault(account_id, {})["account_type"] = account_type
+
+    _remember_metadata(metadata, stat)
+    return metadata
+
+
+@contextlib.contextmanager
+def _file_lock(path: pl.Path) -> Iterator[None]:
+    """Hold an exclusive advisory lock on a sibling ``.lock`` file.
+
+    On platforms without ``fcntl`` the lock is a no-op; writes remain atomic
+    through ``os.replace`` but concurrent writers are not serialized.
+    """
+    if fcntl is None:
+        yield
+        return
+
+    lock_path = path.with_name(f"{path.name}.lock")
+    with open(lock_path, "a") as lock_file:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+
+def _ensure_parent_dir(path: pl.Path) -> None:
+    """Create a file's parent directory, once per process."""
+    if path.parent not in _READY_DIRS:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        _READY_DIRS.add(path.parent)
+
+
+def _file_has_bytes(path: pl.Path, data: bytes) -> bool:
+    """Return True if ``path`` already holds exactly ``data``."""
+    try:
+        if path.stat().st_size != len(data):
+            return False
+        return path.read_bytes() == data
+    except FileNotFoundError:
+        return False
+
+
+def _replace_file_text(path: pl.Path, content: str) -> bool:
+    """Write ``content`` to a temporary file and move it over ``path``.
+
+    The write is skipped when the file already has identical contents. The
+    caller must hold ``_file_lock(path)``.
+
+    Returns:
+        True if the file was replaced.
+    """
+    data = content.encode("utf-8")
+    if _file_has_bytes(path, data):
+        return False
+
+    fd, tmp_name = tempfile.mkstemp(
+        dir=path.parent, prefix=f"{path.name}.", suffix=".tmp"
+    )
+    try:
+        with os.fdopen(fd, "wb") as tmp_file:
+            tmp_file.write(data)
+            tmp_file.flush()
+            os.fsync(tmp_file.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(tmp_name)
+        raise
+    return True
+
+
+def _atomic_write_text(path: pl.Path, content: str) -> bool:
+    """Replace a file's contents atomically.
+
+    The content is written and fsynced to a temporary file in the same
+    directory, then moved over ``path`` with ``os.replace`` so readers never
+    observe a partially written file. Nothing is written if the file
+    already has the same contents.
+
+    Args:
+        path: Destination file.
+        content: Text to write.
+
+    Returns:
+        True if the file was replaced.
+    """
+    _ensure_parent_dir(path)
+    with _file_lock(path):
+        return _replace_file_text(path, content)
 
 
 def _write_metadata(metadata: dict[str, dict]) -> None:
-    """Write account metadata cache.
+    """Write account metadata cache atomically.
+
+    The written dict becomes the in-memory copy returned by
+    ``_read_metadata()`` until the file changes on disk. Any pending account
+    types are expected to be part of ``metadata`` and are cleared.
 
     Args:
         metadata: Dictionary mapping account_id to metadata dict.
     """
-    METADATA_FILE.parent.mkdir(parents=True, exist_ok=True)
-    METADATA_FILE.write_text(json.dumps(metadata, indent=2))
+    _ensure_parent_dir(METADATA_FILE)
+    with _file_lock(METADATA_FILE):
+        _store_metadata(metadata)
+
+
+def _store_metadata(metadata: dict[str, dict]) -> None:
+    """Write metadata while the caller holds the metadata file lock."""
+    _replace_file_text(
+        METADATA_FILE,
+        orjson.dumps(metadata, option=orjson.OPT_INDENT_2).decode("utf-8"),
+    )
+    _PENDING_ACCOUNT_TYPES.clear()
+    _remember_metadata(metadata, METADATA_FILE.stat())
+
+
+def _flush_metadata() -> bool:
+    """Upsert pending account types into the metadata file.
+
+    The file is re-read under its lock before writing, so entries another
+    process wrote since this one last read the file are kept.
+
+    Returns:
+        True if the metadata file was written.
+    """
+    if not _PENDING_ACCOUNT_TYPES:
+        return False
+    _ensure_parent_dir(METADATA_FILE)
+    with _file_lock(METADATA_FILE):
+        _store_metadata(_read_metadata())
+    return True
+
+
+atexit.register(_flush_metadata)
+
+
+def _metadata_account_type(metadata: dict[str, dict], account_id: str) -> str:
+    """Return the cached account type for an account, or "unknown"."""
+    entry = metadata.get(account_id)
+    if entry is None:
+        return "unknown"
+    return entry.get("account_type", "unknown")
 
 
 def _initiate_device_flow(
@@ -154,6 +476,8 @@ def _initiate_device_flow(
     while reusing the same token cache.
     """
 
+    import msal
+
     def _start(current_app: msal.PublicClientApplication) -> dict[str, Any]:
         flow = current_app.initiate_device_flow(scopes=DEVICE_FLOW_SCOPES)
         if "user_code" in flow:
@@ -184,7 +508,7 @@ def _initiate_device_flow(
             if isinstance(app.token_cache, msal.SerializableTokenCache)
             else None
         )
-        consumer_app = _build_app("consumers", cache=cache)
+        consumer_app = _consumer_app(cache)
         return consumer_app, _start(consumer_app)
 
 
@@ -198,17 +522,17 @@ def _get_account_type(account_id: str, username: str) -> str:
     Returns:
         Account type: "personal", "work_school", or "unknown"
     """
-    # Check metadata cache first
+    # Check metadata cache first. _read_metadata() returns the in-memory
+    # copy, so a newly detected type is written through to it below.
     metadata = _read_metadata()
-    if account_id in metadata and "account_type" in metadata[account_id]:
-        return metadata[account_id]["account_type"]
+    entry = metadata.get(account_id)
+    if entry is not None and "account_type" in entry:
+        return entry["account_type"]
 
     # Detect account type using domain checking
     # Note: Microsoft Graph API access tokens are opaque and cannot be decoded
     # We rely on username (UPN) domain matching for detection
     try:
-        from m365_mcp.account_type import _check_upn_domain
-
         account_type = _check_upn_domain(username)
 
         if not account_type:
@@ -217,11 +541,11 @@ def _get_account_type(account_id: str, username: str) -> str:
             )
             return "unknown"
 
-        # Store in metadata cache
-        if account_id not in metadata:
-            metadata[account_id] = {}
-        metadata[account_id]["account_type"] = account_type
-        _write_metadata(metadata)
+        # Store in the in-memory metadata; the file is written in batches
+        metadata.setdefault(account_id, {})["account_type"] = account_type
+        _PENDING_ACCOUNT_TYPES[account_id] = account_type
+        if len(_PENDING_ACCOUNT_TYPES) >= METADATA_FLUSH_THRESHOLD:
+            _flush_metadata()
 
         logger.info(
             f"Account type detected and cached for {account_id}: {account_type}"
@@ -234,9 +558,40 @@ def _get_account_type(account_id: str, username: str) -> str:
 
 
 def get_app() -> tuple[msal.PublicClientApplication, str]:
-    tenant_id = os.getenv("M365_MCP_TENANT_ID", "common")
-    app = _build_app(tenant_id)
-    return app, tenant_id
+    """Return the shared MSAL application and its tenant ID.
+
+    The application is built once and reused while the client ID, tenant ID,
+    and on-disk token cache are unchanged. It is rebuilt when another process
+    (for example ``authenticate.py``) rewrites the token cache file. The IDs
+    are read from the environment once; call ``reset_env_cache()`` after
+    changing them.
+
+    Returns:
+        Tuple of the PublicClientApplication and the tenant ID.
+
+    Raises:
+        ValueError: If M365_MCP_CLIENT_ID is not set.
+    """
+    global _APP_SINGLETON
+    client_id, tenant_id = _env_config()
+    signature = _cache_file_signature()
+
+    with _APP_LOCK:
+        cached = _APP_SINGLETON
+        if cached is not None and _CACHE_SIGNATURE == signature:
+            if cached[0] == client_id and cached[1] == tenant_id:
+                return cached[2], tenant_id
+            # Same file, new configuration: keep any deferred refreshes.
+            _flush_token_cache()
+        elif cached is not None:
+            # Another process rewrote the cache; its copy wins over refreshes
+            # this process has not flushed yet.
+            _discard_pending_token_cache(cached[3])
+
+        cache = _load_token_cache()
+        app = _build_app(tenant_id, cache=cache)
+        _APP_SINGLETON = (client_id, tenant_id, app, cache)
+        return app, tenant_id
 
 
 def _account_matches_identifier(
@@ -308,8 +663,7 @@ def _account_from_msal(account: dict[str, str], detect_type: bool = True) -> Acc
     if detect_type:
         account_type = _get_account_type(account_id, username)
     else:
-        metadata = _read_metadata()
-        account_type = metadata.get(account_id, {}).get("account_type", "unknown")
+        account_type = _metadata_account_type(_read_metadata(), account_id)
 
     return Account(
         username=username,
@@ -320,6 +674,8 @@ def _account_from_msal(account: dict[str, str], detect_type: bool = True) -> Acc
 
 def _save_token_cache_if_changed(app: msal.PublicClientApplication) -> bool:
     """Persist the MSAL token cache when it has changed."""
+    import msal
+
     cache = app.token_cache
     if isinstance(cache, msal.SerializableTokenCache) and cache.has_state_changed:
         _write_cache(cache.serialize())
@@ -327,25 +683,97 @@ def _save_token_cache_if_changed(app: msal.PublicClientApplication) -> bool:
     return False
 
 
-def get_token(account_id: str | None = None, force_refresh: bool = False) -> str:
-    app, tenant_id = get_app()
+def _defer_token_cache_save(app: msal.PublicClientApplication) -> None:
+    """Persist token cache changes, at most once per flush interval.
 
-    accounts = app.get_accounts()
-    account = None
+    The first change is written immediately. Further changes within
+    ``TOKEN_CACHE_FLUSH_INTERVAL`` seconds of the last write stay in memory
+    until a later call after the interval, or the exit-time flush.
+    """
+    global _PENDING_CACHE
+    import msal
 
-    if account_id:
-        account = next(
-            (a for a in accounts if _account_matches_identifier(a, account_id)),
-            None,
-        )
-    elif accounts:
-        account = accounts[0]
+    cache = app.token_cache
+    if not (isinstance(cache, msal.SerializableTokenCache) and cache.has_state_changed):
+        return
+
+    with _FLUSH_LOCK:
+        _PENDING_CACHE = cache
+        if time.monotonic() - _LAST_FLUSH < TOKEN_CACHE_FLUSH_INTERVAL:
+            return
+    _flush_token_cache()
+
+
+def _flush_token_cache() -> bool:
+    """Write the deferred token cache if it still has unsaved changes.
+
+    Returns:
+        True if the cache file was written.
+    """
+    global _PENDING_CACHE
+    with _FLUSH_LOCK:
+        cache = _PENDING_CACHE
+        _PENDING_CACHE = None
+        if cache is None or not cache.has_state_changed:
+            return False
+        _write_cache(cache.serialize())
+    return True
+
+
+def _discard_pending_token_cache(cache: msal.SerializableTokenCache) -> None:
+    """Drop a deferred save for a token cache that is being replaced."""
+    global _PENDING_CACHE
+    with _FLUSH_LOCK:
+        if _PENDING_CACHE is cache:
+            logger.debug("Discarding unsaved token cache changes")
+            _PENDING_CACHE = None
+
+
+atexit.register(_flush_token_cache)
+
+
+def get_token(
+    account_id: str | None = None,
+    force_refresh: bool = False,
+    *,
+    account: dict[str, str] | None = None,
+) -> str:
+    """Return a Graph access token, refreshing it silently when possible.
+
+    Args:
+        account_id: Optional home account ID or username to select.
+        force_refresh: Bypass MSAL's access-token cache and refresh.
+        account: Already-resolved MSAL account dictionary. When given, the
+            cached accounts are not enumerated to find a match.
+
+    Returns:
+        The access token string.
+
+    Raises:
+        RuntimeError: If no cached token is available and interactive
+            authentication is disabled.
+    """
+    app, tenant_id = get_app()
+
+    if account is not None:
+        accounts = [account]
+        accounts_by_key = None
+    else:
+        accounts = app.get_accounts()
+        accounts_by_key = _index_accounts(accounts)
+        if account_id:
+            account = accounts_by_key.get(account_id.lower())
+        elif accounts:
+            account = accounts[0]
 
     if account_id and account is None:
         _raise_interactive_auth_required(account_id)
 
-    silent_kwargs = {"force_refresh": True} if force_refresh else {}
-    result = app.acquire_token_silent(SCOPES, account=account, **silent_kwargs)
+    # With no cached account there is nothing for a silent lookup to find.
+    result = None
+    if account is not None:
+        silent_kwargs = {"force_refresh": True} if force_refresh else {}
+        result = app.acquire_token_silent(SCOPES, account=account, **silent_kwargs)
 
     if result and "error" in result:
         logger.warning(
@@ -370,20 +798,23 @@ def get_token(account_id: str | None = None, force_refresh: bool = False) -> str
         )
         result = app.acquire_token_by_device_flow(flow)
         accounts = app.get_accounts()
-        account = _select_account(accounts, result, account)
+        account = _select_account(accounts, result, account, _index_accounts(accounts))
     else:
-        account = _select_account(accounts, result, account)
+        account = _select_account(accounts, result, account, accounts_by_key)
 
     if "error" in result:
         raise Exception(
             f"Auth failed: {result.get('error_description', result['error'])}"
         )
 
-    _save_token_cache_if_changed(app)
+    _defer_token_cache_save(app)
 
-    # Detect and cache account type for this account
-    if account:
-        _get_account_type(account["home_account_id"], account["username"])
+    # Detect and cache account type once per account per process; the token
+    # does not depend on it, so later calls skip the metadata lookup.
+    if account and account["home_account_id"] not in _DETECTED_ACCOUNTS:
+        account_id = account["home_account_id"]
+        if _get_account_type(account_id, account["username"]) != "unknown":
+            _DETECTED_ACCOUNTS.add(account_id)
 
     return result["access_token"]
 
@@ -398,19 +829,15 @@ def list_accounts() -> list[Account]:
     app, _ = get_app()
     metadata = _read_metadata()
 
-    accounts = []
-    for a in app.get_accounts():
-        account_id = a["home_account_id"]
-        # Get account type from metadata cache, default to "unknown"
-        account_type = metadata.get(account_id, {}).get("account_type", "unknown")
-        accounts.append(
-            Account(
-                username=a["username"],
-                account_id=account_id,
-                account_type=account_type,
-            )
+    accounts = [
+        Account(
+            username=a["username"],
+            account_id=a["home_account_id"],
+            account_type=_metadata_account_type(metadata, a["home_account_id"]),
         )
-
+        for a in app.get_accounts()
+    ]
+    _flush_metadata()
     return accounts
 
 
@@ -498,6 +925,7 @@ def remove_account(account_id: str) -> AccountRemovalResult:
     removed_account = _account_from_msal(account, detect_type=False)
 
     app.remove_account(account)
+    _DETECTED_ACCOUNTS.discard(removed_account.account_id)
     token_cache_removed = _save_token_cache_if_changed(app)
 
     metadata = _read_metadata()
@@ -543,32 +971,17 @@ def authenticate_new_account() -> Account | None:
             f"Auth failed: {result.get('error_description', result['error'])}"
         )
 
-    cache = app.token_cache
-    if isinstance(cache, msal.SerializableTokenCache) and cache.has_state_changed:
-        _write_cache(cache.serialize())
+    _save_token_cache_if_changed(app)
 
     # Get the newly added account
-    accounts = app.get_accounts()
-    if accounts:
-        # Find the account that matches the token we just got
-        matched_account = None
-        for account in accounts:
-            if (
-                account.get("username", "").lower()
-                == result.get("id_token_claims", {})
-                .get("preferred_username", "")
-                .lower()
-            ):
-                matched_account = account
-                break
-
-        # If exact match not found, use the last account
-        if not matched_account:
-            matched_account = accounts[-1]
-
+    matched_account = _select_account(
+        app.get_accounts(), result, None, default_last=True
+    )
+    if matched_account is not None:
         # Detect and cache account type
         account_id = matched_account["home_account_id"]
         account_type = _get_account_type(account_id, matched_account["username"])
+        _flush_metadata()
 
         return Account(
             username=matched_account["username"],
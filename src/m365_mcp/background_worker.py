@@ -8,15 +8,22 @@ error handling.
 
 import asyncio
 import logging
+import random
+import threading
 import time
-import traceback
-from typing import Any, Optional
+from contextlib import contextmanager
+from typing import Any, Iterator, Optional
+
+import orjson
 
 from .cache import CacheManager
 from .cache_warming import get_inactive_warming_status
 
 logger = logging.getLogger(__name__)
 
+# UPDATE statements for _update_task_status(), keyed by the extra field names
+_UPDATE_SQL: dict[tuple[str, ...], str] = {}
+
 
 class BackgroundWorker:
     """
@@ -32,6 +39,9 @@ class BackgroundWorker:
         worker_task: The asyncio task running the worker loop
         max_retries: Maximum number of retries for failed tasks (default: 3)
         initial_backoff: Initial backoff delay in seconds (default: 1)
+        max_backoff: Upper bound on the backoff delay in seconds (default: 60)
+        idle_timeout: Seconds to wait for an enqueue notification before
+            checking the queue again when idle (default: 30)
     """
 
     def __init__(
@@ -40,6 +50,8 @@ class BackgroundWorker:
         tool_executor: Any,
         max_retries: int = 3,
         initial_backoff: float = 1.0,
+        idle_timeout: float = 30.0,
+        max_backoff: float = 60.0,
     ):
         """
         Initialize the background worker.
@@ -49,6 +61,11 @@ class BackgroundWorker:
             tool_executor: Callable that can execute tool operations
             max_retries: Maximum retry attempts for failed tasks
             initial_backoff: Initial backoff delay in seconds for retries
+            idle_timeout: Maximum idle wait between queue checks, in seconds.
+                Tasks enqueued through cache_manager wake the worker early;
+                the timeout picks up tasks added by other processes.
+            max_backoff: Cap on the retry backoff delay in seconds, before
+                jitter is applied
         """
         self.cache_manager = cache_manager
         self.tool_executor = tool_executor
@@ -56,7 +73,14 @@ class BackgroundWorker:
         self.worker_task: Optional[asyncio.Task] = None
         self.max_retries = max_retries
         self.initial_backoff = initial_backoff
+        self.max_backoff = max_backoff
+        self.idle_timeout = idle_timeout
         self.cache_warmer: Any | None = None
+        self._task_available = asyncio.Event()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Dedicated connection held between start() and stop()
+        self._conn: Any | None = None
+        self._conn_lock = threading.Lock()
 
         logger.info(
             "BackgroundWorker initialized",
@@ -90,7 +114,10 @@ class BackgroundWorker:
         if self.is_running:
             raise RuntimeError("Background worker is already running")
 
+        self._conn = self.cache_manager._create_connection()
         self.is_running = True
+        self._loop = asyncio.get_running_loop()
+        self.cache_manager.add_task_listener(self._notify_task_available)
         self.worker_task = asyncio.create_task(self._worker_loop())
 
         logger.info("Background worker started")
@@ -107,6 +134,9 @@ class BackgroundWorker:
             return
 
         self.is_running = False
+        self.cache_manager.remove_task_listener(self._notify_task_available)
+        # Wake the loop if it is idle-waiting for new tasks
+        self._task_available.set()
 
         if self.worker_task:
             try:
@@ -120,26 +150,82 @@ class BackgroundWorker:
                 except asyncio.CancelledError:
                     pass
 
+        with self._conn_lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
         logger.info("Background worker stopped")
 
+    @contextmanager
+    def _db(self) -> Iterator[Any]:
+        """
+        Context manager for the worker's database connection.
+
+        While the worker is running, queue operations reuse one dedicated
+        connection so its page and statement caches stay warm, each in its
+        own ``BEGIN IMMEDIATE`` transaction. Otherwise the cache manager's
+        shared connection is used.
+
+        Yields:
+            Database connection.
+        """
+        with self._conn_lock:
+            conn = self._conn
+            if conn is not None:
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    yield conn
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+                return
+
+        with self.cache_manager._db() as conn:
+            yield conn
+
+    def _notify_task_available(self) -> None:
+        """Wake the worker loop; safe to call from any thread."""
+        loop = self._loop
+        if loop is None or loop.is_closed():
+            return
+        try:
+            loop.call_soon_threadsafe(self._task_available.set)
+        except RuntimeError:
+            # Loop closed between the check and the call
+            pass
+
     async def _worker_loop(self) -> None:
         """
         Main worker loop that processes tasks from the queue.
 
         Continuously fetches and processes the next highest priority task
-        until the worker is stopped. Implements a short sleep between
-        iterations to prevent tight looping.
+        until the worker is stopped. When the queue is empty it waits for an
+        enqueue notification (or ``idle_timeout``) instead of polling.
         """
         logger.info("Worker loop started")
 
         while self.is_running:
             try:
-                # Process the next task
+                # Clear before claiming so an enqueue that lands after an
+                # empty claim still wakes the wait below.
+                self._task_available.clear()
                 processed = await self.process_next_task()
 
                 if not processed:
-                    # No tasks available, sleep briefly before checking again
-                    await asyncio.sleep(1.0)
+                    # No tasks available, wait until one is enqueued or a
+                    # backed-off retry becomes due
+                    timeout = self.idle_timeout
+                    retry_delay = await asyncio.to_thread(self._next_retry_delay)
+                    if retry_delay is not None:
+                        timeout = min(timeout, retry_delay)
+                    try:
+                        await asyncio.wait_for(
+                            self._task_available.wait(), timeout=timeout
+                        )
+                    except asyncio.TimeoutError:
+                        pass
                 else:
                     # Small delay between tasks to prevent overwhelming the system
                     await asyncio.sleep(0.1)
@@ -147,7 +233,8 @@ class BackgroundWorker:
             except Exception as e:
                 logger.error(
                     f"Unexpected error in worker loop: {e}",
-                    extra={"error": str(e), "traceback": traceback.format_exc()},
+                    extra={"error": str(e)},
+                    exc_info=True,
                 )
                 # Sleep longer on errors to avoid error loops
                 await asyncio.sleep(5.0)
@@ -164,8 +251,8 @@ class BackgroundWorker:
         Returns:
             bool: True if a task was processed, False if no tasks available
         """
-        # Atomically claim the next task.
-        task = self._claim_next_task()
+        # Atomically claim the next task off the event loop thread.
+        task = await asyncio.to_thread(self._claim_next_task)
 
         if not task:
             return False
@@ -188,15 +275,8 @@ class BackgroundWorker:
             # Execute the operation
             result = await self._execute_operation(operation, params)
 
-            # Mark task as completed
-            import json
-
-            self._update_task_status(
-                task_id=task_id,
-                status="completed",
-                completed_at=time.time(),
-                result_json=json.dumps(result),
-            )
+            # Mark task as completed; large results are encoded off the loop
+            await asyncio.to_thread(self._complete_task, task_id, result)
 
             logger.info(
                 f"Task {task_id} completed successfully",
@@ -216,13 +296,15 @@ class BackgroundWorker:
 
         Updates the highest-priority queued task to running in the same
         statement that returns it, preventing concurrent workers from claiming
-        the same queued task.
+        the same queued task. Tasks whose retry backoff has not elapsed are
+        skipped.
 
         Returns:
             Optional[dict[str, Any]]: Task details if available, None otherwise
         """
+        now = time.time()
         try:
-            with self.cache_manager._db() as conn:
+            with self._db() as conn:
                 cursor = conn.execute(
                     """
                     UPDATE cache_tasks
@@ -231,25 +313,24 @@ class BackgroundWorker:
                         SELECT task_id
                         FROM cache_tasks
                         WHERE status = 'queued'
+                          AND (retry_after IS NULL OR retry_after <= ?)
                         ORDER BY priority ASC, created_at ASC
                         LIMIT 1
                     )
                     RETURNING task_id, account_id, operation, parameters_json,
                               priority, status, retry_count, created_at
                     """,
-                    (time.time(),),
+                    (now, now),
                 )
 
                 row = cursor.fetchone()
 
                 if row:
-                    import json
-
                     return {
                         "task_id": row[0],
                         "account_id": row[1],
                         "operation": row[2],
-                        "parameters": json.loads(row[3]) if row[3] else {},
+                        "parameters": orjson.loads(row[3]) if row[3] else {},
                         "priority": row[4],
                         "status": row[5],
                         "retry_count": row[6],
@@ -262,6 +343,51 @@ class BackgroundWorker:
             logger.error(f"Error claiming next task: {e}")
             return None
 
+    def _next_retry_delay(self) -> Optional[float]:
+        """
+        Return seconds until the earliest backed-off queued task is due.
+
+        Returns:
+            Optional[float]: Delay in seconds, or None if no queued task is
+            waiting on a retry backoff
+        """
+        now = time.time()
+        try:
+            # Read-only: no BEGIN IMMEDIATE, so idling never takes the write lock
+            with self.cache_manager._db_read() as conn:
+                row = conn.execute(
+                    """
+                    SELECT MIN(retry_after)
+                    FROM cache_tasks
+                    WHERE status = 'queued' AND retry_after > ?
+                    """,
+                    (now,),
+                ).fetchone()
+        except Exception as e:
+            logger.error(f"Error reading task retry schedule: {e}")
+            return None
+
+        if row is None or row[0] is None:
+            return None
+        return max(0.0, row[0] - now)
+
+    def _complete_task(self, task_id: str, result: dict[str, Any]) -> None:
+        """
+        Mark a task completed and store its JSON-encoded result.
+
+        Args:
+            task_id: Unique task identifier
+            result: Operation result to store in result_json
+        """
+        # OPT_NON_STR_KEYS keeps json.dumps' handling of int/None dict keys
+        result_json = orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS)
+        self._update_task_status(
+            task_id=task_id,
+            status="completed",
+            completed_at=time.time(),
+            result_json=result_json.decode("utf-8"),
+        )
+
     def _update_task_status(self, task_id: str, status: str, **kwargs) -> None:
         """
         Update task status and related fields.
@@ -272,25 +398,20 @@ class BackgroundWorker:
             **kwargs: Additional fields to update (started_at, completed_at, etc.)
         """
         try:
-            # Build SET clause dynamically
-            set_fields = ["status = ?"]
-            values = [status]
-
-            for field, value in kwargs.items():
-                set_fields.append(f"{field} = ?")
-                values.append(value)
-
-            values.append(task_id)  # For WHERE clause
-
-            with self.cache_manager._db() as conn:
-                conn.execute(
-                    f"""
-                    UPDATE cache_tasks
-                    SET {", ".join(set_fields)}
-                    WHERE task_id = ?
-                    """,
-                    values,
+            # Only a handful of field combinations are used, so the SQL for
+            # each is built once and reused (and stays in SQLite's statement
+            # cache).
+            fields = tuple(kwargs)
+            sql = _UPDATE_SQL.get(fields)
+            if sql is None:
+                set_clause = ", ".join(
+                    ["status = ?", *(f"{field} = ?" for field in fields)]
                 )
+                sql = f"UPDATE cache_tasks SET {set_clause} WHERE task_id = ?"
+                _UPDATE_SQL[fields] = sql
+
+            with self._db() as conn:
+                conn.execute(sql, (status, *kwargs.values(), task_id))
                 conn.commit()
 
         except Exception as e:
@@ -305,8 +426,9 @@ class BackgroundWorker:
         """
         Handle task failure with retry logic.
 
-        Implements exponential backoff for retries. If max retries exceeded,
-        marks the task as failed permanently.
+        Requeues the task with a capped, jittered exponential backoff stored
+        in ``retry_after``, so the worker can serve other tasks meanwhile. If
+        max retries exceeded, marks the task as failed permanently.
 
         Args:
             task: Task details dictionary
@@ -318,11 +440,14 @@ class BackgroundWorker:
         error_message = f"{type(error).__name__}: {str(error)}"
 
         if retry_count < self.max_retries:
-            # Calculate exponential backoff delay
-            backoff_delay = self.initial_backoff * (2**retry_count)
+            # Capped exponential backoff; jitter keeps retries of tasks that
+            # failed together from firing together
+            backoff_delay = min(
+                self.initial_backoff * (1 << retry_count), self.max_backoff
+            ) * random.uniform(0.5, 1.5)
 
             logger.warning(
-                f"Task {task_id} failed, will retry in {backoff_delay}s",
+                f"Task {task_id} failed, will retry in {backoff_delay:.1f}s",
                 extra={
                     "task_id": task_id,
                     "retry_count": retry_count + 1,
@@ -332,16 +457,15 @@ class BackgroundWorker:
             )
 
             # Update task for retry
-            self._update_task_status(
+            await asyncio.to_thread(
+                self._update_task_status,
                 task_id=task_id,
                 status="queued",
                 retry_count=retry_count + 1,
                 last_error=error_message,
+                retry_after=time.time() + backoff_delay,
             )
 
-            # Sleep for backoff period
-            await asyncio.sleep(backoff_delay)
-
         else:
             # Max retries exceeded, mark as failed
             logger.error(
@@ -350,11 +474,12 @@ class BackgroundWorker:
                     "task_id": task_id,
                     "operation": task.get("operation"),
                     "error": error_message,
-                    "traceback": traceback.format_exc(),
                 },
+                exc_info=error,
             )
 
-            self._update_task_status(
+            await asyncio.to_thread(
+                self._update_task_status,
                 task_id=task_id,
                 status="failed",
                 completed_at=time.time(),
@@ -5,14 +5,19 @@ This module provides a comprehensive caching system with encryption, compression
 TTL management, and automatic cleanup for Microsoft 365 data.
 """
 
-import json
 import gzip
+import itertools
 import logging
+import secrets
 import time
 import threading
+import uuid
+import weakref
 from pathlib import Path
 from contextlib import contextmanager
-from typing import Any, Optional
+from typing import Any, Callable, Optional
+
+import orjson
 
 try:
     import sqlcipher3 as sqlite3
@@ -23,16 +28,23 @@ except ImportError:
 
     USING_SQLCIPHER = False
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 from .encryption import EncryptionKeyManager
 from .cache_config import (
     CACHE_DB_PATH,
     TTL_POLICIES,
     CACHE_LIMITS,
+    BUSY_TIMEOUT_MS,
     CONNECTION_POOL_SIZE,
     CONNECTION_TIMEOUT,
     CacheState,
     CACHE_WARMING_ENABLED,
     SQLCIPHER_SETTINGS,
+    STATEMENT_CACHE_SIZE,
     generate_cache_key,
 )
 
@@ -46,6 +58,163 @@ _RECOVERABLE_DATABASE_ERROR_FRAGMENTS = (
     "hmac check failed",
 )
 
+# Stored in PRAGMA user_version once the migration script has run. Bump it
+# whenever migrations/ or _ADDED_COLUMNS change so existing files re-apply.
+_SCHEMA_VERSION = 1
+
+# Columns added to tables after their initial release. CREATE TABLE IF NOT
+# EXISTS leaves older databases untouched, so these are added on startup.
+_ADDED_COLUMNS: dict[str, tuple[tuple[str, str], ...]] = {
+    "cache_entries": (("compression_codec", "INTEGER"),),
+    "cache_tasks": (("retry_after", "REAL"),),
+}
+
+
+def _split_sql_statements(script: str) -> list[str]:
+    """Split a SQL script into complete statements, keeping trigger bodies."""
+    statements: list[str] = []
+    pending = ""
+    for line in script.splitlines(keepends=True):
+        pending += line
+        if sqlite3.complete_statement(pending):
+            statements.append(pending.strip())
+            pending = ""
+    if pending.strip():
+        statements.append(pending.strip())
+    return statements
+
+
+# Statements shared by several methods or run on every cache operation.
+# sqlite3 caches prepared statements by exact SQL text, so each is spelled
+# once here to keep every caller on the same cached statement.
+_SQL_GET_ENTRY = """
+    SELECT data_json, is_compressed, compression_codec, created_at
+    FROM cache_entries
+    WHERE cache_key = ?
+"""
+_SQL_ADD_HITS = """
+    UPDATE cache_entries
+    SET hit_count = hit_count + ?, accessed_at = MAX(accessed_at, ?)
+    WHERE cache_key = ?
+"""
+_SQL_UPSERT_ENTRY = """
+    INSERT INTO cache_entries
+    (cache_key, account_id, resource_type, data_json, is_compressed,
+     compression_codec, data_size_bytes, created_at, accessed_at,
+     fresh_until, expires_at, hit_count)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
+    ON CONFLICT(cache_key) DO UPDATE SET
+        account_id = excluded.account_id,
+        resource_type = excluded.resource_type,
+        data_json = excluded.data_json,
+        is_compressed = excluded.is_compressed,
+        compression_codec = excluded.compression_codec,
+        data_size_bytes = excluded.data_size_bytes,
+        created_at = excluded.created_at,
+        accessed_at = excluded.accessed_at,
+        fresh_until = excluded.fresh_until,
+        expires_at = excluded.expires_at,
+        hit_count = 0
+"""
+_SQL_DELETE_ENTRY = "DELETE FROM cache_entries WHERE cache_key = ?"
+# Only the version that was read, so a concurrent refresh survives
+_SQL_DELETE_EXPIRED_ENTRY = (
+    "DELETE FROM cache_entries WHERE cache_key = ? AND created_at = ?"
+)
+# Keys per "IN (...)" lookup; well under SQLite's bound-parameter limit
+_MAX_IN_PARAMS = 500
+_SQL_TOTAL_BYTES = "SELECT total_bytes as total FROM cache_meta WHERE id = 1"
+_SQL_INSERT_TASK = """
+    INSERT INTO cache_tasks (
+        task_id, account_id, operation, parameters_json,
+        priority, status, retry_count, created_at
+    )
+    VALUES (?, ?, ?, ?, ?, 'queued', 0, ?)
+"""
+
+# (fresh_seconds, stale_seconds) per resource type, unpacked on every cache
+# read and write
+_TTL_SECONDS: dict[str, tuple[int, int]] = {
+    resource_type: (policy.fresh_seconds, policy.stale_seconds)
+    for resource_type, policy in TTL_POLICIES.items()
+}
+_DEFAULT_TTL_SECONDS = (300, 1800)
+
+# cache_entries.compression_codec values. Compressed rows written before the
+# column existed have NULL and are gzip.
+CODEC_GZIP = 1
+CODEC_ZSTD = 2
+
+# zstd contexts are not safe for concurrent use, so each thread keeps its own
+_zstd_contexts = threading.local()
+
+
+def _uuid7() -> str:
+    """Return a time-ordered UUIDv7 string for a new task ID.
+
+    The leading 48 bits are the Unix time in milliseconds, so IDs issued
+    later sort after earlier ones and index inserts stay append-only.
+    """
+    value = (time.time_ns() // 1_000_000) << 80 | secrets.randbits(80)
+    # Stamp the version (7) and RFC 4122 variant bits over the random part
+    value = (value & ~(0xF << 76)) | (0x7 << 76)
+    value = (value & ~(0x3 << 62)) | (0x2 << 62)
+    return str(uuid.UUID(int=value))
+
+
+def _compress(data: bytes) -> tuple[bytes, int]:
+    """Compress a payload with zstd, or gzip when zstandard is unavailable.
+
+    Returns:
+        Tuple of (compressed bytes, codec).
+    """
+    if zstandard is None:
+        return (
+            gzip.compress(data, compresslevel=CACHE_LIMITS.compression_level),
+            CODEC_GZIP,
+        )
+
+    compressor = getattr(_zstd_contexts, "compressor", None)
+    if compressor is None:
+        compressor = zstandard.ZstdCompressor(level=CACHE_LIMITS.zstd_level)
+        _zstd_contexts.compressor = compressor
+    return compressor.compress(data), CODEC_ZSTD
+
+
+def _decompress(data: bytes, codec: Optional[int]) -> bytes:
+    """Decompress a payload stored with the given codec.
+
+    Raises:
+        ValueError: If the entry is zstd-compressed but zstandard is missing.
+    """
+    if codec != CODEC_ZSTD:
+        return gzip.decompress(data)
+
+    if zstandard is None:
+        raise ValueError("zstandard is required to read zstd-compressed entries")
+
+    decompressor = getattr(_zstd_contexts, "decompressor", None)
+    if decompressor is None:
+        decompressor = zstandard.ZstdDecompressor()
+        _zstd_contexts.decompressor = decompressor
+    return decompressor.decompress(data)
+
+
+class _ReadConnectionOwner:
+    """Thread-local token; collecting it releases the thread's read connection."""
+
+    __slots__ = ("__weakref__",)
+
+
+def _release_read_connection(
+    conns: dict[int, Any], lock: threading.Lock, key: int
+) -> None:
+    """Close a read connection once the thread that owned it has exited."""
+    with lock:
+        conn = conns.pop(key, None)
+    if conn is not None:
+        conn.close()
+
 
 class CacheManager:
     """
@@ -53,9 +222,9 @@ class CacheManager:
 
     Features:
     - AES-256 encryption via SQLCipher
-    - Automatic compression for entries ≥50KB
+    - Automatic zstd compression for entries ≥50KB (gzip fallback)
     - Three-state TTL (Fresh/Stale/Expired)
-    - Connection pooling
+    - One shared write connection plus per-thread WAL read connections
     - Automatic cleanup at 80% capacity
     """
 
@@ -71,13 +240,26 @@ class CacheManager:
         Args:
             db_path: Path to SQLite database file. Defaults to CACHE_DB_PATH.
             encryption_enabled: Whether to enable SQLCipher encryption.
-            max_connections: Maximum number of pooled connections.
+            max_connections: Maximum number of concurrent read-only
+                connections opened by ``_db_read()``.
         """
         self.db_path = Path(db_path) if db_path else Path(CACHE_DB_PATH)
         self.encryption_enabled = encryption_enabled
         self.max_connections = max_connections
-        self._connection_pool = []
-        self._pool_lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None  # type: ignore[name-defined]
+        self._write_lock = threading.RLock()
+        # Read connections keyed by id() of the owning thread's
+        # _ReadConnectionOwner, which lives in self._read_local
+        self._read_conns: dict[int, sqlite3.Connection] = {}  # type: ignore
+        self._read_local = threading.local()
+        self._read_lock = threading.Lock()
+        self._read_slots = threading.BoundedSemaphore(max_connections)
+        self._task_listeners: list[Callable[[], None]] = []
+        self._write_counter = itertools.count()
+        # cache_key -> [pending hits, last access time], flushed in batches
+        self._hit_buffer: dict[str, list[float]] = {}
+        self._hit_lock = threading.Lock()
+        self._last_hit_flush = time.monotonic()
 
         # Get encryption key if enabled
         self.encryption_key = None
@@ -110,6 +292,8 @@ class CacheManager:
             str(self.db_path),
             timeout=CONNECTION_TIMEOUT,
             check_same_thread=False,
+            isolation_level=None,
+            cached_statements=STATEMENT_CACHE_SIZE,
         )
 
         try:
@@ -122,12 +306,22 @@ class CacheManager:
                     pragma_value = int(value) if isinstance(value, bool) else value
                     conn.execute(f"PRAGMA {setting} = {pragma_value}")
                 conn.execute("PRAGMA cipher_compatibility = 4")
+            else:
+                # Only takes effect before the first write fixes the file
+                # layout, so it must precede journal_mode; SQLCipher uses
+                # cipher_page_size instead
+                conn.execute("PRAGMA page_size = 8192")
 
             # Performance optimizations
             conn.execute("PRAGMA journal_mode = WAL")
             conn.execute("PRAGMA synchronous = NORMAL")
             conn.execute("PRAGMA cache_size = -64000")  # 64MB cache
             conn.execute("PRAGMA temp_store = MEMORY")
+            conn.execute("PRAGMA mmap_size = 268435456")  # 256MB mapped reads
+            conn.execute("PRAGMA journal_size_limit = 67108864")  # 64MB WAL cap
+            conn.execute("PRAGMA wal_autocheckpoint = 1000")
+            conn.execute("PRAGMA foreign_keys = ON")
+            conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
 
             conn.row_factory = sqlite3.Row  # type: ignore[attr-defined]
             return conn
@@ -138,46 +332,135 @@ class CacheManager:
     @contextmanager
     def _db(self):
         """
-        Context manager for database connections with pooling.
+        Context manager for a write transaction on the shared connection.
+
+        Connections run in autocommit mode, so each ``with`` block opens an
+        explicit ``BEGIN IMMEDIATE``: the write lock is taken up front
+        rather than upgraded from a read lock mid-transaction. The block
+        commits on success and rolls back on error. A block entered while
+        the same thread already holds a transaction joins it. A connection
+        that raises a database error is closed and reopened on next use.
 
         Yields:
-            Database connection from pool or newly created.
+            The shared database connection.
         """
-        # Get connection from pool or create new
-        conn = None
-        with self._pool_lock:
-            if self._connection_pool:
-                conn = self._connection_pool.pop()
+        with self._write_lock:
+            if self._conn is None:
+                self._conn = self._create_connection()
+            conn = self._conn
 
-        if conn is None:
-            conn = self._create_connection()
+            if conn.in_transaction:
+                yield conn
+                return
 
-        should_repool = True
-        try:
-            yield conn
-            conn.commit()
-        except Exception as e:
-            should_repool = False
-            conn.rollback()
-            logger.error(f"Database error: {e}")
-            raise
-        finally:
-            if not should_repool:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+                conn.commit()
+            except Exception as e:
+                conn.rollback()
+                logger.error(f"Database error: {e}")
+                if isinstance(e, sqlite3.DatabaseError):  # type: ignore[attr-defined]
+                    self._conn = None
+                    conn.close()
+                raise
+
+    @contextmanager
+    def _db_read(self):
+        """
+        Context manager for a read-only query outside the write lock.
+
+        WAL mode lets readers run alongside the writer, so each thread keeps
+        its own connection for SELECTs. No transaction is opened; each
+        statement reads the latest committed snapshot. At most
+        ``max_connections`` reads run at once.
+
+        The connection is owned through a thread-local token, so it is
+        closed when its thread exits (for example, a retired executor
+        worker) rather than lingering until ``close()``.
+
+        Yields:
+            The calling thread's read connection.
+        """
+        with self._read_slots:
+            owner = getattr(self._read_local, "owner", None)
+            key = id(owner)
+            with self._read_lock:
+                conn = self._read_conns.get(key) if owner is not None else None
+            if conn is None:
+                conn = self._create_connection()
+                owner = _ReadConnectionOwner()
+                key = id(owner)
+                with self._read_lock:
+                    self._read_conns[key] = conn
+                weakref.finalize(
+                    owner,
+                    _release_read_connection,
+                    self._read_conns,
+                    self._read_lock,
+                    key,
+                )
+                self._read_local.owner = owner
+
+            try:
+                yield conn
+            except sqlite3.DatabaseError:  # type: ignore[attr-defined]
+                with self._read_lock:
+                    self._read_conns.pop(key, None)
                 conn.close()
-            else:
-                # Return to pool if under limit
-                with self._pool_lock:
-                    if len(self._connection_pool) < self.max_connections:
-                        self._connection_pool.append(conn)
-                    else:
-                        conn.close()
+                raise
 
     def close(self) -> None:
-        """Close all pooled database connections."""
-        with self._pool_lock:
-            while self._connection_pool:
-                conn = self._connection_pool.pop()
-                conn.close()
+        """Close the shared connection and any per-thread read connections.
+
+        Buffered hit counts are flushed, and the shared connection runs
+        ``PRAGMA optimize`` so the query planner statistics gathered this
+        session are persisted.
+        """
+        if self._hit_buffer:
+            try:
+                self.flush_hit_counts()
+            except sqlite3.DatabaseError as e:  # type: ignore[attr-defined]
+                logger.warning(f"Dropping buffered cache hit counts: {e}")
+
+        with self._write_lock:
+            if self._conn is not None:
+                try:
+                    self._conn.execute("PRAGMA optimize")
+                except sqlite3.DatabaseError as e:  # type: ignore[attr-defined]
+                    logger.debug(f"PRAGMA optimize skipped: {e}")
+                self._conn.close()
+                self._conn = None
+        with self._read_lock:
+            read_conns = list(self._read_conns.values())
+            self._read_conns.clear()
+        for conn in read_conns:
+            conn.close()
+
+    def add_task_listener(self, listener: Callable[[], None]) -> None:
+        """Register a callback invoked after a task is committed to the queue.
+
+        Callbacks may run on any thread that enqueues tasks.
+
+        Args:
+            listener: Zero-argument callable.
+        """
+        self._task_listeners.append(listener)
+
+    def remove_task_listener(self, listener: Callable[[], None]) -> None:
+        """Unregister a callback added with add_task_listener()."""
+        try:
+            self._task_listeners.remove(listener)
+        except ValueError:
+            pass
+
+    def _notify_task_listeners(self) -> None:
+        """Tell registered listeners that a queued task is available."""
+        for listener in list(self._task_listeners):
+            try:
+                listener()
+            except Exception as e:
+                logger.warning(f"Task listener failed: {e}")
 
     @staticmethod
     def _is_recoverable_database_error(error: Exception) -> bool:
@@ -215,7 +498,18 @@ class CacheManager:
 
         try:
             with self._db() as conn:
-                conn.executescript(migration_sql)
+                # Reading user_version also proves the key can decrypt the
+                # file; a current schema skips the script and its writes
+                (version,) = conn.execute("PRAGMA user_version").fetchone()
+                if version >= _SCHEMA_VERSION:
+                    logger.info("Database schema is current")
+                    return
+                # executescript() would COMMIT the IMMEDIATE transaction
+                # first, so run statement by statement under the write lock
+                for statement in _split_sql_statements(migration_sql):
+                    conn.execute(statement)
+                self._add_missing_columns(conn)
+                conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
         except sqlite3.DatabaseError as e:  # type: ignore[attr-defined]
             if not allow_recovery or not self._is_recoverable_database_error(e):
                 raise
@@ -230,8 +524,22 @@ class CacheManager:
 
         logger.info("Database schema initialized")
 
+    @staticmethod
+    def _add_missing_columns(conn) -> None:
+        """Add columns introduced after a database file was created."""
+        for table, columns in _ADDED_COLUMNS.items():
+            existing = {row[1] for row in conn.execute(f"PRAGMA table_info({table})")}
+            for name, column_type in columns:
+                if name not in existing:
+                    conn.execute(f"ALTER TABLE {table} ADD COLUMN {name} {column_type}")
+                    logger.info(f"Added column {table}.{name} to cache database")
+
     def get_cached(
-        self, account_id: str, resource_type: str, params: dict[str, Any]
+        self,
+        account_id: str,
+        resource_type: str,
+        params: dict[str, Any],
+        cache_key: Optional[str] = None,
     ) -> Optional[tuple[Any, CacheState]]:
         """
         Retrieve cached data with state detection.
@@ -240,78 +548,154 @@ class CacheManager:
             account_id: Microsoft account identifier.
             resource_type: Type of resource (e.g., 'email_list', 'folder_tree').
             params: Parameters used to generate cache key.
+            cache_key: Precomputed generate_cache_key() result for these
+                arguments, if the caller already has it.
 
         Returns:
             Tuple of (data, state) if found, None if not found or expired.
             State is FRESH, STALE, or None for expired.
         """
-        cache_key = generate_cache_key(account_id, resource_type, params)
+        if cache_key is None:
+            cache_key = generate_cache_key(account_id, resource_type, params)
 
         # Get TTL policy for this resource type
-        from .cache_config import TTLPolicy
-
-        ttl_policy = TTL_POLICIES.get(resource_type)
-        if not ttl_policy:
+        ttl_seconds = _TTL_SECONDS.get(resource_type)
+        if ttl_seconds is None:
             logger.warning(f"No TTL policy for {resource_type}, using default")
-            ttl_policy = TTLPolicy(fresh_seconds=300, stale_seconds=1800)
+            ttl_seconds = _DEFAULT_TTL_SECONDS
+        fresh_seconds, stale_seconds = ttl_seconds
 
-        with self._db() as conn:
-            cursor = conn.execute(
-                """
-                SELECT data_json, is_compressed, created_at, accessed_at, hit_count
-                FROM cache_entries
-                WHERE cache_key = ?
-                """,
-                (cache_key,),
-            )
-            row = cursor.fetchone()
+        now = time.time()
+        with self._db_read() as conn:
+            row = conn.execute(_SQL_GET_ENTRY, (cache_key,)).fetchone()
 
-            if not row:
-                return None
+        if not row:
+            return None
 
-            # Decompress if needed
-            data_bytes = row["data_json"]
-            if row["is_compressed"]:
-                data_bytes = gzip.decompress(data_bytes)
+        # Determine cache state
+        age_seconds = now - row["created_at"]
 
-            # Parse JSON
-            try:
-                data = json.loads(data_bytes.decode("utf-8"))
-            except (json.JSONDecodeError, UnicodeDecodeError) as e:
-                logger.error(f"Failed to parse cached data: {e}")
-                return None
+        if age_seconds <= fresh_seconds:
+            state = CacheState.FRESH
+        elif age_seconds <= stale_seconds:
+            state = CacheState.STALE
+        else:
+            # Expired, delete and return None
+            with self._db() as conn:
+                conn.execute(_SQL_DELETE_EXPIRED_ENTRY, (cache_key, row["created_at"]))
+            return None
 
-            # Determine cache state
-            age_seconds = time.time() - row["created_at"]
+        self._record_hit(cache_key, now)
 
-            if age_seconds <= ttl_policy.fresh_seconds:
-                state = CacheState.FRESH
-            elif age_seconds <= ttl_policy.stale_seconds:
-                state = CacheState.STALE
-            else:
-                # Expired, delete and return None
-                conn.execute(
-                    "DELETE FROM cache_entries WHERE cache_key = ?", (cache_key,)
+        if state == CacheState.STALE:
+            with self._db() as conn:
+                task_enqueued = self._enqueue_refresh_task(
+                    conn, account_id, resource_type, params
                 )
+            if task_enqueued:
+                self._notify_task_listeners()
+
+        # Decompress if needed
+        data_bytes = row["data_json"]
+        if row["is_compressed"]:
+            try:
+                data_bytes = _decompress(data_bytes, row["compression_codec"])
+            except ValueError as e:
+                logger.error(f"Failed to decompress cached data: {e}")
                 return None
 
-            # Update access tracking
-            conn.execute(
-                """
-                UPDATE cache_entries
-                SET accessed_at = ?, hit_count = hit_count + 1
-                WHERE cache_key = ?
-                """,
-                (time.time(), cache_key),
+        # Parse JSON
+        try:
+            data = orjson.loads(data_bytes)
+        except orjson.JSONDecodeError as e:
+            logger.error(f"Failed to parse cached data: {e}")
+            return None
+
+        return (data, state)
+
+    def get_fresh_keys(self, cache_keys: list[str]) -> set[str]:
+        """Return which of the given cache keys currently hold fresh data.
+
+        Unlike get_cached, this neither records hits nor enqueues refreshes,
+        so callers can cheaply skip work that is already cached.
+
+        Args:
+            cache_keys: Cache keys to check.
+
+        Returns:
+            Subset of cache_keys whose entries are still fresh.
+        """
+        fresh: set[str] = set()
+        now = time.time()
+        with self._db_read() as conn:
+            # Chunked to stay under SQLite's bound-parameter limit
+            for start in range(0, len(cache_keys), _MAX_IN_PARAMS):
+                chunk = cache_keys[start : start + _MAX_IN_PARAMS]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT cache_key, resource_type, created_at "
+                    f"FROM cache_entries WHERE cache_key IN ({placeholders})",
+                    chunk,
+                )
+                # Same age test as get_cached, so both agree on freshness
+                for cache_key, resource_type, created_at in rows:
+                    fresh_seconds = _TTL_SECONDS.get(
+                        resource_type, _DEFAULT_TTL_SECONDS
+                    )[0]
+                    if now - created_at <= fresh_seconds:
+                        fresh.add(cache_key)
+        return fresh
+
+    def _record_hit(self, cache_key: str, accessed_at: float) -> None:
+        """Buffer a cache hit, flushing the buffer once it is due."""
+        with self._hit_lock:
+            pending = self._hit_buffer.get(cache_key)
+            if pending is None:
+                self._hit_buffer[cache_key] = [1, accessed_at]
+            else:
+                pending[0] += 1
+                pending[1] = accessed_at
+            due = (
+                len(self._hit_buffer) >= CACHE_LIMITS.hit_flush_max_keys
+                or time.monotonic() - self._last_hit_flush
+                >= CACHE_LIMITS.hit_flush_interval
             )
 
-            if state == CacheState.STALE:
-                self._enqueue_refresh_task(conn, account_id, resource_type, params)
+        if due:
+            self.flush_hit_counts()
 
-            return (data, state)
+    def flush_hit_counts(self) -> None:
+        """Write buffered hit counts and access times to the database.
+
+        Hits are counted in memory so cache reads do not take the write
+        lock; this applies them in one batch. It runs periodically from
+        get_cached and before anything that reads hit_count or
+        accessed_at (stats, LRU cleanup, close).
+        """
+        with self._hit_lock:
+            buffer = self._hit_buffer
+            self._hit_buffer = {}
+            self._last_hit_flush = time.monotonic()
+
+        if not buffer:
+            return
+
+        with self._db() as conn:
+            conn.executemany(
+                _SQL_ADD_HITS,
+                [
+                    (int(hits), accessed_at, cache_key)
+                    for cache_key, (hits, accessed_at) in buffer.items()
+                ],
+            )
 
     def set_cached(
-        self, account_id: str, resource_type: str, params: dict[str, Any], data: Any
+        self,
+        account_id: str,
+        resource_type: str,
+        params: dict[str, Any],
+        data: Any,
+        cache_key: Optional[str] = None,
     ) -> None:
         """
         Store data in cache with compression and encryption.
@@ -321,21 +705,27 @@ class CacheManager:
             resource_type: Type of resource being cached.
             params: Parameters used to generate cache key.
             data: Data to cache (will be JSON serialized).
+            cache_key: Precomputed generate_cache_key() result for these
+                arguments, if the caller already has it.
 
         Raises:
             ValueError: If data exceeds size limit.
         """
-        cache_key = generate_cache_key(account_id, resource_type, params)
+        if cache_key is None:
+            cache_key = generate_cache_key(account_id, resource_type, params)
 
-        # Serialize to JSON
-        data_json = json.dumps(data)
-        data_bytes = data_json.encode("utf-8")
+        # Serialize and compress before taking the write lock; only the
+        # upsert itself runs inside _db()
+        data_bytes = orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS)
 
-        # Compress if >= 50KB
+        # Compress if >= 50KB, keeping the result only when it saves space
         compressed = False
+        codec = None
         if len(data_bytes) >= CACHE_LIMITS.compression_threshold:
-            data_bytes = gzip.compress(data_bytes, compresslevel=6)
-            compressed = True
+            packed, packed_codec = _compress(data_bytes)
+            if len(packed) <= len(data_bytes) * CACHE_LIMITS.compression_max_ratio:
+                data_bytes, codec = packed, packed_codec
+                compressed = True
 
         # Check size limit (10MB)
         if len(data_bytes) > CACHE_LIMITS.max_entry_bytes:
@@ -347,30 +737,27 @@ class CacheManager:
         now = time.time()
 
         # Calculate fresh_until and expires_at based on TTL policy
-        from .cache_config import TTLPolicy
-
-        ttl_policy = TTL_POLICIES.get(resource_type)
-        if not ttl_policy:
-            ttl_policy = TTLPolicy(fresh_seconds=300, stale_seconds=1800)
+        fresh_seconds, stale_seconds = _TTL_SECONDS.get(
+            resource_type, _DEFAULT_TTL_SECONDS
+        )
+        fresh_until = now + fresh_seconds
+        expires_at = now + stale_seconds
 
-        fresh_until = now + ttl_policy.fresh_seconds
-        expires_at = now + ttl_policy.stale_seconds
+        # The rewritten entry starts from hit_count 0
+        with self._hit_lock:
+            self._hit_buffer.pop(cache_key, None)
 
         with self._db() as conn:
-            # Insert or replace cache entry
+            # Insert or update cache entry in place
             conn.execute(
-                """
-                INSERT OR REPLACE INTO cache_entries
-                (cache_key, account_id, resource_type, data_json, is_compressed,
-                 data_size_bytes, created_at, accessed_at, fresh_until, expires_at, hit_count)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)
-                """,
+                _SQL_UPSERT_ENTRY,
                 (
                     cache_key,
                     account_id,
                     resource_type,
                     data_bytes,
                     compressed,
+                    codec,
                     len(data_bytes),
                     now,
                     now,
@@ -379,26 +766,26 @@ class CacheManager:
                 ),
             )
 
-        # Check if cleanup needed
-        self._check_cleanup()
+        # Check if cleanup needed on the first write and every Nth after;
+        # between checks the cache can overshoot by at most N entries
+        if next(self._write_counter) % CACHE_LIMITS.cleanup_check_interval == 0:
+            self._check_cleanup()
 
     def _check_cleanup(self) -> None:
         """
         Check if cleanup is needed and trigger if at threshold.
         """
-        with self._db() as conn:
-            cursor = conn.execute(
-                "SELECT SUM(data_size_bytes) as total FROM cache_entries"
-            )
+        with self._db_read() as conn:
+            cursor = conn.execute(_SQL_TOTAL_BYTES)
             row = cursor.fetchone()
             total_bytes = row["total"] if row and row["total"] else 0
 
-            # Trigger cleanup at 80% threshold
-            threshold = CACHE_LIMITS.max_total_bytes * CACHE_LIMITS.cleanup_threshold
+        # Trigger cleanup at 80% threshold
+        threshold = CACHE_LIMITS.max_total_bytes * CACHE_LIMITS.cleanup_threshold
 
-            if total_bytes >= threshold:
-                logger.info(f"Cache size {total_bytes} bytes, triggering cleanup")
-                self._cleanup_to_target()
+        if total_bytes >= threshold:
+            logger.info(f"Cache size {total_bytes} bytes, triggering cleanup")
+            self._cleanup_to_target()
 
     def invalidate_pattern(
         self, pattern: str, account_id: Optional[str] = None, reason: str = "manual"
@@ -414,18 +801,33 @@ class CacheManager:
         Returns:
             Number of entries invalidated.
         """
-        # Convert wildcard pattern to SQL LIKE pattern
-        sql_pattern = pattern.replace("*", "%")
+        # Keys are "resource_type:account_id:param_hash", so most patterns are
+        # a literal prefix plus a trailing "*" and become a primary-key range
+        # scan. Other patterns fall back to a case-sensitive GLOB.
+        prefix = pattern[:-1]
+        if pattern.endswith("*") and not any(c in prefix for c in "*?["):
+            if prefix:
+                upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+                key_clause = "cache_key >= ? AND cache_key < ?"
+                key_params: tuple[str, ...] = (prefix, upper)
+            else:
+                key_clause = "1"
+                key_params = ()
+        else:
+            # Escape GLOB metacharacters other than the "*" wildcard
+            glob = pattern.replace("[", "[[]").replace("?", "[?]")
+            key_clause = "cache_key GLOB ?"
+            key_params = (glob,)
 
         with self._db() as conn:
             # Build query with optional account filter
             if account_id:
-                where_clause = "cache_key LIKE ? AND account_id = ?"
-                params = (sql_pattern, account_id)
+                where_clause = f"{key_clause} AND account_id = ?"
+                params = (*key_params, account_id)
                 log_account = account_id
             else:
-                where_clause = "cache_key LIKE ?"
-                params = (sql_pattern,)
+                where_clause = key_clause
+                params = key_params
                 log_account = "system"
 
             # Count matching entries first
@@ -459,6 +861,9 @@ class CacheManager:
         """
         target_bytes = CACHE_LIMITS.max_total_bytes * CACHE_LIMITS.cleanup_target
 
+        # LRU order depends on accessed_at being current
+        self.flush_hit_counts()
+
         with self._db() as conn:
             # First delete expired entries
             now = time.time()
@@ -471,9 +876,7 @@ class CacheManager:
             )
 
             # Check remaining size
-            cursor = conn.execute(
-                "SELECT SUM(data_size_bytes) as total FROM cache_entries"
-            )
+            cursor = conn.execute(_SQL_TOTAL_BYTES)
             row = cursor.fetchone()
             current_bytes = row["total"] if row and row["total"] else 0
 
@@ -481,24 +884,25 @@ class CacheManager:
             if current_bytes > target_bytes:
                 bytes_to_free = current_bytes - target_bytes
 
-                # Delete oldest accessed entries until target reached
-                conn.execute(
+                # Walk entries oldest-accessed first, collecting keys until
+                # enough bytes are freed; stops as soon as the target is met
+                victims = []
+                freed = 0
+                cursor = conn.execute(
+                    """
+                    SELECT cache_key, data_size_bytes FROM cache_entries
+                    ORDER BY accessed_at ASC
                     """
-                    DELETE FROM cache_entries
-                    WHERE cache_key IN (
-                        SELECT cache_key FROM cache_entries
-                        ORDER BY accessed_at ASC
-                        LIMIT (
-                            SELECT COUNT(*) FROM cache_entries
-                            WHERE (
-                                SELECT SUM(data_size_bytes) FROM cache_entries e2
-                                WHERE e2.accessed_at <= cache_entries.accessed_at
-                            ) <= ?
-                        )
-                    )
-                    """,
-                    (bytes_to_free,),
                 )
+                for cache_key, size in cursor:
+                    if freed >= bytes_to_free:
+                        break
+                    victims.append((cache_key,))
+                    freed += size or 0
+                cursor.close()
+
+                conn.executemany(_SQL_DELETE_ENTRY, victims)
+                logger.info(f"Evicted {len(victims)} LRU entries ({freed} bytes)")
 
             logger.info(f"Cleanup complete, target size: {target_bytes} bytes")
 
@@ -565,7 +969,9 @@ class CacheManager:
     @staticmethod
     def _serialize_task_parameters(parameters: dict[str, Any]) -> str:
         """Serialize task parameters deterministically for duplicate checks."""
-        return json.dumps(parameters, sort_keys=True, separators=(",", ":"))
+        return orjson.dumps(
+            parameters, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+        ).decode("utf-8")
 
     def _enqueue_refresh_task(
         self,
@@ -573,12 +979,15 @@ class CacheManager:
         account_id: str,
         operation: str,
         parameters: dict[str, Any],
-    ) -> None:
-        """Enqueue a background refresh task unless one is already pending."""
-        if not CACHE_WARMING_ENABLED:
-            return
+    ) -> bool:
+        """Enqueue a background refresh task unless one is already pending.
 
-        import uuid
+        Returns:
+            True if a task was inserted. The caller notifies task listeners
+            once the surrounding transaction has committed.
+        """
+        if not CACHE_WARMING_ENABLED:
+            return False
 
         parameters_json = self._serialize_task_parameters(parameters)
         existing = conn.execute(
@@ -595,24 +1004,20 @@ class CacheManager:
         ).fetchone()
 
         if existing:
-            return
+            return False
 
         conn.execute(
-            """
-            INSERT INTO cache_tasks (
-                task_id, account_id, operation, parameters_json,
-                priority, status, retry_count, created_at
-            )
-            VALUES (?, ?, ?, ?, 5, 'queued', 0, ?)
-            """,
+            _SQL_INSERT_TASK,
             (
-                str(uuid.uuid4()),
+                _uuid7(),
                 account_id,
                 operation,
                 parameters_json,
+                5,
                 time.time(),
             ),
         )
+        return True
 
     def get_stats(self) -> dict[str, Any]:
         """
@@ -621,7 +1026,9 @@ class CacheManager:
         Returns:
             Dictionary with cache metrics.
         """
-        with self._db() as conn:
+        self.flush_hit_counts()
+
+        with self._db_read() as conn:
             # Overall stats
             cursor = conn.execute(
                 """
@@ -633,7 +1040,8 @@ class CacheManager:
                 FROM cache_entries
                 """
             )
-            overall = cursor.fetchone()
+            entry_count, total_bytes, avg_bytes, total_hits = cursor.fetchone()
+            total_bytes = total_bytes or 0
 
             # Per-account stats
             cursor = conn.execute(
@@ -646,7 +1054,14 @@ class CacheManager:
                 GROUP BY account_id
                 """
             )
-            by_account = {row["account_id"]: dict(row) for row in cursor}
+            by_account = {
+                account_id: {
+                    "account_id": account_id,
+                    "entry_count": count,
+                    "total_bytes": size,
+                }
+                for account_id, count, size in cursor
+            }
 
             # Per-resource-type stats
             cursor = conn.execute(
@@ -660,17 +1075,23 @@ class CacheManager:
                 GROUP BY resource_type
                 """
             )
-            by_resource = {row["resource_type"]: dict(row) for row in cursor}
+            by_resource = {
+                resource_type: {
+                    "resource_type": resource_type,
+                    "entry_count": count,
+                    "total_bytes": size,
+                    "avg_hits": avg_hits,
+                }
+                for resource_type, count, size, avg_hits in cursor
+            }
 
             return {
-                "entry_count": overall["entry_count"],
-                "total_bytes": overall["total_bytes"] or 0,
-                "avg_bytes": overall["avg_bytes"] or 0,
-                "total_hits": overall["total_hits"] or 0,
+                "entry_count": entry_count,
+                "total_bytes": total_bytes,
+                "avg_bytes": avg_bytes or 0,
+                "total_hits": total_hits or 0,
                 "max_bytes": CACHE_LIMITS.max_total_bytes,
-                "usage_percent": (overall["total_bytes"] or 0)
-                / CACHE_LIMITS.max_total_bytes
-                * 100,
+                "usage_percent": total_bytes / CACHE_LIMITS.max_total_bytes * 100,
                 "by_account": by_account,
                 "by_resource": by_resource,
             }
@@ -694,40 +1115,60 @@ class CacheManager:
         Returns:
             str: Generated task_id
         """
-        import uuid
+        return self.enqueue_tasks(
+            [
+                {
+                    "account_id": account_id,
+                    "operation": operation,
+                    "parameters": parameters,
+                    "priority": priority,
+                }
+            ]
+        )[0]
 
-        task_id = str(uuid.uuid4())
+    def enqueue_tasks(self, tasks: list[dict[str, Any]]) -> list[str]:
+        """
+        Enqueue several background tasks in a single transaction.
 
-        with self._db() as conn:
-            conn.execute(
-                """
-                INSERT INTO cache_tasks (
-                    task_id, account_id, operation, parameters_json,
-                    priority, status, retry_count, created_at
-                )
-                VALUES (?, ?, ?, ?, ?, 'queued', 0, ?)
-                """,
-                (
-                    task_id,
-                    account_id,
-                    operation,
-                    self._serialize_task_parameters(parameters),
-                    priority,
-                    time.time(),
-                ),
+        Args:
+            tasks: Task dictionaries with account_id, operation, parameters,
+                and an optional priority (default 5)
+
+        Returns:
+            list[str]: Generated task_ids, in the same order as tasks
+        """
+        now = time.time()
+        rows = [
+            (
+                _uuid7(),
+                task["account_id"],
+                task["operation"],
+                self._serialize_task_parameters(task["parameters"]),
+                task.get("priority", 5),
+                now,
             )
+            for task in tasks
+        ]
+        if not rows:
+            return []
 
-        logger.info(
-            f"Task enqueued: {task_id}",
-            extra={
-                "task_id": task_id,
-                "account_id": account_id,
-                "operation": operation,
-                "priority": priority,
-            },
-        )
+        with self._db() as conn:
+            conn.executemany(_SQL_INSERT_TASK, rows)
+
+        self._notify_task_listeners()
+
+        for task_id, account_id, operation, _params, priority, _now in rows:
+            logger.info(
+                f"Task enqueued: {task_id}",
+                extra={
+                    "task_id": task_id,
+                    "account_id": account_id,
+                    "operation": operation,
+                    "priority": priority,
+                },
+            )
 
-        return task_id
+        return [row[0] for row in rows]
 
     def get_task_status(self, task_id: str) -> Optional[dict[str, Any]]:
         """
@@ -739,7 +1180,7 @@ class CacheManager:
         Returns:
             Optional[dict[str, Any]]: Task details if found, None otherwise
         """
-        with self._db() as conn:
+        with self._db_read() as conn:
             cursor = conn.execute(
                 """
                 SELECT
@@ -755,25 +1196,7 @@ class CacheManager:
 
             row = cursor.fetchone()
 
-            if row:
-                return {
-                    "task_id": row["task_id"],
-                    "account_id": row["account_id"],
-                    "operation": row["operation"],
-                    "parameters": json.loads(row["parameters_json"])
-                    if row["parameters_json"]
-                    else {},
-                    "priority": row["priority"],
-                    "status": row["status"],
-                    "retry_count": row["retry_count"],
-                    "created_at": row["created_at"],
-                    "started_at": row["started_at"],
-                    "completed_at": row["completed_at"],
-                    "result": row["result_json"],
-                    "error": row["last_error"],
-                }
-
-            return None
+            return self._task_from_row(row) if row else None
 
     def list_tasks(
         self,
@@ -814,25 +1237,44 @@ class CacheManager:
         query += " ORDER BY created_at DESC LIMIT ?"
         params.append(limit)
 
-        with self._db() as conn:
+        with self._db_read() as conn:
             cursor = conn.execute(query, params)
 
-            return [
-                {
-                    "task_id": row["task_id"],
-                    "account_id": row["account_id"],
-                    "operation": row["operation"],
-                    "parameters": json.loads(row["parameters_json"])
-                    if row["parameters_json"]
-                    else {},
-                    "priority": row["priority"],
-                    "status": row["status"],
-                    "retry_count": row["retry_count"],
-                    "created_at": row["created_at"],
-                    "started_at": row["started_at"],
-                    "completed_at": row["completed_at"],
-                    "result": row["result_json"],
-                    "error": row["last_error"],
-                }
-                for row in cursor
-            ]
+            return [self._task_from_row(row) for row in cursor]
+
+    @staticmethod
+    def _task_from_row(row) -> dict[str, Any]:
+        """Build a task dict from a cache_tasks row.
+
+        The row must hold the columns selected by get_task_status and
+        list_tasks, in that order; they are unpacked by position rather
+        than looked up by name.
+        """
+        (
+            task_id,
+            account_id,
+            operation,
+            parameters_json,
+            priority,
+            status,
+            retry_count,
+            created_at,
+            started_at,
+            completed_at,
+            result_json,
+            last_error,
+        ) = row
+        return {
+            "task_id": task_id,
+            "account_id": account_id,
+            "operation": operation,
+            "parameters": orjson.loads(parameters_json) if parameters_json else {},
+            "priority": priority,
+            "status": status,
+            "retry_count": retry_count,
+            "created_at": created_at,
+            "started_at": started_at,
+            "completed_at": completed_at,
+            "result": result_json,
+            "error": last_error,
+        }
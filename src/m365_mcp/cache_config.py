@@ -14,13 +14,15 @@ The cache uses a three-state TTL model:
 """
 
 import os
+import functools
 import hashlib
-import json
 from enum import Enum
 from pathlib import Path
 from typing import Any, Dict, Optional
 from dataclasses import dataclass
 
+import orjson
+
 
 # ============================================================================
 # DATABASE CONFIGURATION
@@ -32,15 +34,20 @@ CACHE_DB_PATH = os.environ.get(
 )
 
 # SQLCipher encryption settings
+# The cache key is passed as raw hex key material, so SQLCipher skips the
+# PBKDF2 passphrase derivation and kdf_iter does not slow connection opens.
 SQLCIPHER_SETTINGS = {
     "kdf_iter": 256000,  # PBKDF2 iterations (higher = more secure, slower)
     "cipher_page_size": 4096,  # Page size in bytes
     "cipher_use_hmac": True,  # Use HMAC for authentication
+    "cipher_memory_security": False,  # Skip zeroing every freed allocation
 }
 
-# Connection pool settings
-CONNECTION_POOL_SIZE = 5  # Maximum concurrent connections
+# Connection settings
+CONNECTION_POOL_SIZE = 5  # Maximum concurrent read-only connections
 CONNECTION_TIMEOUT = 30.0  # Connection timeout in seconds
+BUSY_TIMEOUT_MS = 5000  # How long a statement waits on a locked database
+STATEMENT_CACHE_SIZE = 256  # Prepared statements kept per connection
 
 
 # ============================================================================
@@ -151,13 +158,20 @@ class CacheLimits:
     # Cleanup Thresholds
     cleanup_threshold: float = 0.8  # Trigger cleanup at 80% (1.6 GB)
     cleanup_target: float = 0.6  # Clean down to 60% (1.2 GB)
+    cleanup_check_interval: int = 64  # Check the size every N cache writes
+
+    # Buffered cache hits are written once either limit is reached
+    hit_flush_max_keys: int = 256  # Distinct keys with pending hits
+    hit_flush_interval: float = 30.0  # Seconds since the last flush
 
     # Account Limits
     max_entries_per_account: int = 10000  # Max entries per account
 
     # Compression
     compression_threshold: int = 50 * 1024  # Compress entries >= 50 KB
-    compression_level: int = 6  # gzip compression level (1-9)
+    compression_level: int = 6  # gzip compression level (1-9), fallback codec
+    zstd_level: int = 3  # zstd compression level (1-22), default codec
+    compression_max_ratio: float = 0.95  # Keep compressed only if <= 95% size
 
 
 # Default cache limits instance
@@ -173,6 +187,9 @@ CACHE_WARMING_ENABLED = (
     os.environ.get("M365_MCP_CACHE_WARMING", "false").lower() == "true"
 )
 
+# Accounts warmed concurrently; throttling still applies within each account
+CACHE_WARMING_MAX_CONCURRENT_ACCOUNTS = 4
+
 # Operations to warm cache with on startup
 # Format: (operation_name, priority, throttle_sec, params)
 CACHE_WARMING_OPERATIONS = [
@@ -200,11 +217,103 @@ CACHE_WARMING_OPERATIONS = [
 ]
 
 
+def _validate_warming_operations(operations: list[dict[str, Any]]) -> None:
+    """Check warming operation entries once, when the config is loaded.
+
+    Args:
+        operations: Warming operation dictionaries to validate
+
+    Raises:
+        ValueError: If an entry is missing its operation name, has a
+            non-numeric priority or throttle, or has params that are not a
+            JSON-serializable dict
+    """
+    for index, entry in enumerate(operations):
+        operation = entry.get("operation")
+        if not isinstance(operation, str) or not operation:
+            raise ValueError(f"Warming operation {index} has no operation name")
+        if not isinstance(entry.get("priority", 5), int):
+            raise ValueError(f"Warming operation {operation!r} priority must be int")
+        if not isinstance(entry.get("throttle_sec", 0.5), (int, float)):
+            raise ValueError(
+                f"Warming operation {operation!r} throttle_sec must be a number"
+            )
+        params = entry.get("params", {})
+        if not isinstance(params, dict):
+            raise ValueError(f"Warming operation {operation!r} params must be a dict")
+        try:
+            orjson.dumps(params, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError as e:
+            raise ValueError(
+                f"Warming operation {operation!r} params are not JSON-serializable"
+            ) from e
+
+
+_validate_warming_operations(CACHE_WARMING_OPERATIONS)
+
+
 # ============================================================================
 # CACHE KEY GENERATION
 # ============================================================================
 
 
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
+
+def _canonical_json(parameters: Dict[str, Any]) -> bytes:
+    """Serialize parameters to compact JSON with a stable key order.
+
+    Keys are sorted at every level so dicts that differ only in insertion
+    order hash the same. A dict with one scalar value has nothing to
+    sort, so it skips the sort pass; its output is identical either way.
+
+    Args:
+        parameters: JSON-serializable parameters
+
+    Returns:
+        Compact UTF-8 JSON bytes
+
+    Raises:
+        TypeError: If parameters contain a value orjson cannot serialize
+            (orjson.JSONEncodeError is a TypeError subclass)
+    """
+    if len(parameters) == 1:
+        (value,) = parameters.values()
+        if isinstance(value, _SCALAR_TYPES):
+            return orjson.dumps(parameters, option=orjson.OPT_NON_STR_KEYS)
+    return orjson.dumps(
+        parameters, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+    )
+
+
+def _hash_parameters(parameters: Dict[str, Any]) -> str:
+    """Hash parameters into a 16-hex-digit BLAKE2b digest.
+
+    Args:
+        parameters: JSON-serializable parameters
+
+    Returns:
+        Hex digest of the canonical JSON
+    """
+    # 64-bit digest: collisions stay negligible up to ~2^32 entries,
+    # far beyond a per-account cache namespace
+    return hashlib.blake2b(_canonical_json(parameters), digest_size=8).hexdigest()
+
+
+@functools.lru_cache(maxsize=4096)
+def _hash_flat_parameters(frozen: frozenset) -> str:
+    """Memoized ``_hash_parameters`` for dicts of scalar values.
+
+    Args:
+        frozen: ``(key, type(value), value)`` triples; the type is part of
+            each triple so ``1``, ``1.0`` and ``True`` do not share an entry
+
+    Returns:
+        Hex digest of the canonical JSON
+    """
+    return _hash_parameters({key: value for key, _, value in frozen})
+
+
 def generate_cache_key(
     account_id: str, resource_type: str, parameters: Optional[Dict[str, Any]] = None
 ) -> str:
@@ -225,12 +334,17 @@ def generate_cache_key(
     # Start with resource type and account
     key_parts = [resource_type, account_id]
 
-    # Add hash of parameters if provided
+    # Add hash of parameters if provided. Flat dicts are the common case
+    # (the warmer asks for the same few keys every pass), so their hashes
+    # are memoized; nested values are not hashable and are hashed directly.
     if parameters:
-        # Sort parameters for deterministic hashing
-        param_json = json.dumps(parameters, sort_keys=True, separators=(",", ":"))
-        param_hash = hashlib.sha256(param_json.encode()).hexdigest()[:16]
-        key_parts.append(param_hash)
+        if all(isinstance(value, _SCALAR_TYPES) for value in parameters.values()):
+            frozen = frozenset(
+                (key, type(value), value) for key, value in parameters.items()
+            )
+            key_parts.append(_hash_flat_parameters(frozen))
+        else:
+            key_parts.append(_hash_parameters(parameters))
 
     return ":".join(key_parts)
 
@@ -248,15 +362,15 @@ def parse_cache_key(cache_key: str) -> Dict[str, str]:
         >>> parse_cache_key("folder_get_tree:acc-123:8f4b2c3d")
         {'resource_type': 'folder_get_tree', 'account_id': 'acc-123', 'param_hash': '8f4b2c3d'}
     """
-    parts = cache_key.split(":")
+    # Keys have at most three fields; partition stops at each colon without
+    # building a list, and leaves anything after the second in param_hash
+    resource_type, _, rest = cache_key.partition(":")
+    account_id, sep, param_hash = rest.partition(":")
 
-    result = {
-        "resource_type": parts[0] if len(parts) > 0 else "",
-        "account_id": parts[1] if len(parts) > 1 else "",
-    }
+    result = {"resource_type": resource_type, "account_id": account_id}
 
-    if len(parts) > 2:
-        result["param_hash"] = parts[2]
+    if sep:
+        result["param_hash"] = param_hash
 
     return result
 
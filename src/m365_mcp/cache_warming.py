@@ -6,15 +6,57 @@ the cache with frequently accessed data on server startup.
 
 import asyncio
 import logging
+import time
 from contextlib import suppress
 from datetime import datetime, timezone
-from typing import Any, Callable
+from typing import Any, Callable, NamedTuple
+
+import httpx
 
 from .cache import CacheManager
-from .cache_config import CACHE_WARMING_OPERATIONS, CacheState
+from .cache_config import (
+    CACHE_WARMING_MAX_CONCURRENT_ACCOUNTS,
+    CACHE_WARMING_OPERATIONS,
+    generate_cache_key,
+)
 
 logger = logging.getLogger(__name__)
 
+# Adaptive throttle: each completed operation pulls its delay toward an EMA
+# of observed latency (never below the configured throttle_sec), while Graph
+# throttling that outlasted the client's own retries doubles it
+_THROTTLE_EMA_ALPHA = 0.3
+_MAX_THROTTLE_SEC = 60.0
+_THROTTLE_STATUS_CODES = frozenset({429, 503})
+
+
+class WarmingOp(NamedTuple):
+    account_id: str
+    operation: str
+    params: dict[str, Any]
+    priority: int
+    throttle_sec: float
+    cache_key: str
+
+
+# CACHE_WARMING_OPERATIONS is static, so defaults are filled in and the
+# priority sort is done once here rather than on every queue build.
+# Each template is a WarmingOp minus its leading account_id.
+_WARMING_TEMPLATES = tuple(
+    sorted(
+        (
+            (
+                operation_config["operation"],
+                operation_config.get("params", {}),
+                operation_config.get("priority", 5),
+                operation_config.get("throttle_sec", 0.5),
+            )
+            for operation_config in CACHE_WARMING_OPERATIONS
+        ),
+        key=lambda template: template[2],
+    )
+)
+
 
 def get_inactive_warming_status(status: str) -> dict[str, Any]:
     """Return the canonical inactive warming status payload."""
@@ -29,6 +71,23 @@ def get_inactive_warming_status(status: str) -> dict[str, Any]:
     }
 
 
+def _throttled_retry_after(error: Exception) -> float | None:
+    """Return the wait Graph asked for if error is a throttling response.
+
+    Returns:
+        Retry-After seconds (0.0 if absent or unparseable) for 429/503
+        responses, None for any other error
+    """
+    if not isinstance(error, httpx.HTTPStatusError):
+        return None
+    if error.response.status_code not in _THROTTLE_STATUS_CODES:
+        return None
+    try:
+        return float(error.response.headers.get("Retry-After", 0))
+    except ValueError:
+        return 0.0
+
+
 class CacheWarmer:
     """Manages background cache warming operations.
 
@@ -42,6 +101,7 @@ class CacheWarmer:
         cache_manager: CacheManager,
         tool_executor: Callable[[str, str, dict[str, Any]], Any],
         accounts: list[dict[str, str]],
+        max_concurrent_accounts: int = CACHE_WARMING_MAX_CONCURRENT_ACCOUNTS,
     ):
         """Initialize the cache warmer.
 
@@ -50,10 +110,12 @@ class CacheWarmer:
             tool_executor: Callable that executes tool operations
                           Signature: (account_id, operation, params) -> result
             accounts: List of account dictionaries with account_id and username
+            max_concurrent_accounts: Maximum number of accounts warmed at once
         """
         self.cache_manager = cache_manager
         self.tool_executor = tool_executor
         self.accounts = accounts
+        self.max_concurrent_accounts = max_concurrent_accounts
 
         self.is_warming = False
         self.warming_started_at: datetime | None = None
@@ -63,6 +125,8 @@ class CacheWarmer:
         self.operations_skipped = 0
         self.operations_failed = 0
         self.warming_task: asyncio.Task | None = None
+        # operation -> current delay between that operation's requests
+        self._throttle_sec: dict[str, float] = {}
 
     async def start_warming(self) -> None:
         """Start the cache warming process.
@@ -96,38 +160,38 @@ class CacheWarmer:
                 await self.warming_task
         self.is_warming = False
 
-    def _build_warming_queue(self) -> list[dict[str, Any]]:
+    def _build_warming_queue(self) -> list[WarmingOp]:
         """Build the queue of warming operations.
 
         Returns:
-            List of warming operation dictionaries sorted by priority.
-            Each dict contains: account_id, operation, params, priority, throttle_sec
+            List of warming operations sorted by priority.
         """
-        queue = []
-
-        for account in self.accounts:
-            account_id = account.get("account_id")
-            if not account_id:
-                continue
-
-            for operation_config in CACHE_WARMING_OPERATIONS:
-                queue_item = {
-                    "account_id": account_id,
-                    "operation": operation_config["operation"],
-                    "params": operation_config.get("params", {}),
-                    "priority": operation_config.get("priority", 5),
-                    "throttle_sec": operation_config.get("throttle_sec", 0.5),
-                }
-                queue.append(queue_item)
-
-        # Sort by priority (lower number = higher priority)
-        queue.sort(key=lambda x: x["priority"])
-
-        return queue
+        account_ids = [
+            account["account_id"]
+            for account in self.accounts
+            if account.get("account_id")
+        ]
+
+        # Templates are already in priority order (lower number = higher
+        # priority), so expanding them template-major needs no sort. The
+        # cache key is computed once here and reused by the loop.
+        return [
+            WarmingOp(
+                account_id,
+                *template,
+                generate_cache_key(account_id, template[0], template[1]),
+            )
+            for template in _WARMING_TEMPLATES
+            for account_id in account_ids
+        ]
 
-    async def _warming_loop(self, queue: list[dict[str, Any]]) -> None:
+    async def _warming_loop(self, queue: list[WarmingOp]) -> None:
         """Execute warming operations from the queue.
 
+        Each account's operations run in priority order with their throttle
+        between them, while different accounts are warmed concurrently (up
+        to ``max_concurrent_accounts`` at a time).
+
         Args:
             queue: List of warming operations to execute
         """
@@ -138,29 +202,69 @@ class CacheWarmer:
             self.warming_started_at = datetime.now(timezone.utc)
 
         try:
+            # Grouping keeps the queue's priority order within each account
+            per_account: dict[str, list[WarmingOp]] = {}
             for item in queue:
-                account_id = item["account_id"]
-                operation = item["operation"]
-                params = item["params"]
-                throttle_sec = item["throttle_sec"]
+                per_account.setdefault(item.account_id, []).append(item)
 
-                try:
-                    # Check if already cached (skip if fresh)
-                    cached_result = self.cache_manager.get_cached(
-                        account_id, operation, params
-                    )
+            # One lookup up front instead of a get_cached read per item
+            fresh_keys = self.cache_manager.get_fresh_keys(
+                [item.cache_key for item in queue]
+            )
+
+            slots = asyncio.Semaphore(self.max_concurrent_accounts)
+            await asyncio.gather(
+                *(
+                    self._warm_account(items, fresh_keys, slots)
+                    for items in per_account.values()
+                )
+            )
+
+            self.warming_completed_at = datetime.now(timezone.utc)
+            duration = (
+                self.warming_completed_at - self.warming_started_at
+            ).total_seconds()
+
+            logger.info(
+                f"Cache warming completed in {duration:.1f}s: "
+                f"{self.operations_completed - self.operations_failed - self.operations_skipped} "
+                f"warmed, {self.operations_skipped} skipped, "
+                f"{self.operations_failed} failed"
+            )
+
+        finally:
+            self.is_warming = False
 
-                    if cached_result:
-                        data, state = cached_result
-                        if state == CacheState.FRESH:
-                            logger.debug(
-                                f"Skipping {operation} for account {account_id[:8]}... "
-                                "(already cached)"
-                            )
-                            self.operations_skipped += 1
-                            self.operations_completed += 1
-                            continue
+    async def _warm_account(
+        self,
+        items: list[WarmingOp],
+        fresh_keys: set[str],
+        slots: asyncio.Semaphore,
+    ) -> None:
+        """Execute one account's warming operations in order.
+
+        Args:
+            items: The account's warming operations, highest priority first
+            fresh_keys: Cache keys that were fresh when warming started
+            slots: Semaphore bounding how many accounts warm concurrently
+        """
+        async with slots:
+            for item in items:
+                account_id, operation, params, _priority, throttle_sec, cache_key = item
 
+                # Skip if already cached and fresh
+                if cache_key in fresh_keys:
+                    logger.debug(
+                        f"Skipping {operation} for account {account_id[:8]}... "
+                        "(already cached)"
+                    )
+                    self.operations_skipped += 1
+                    self.operations_completed += 1
+                    continue
+
+                started = time.monotonic()
+                retry_after: float | None = None
+                try:
                     # Execute operation
                     logger.debug(
                         f"Warming cache: {operation} for account {account_id[:8]}..."
@@ -172,7 +276,7 @@ class CacheWarmer:
                     if result:
                         # Store in cache
                         self.cache_manager.set_cached(
-                            account_id, operation, params, result
+                            account_id, operation, params, result, cache_key=cache_key
                         )
                         logger.debug(
                             f"Cached {operation} for account {account_id[:8]}..."
@@ -187,25 +291,43 @@ class CacheWarmer:
                     )
                     self.operations_failed += 1
                     self.operations_completed += 1
+                    retry_after = _throttled_retry_after(e)
 
                 # Throttle to avoid overwhelming the API
-                if throttle_sec > 0:
-                    await asyncio.sleep(throttle_sec)
+                delay = self._adjust_throttle(
+                    operation, throttle_sec, time.monotonic() - started, retry_after
+                )
+                if delay > 0:
+                    await asyncio.sleep(delay)
 
-            self.warming_completed_at = datetime.now(timezone.utc)
-            duration = (
-                self.warming_completed_at - self.warming_started_at
-            ).total_seconds()
+    def _adjust_throttle(
+        self,
+        operation: str,
+        base_sec: float,
+        latency_sec: float,
+        retry_after: float | None = None,
+    ) -> float:
+        """Update and return the delay to wait after an operation.
 
-            logger.info(
-                f"Cache warming completed in {duration:.1f}s: "
-                f"{self.operations_completed - self.operations_failed - self.operations_skipped} "
-                f"warmed, {self.operations_skipped} skipped, "
-                f"{self.operations_failed} failed"
-            )
+        Args:
+            operation: Operation name; accounts share its delay
+            base_sec: Configured throttle_sec, the lower bound on the delay
+            latency_sec: How long the operation just took
+            retry_after: Server-requested wait if the operation was throttled,
+                0.0 when throttled without a Retry-After, None otherwise
 
-        finally:
-            self.is_warming = False
+        Returns:
+            Seconds to sleep before the account's next operation
+        """
+        current = self._throttle_sec.get(operation, base_sec)
+        if retry_after is not None:
+            delay = max(current * 2, base_sec, 1.0, retry_after)
+        else:
+            alpha = _THROTTLE_EMA_ALPHA
+            delay = max(base_sec, (1 - alpha) * current + alpha * latency_sec)
+        delay = min(delay, _MAX_THROTTLE_SEC)
+        self._throttle_sec[operation] = delay
+        return delay
 
     async def _execute_warming_operation(
         self, account_id: str, operation: str, params: dict[str, Any]
@@ -10,6 +10,7 @@ import os
 import secrets
 import base64
 import logging
+import threading
 from typing import Optional
 
 logger = logging.getLogger(__name__)
@@ -45,6 +46,11 @@ class EncryptionKeyManager:
     ENV_VAR = "M365_MCP_CACHE_KEY"
     KEY_BYTES = 32  # 256 bits
 
+    # Resolved key, reused for the life of the process so the keyring is
+    # queried once and an ephemeral key stays stable across cache opens
+    _cached_key: Optional[str] = None
+    _cached_key_lock = threading.Lock()
+
     @staticmethod
     def generate_key() -> str:
         """Generate cryptographically secure 256-bit encryption key.
@@ -96,6 +102,9 @@ class EncryptionKeyManager:
         3. **Generate New**: Creates new 256-bit key and attempts to store
            in system keyring for persistence
 
+        The resolved key is memoized for the rest of the process; call
+        ``clear_cached_key()`` to force the lookup to run again.
+
         Returns:
             Base64-encoded 256-bit encryption key.
 
@@ -111,6 +120,24 @@ class EncryptionKeyManager:
             >>> key = EncryptionKeyManager.get_or_create_key()
             >>> # Key retrieved from keyring or generated new
         """
+        with EncryptionKeyManager._cached_key_lock:
+            if EncryptionKeyManager._cached_key is None:
+                EncryptionKeyManager._cached_key = EncryptionKeyManager._resolve_key()
+            return EncryptionKeyManager._cached_key
+
+    @staticmethod
+    def clear_cached_key() -> None:
+        """Forget the memoized key so the next lookup consults its sources."""
+        with EncryptionKeyManager._cached_key_lock:
+            EncryptionKeyManager._cached_key = None
+
+    @staticmethod
+    def _resolve_key() -> str:
+        """Look up or generate the key without consulting the memo.
+
+        Returns:
+            Base64-encoded 256-bit encryption key.
+        """
         # Priority 1: Try system keyring
         key = EncryptionKeyManager._get_key_from_keyring()
         if key:
@@ -269,6 +296,7 @@ class EncryptionKeyManager:
             cache database unreadable. The database will need to be deleted
             and recreated.
         """
+        EncryptionKeyManager.clear_cached_key()
         try:
             import keyring
 
@@ -6,15 +6,30 @@ for monitoring, testing, and diagnostics.
 """
 
 import asyncio
+import importlib.util
 import sys
 import time
+from enum import Enum
 from typing import Any, Optional
 from dataclasses import dataclass
 import httpx
 import logging
 
+# Shared clients negotiate HTTP/2 over TLS when h2 is available, so probes
+# multiplex on one connection with compressed (repeated) headers. Servers
+# or plain-HTTP endpoints without HTTP/2 still get HTTP/1.1.
+# h2 comes with the optional "http2" extra (httpx[http2]).
+_HTTP2_ENABLED = importlib.util.find_spec("h2") is not None
+
 logger = logging.getLogger(__name__)
 
+# Connection pool for continuous monitoring. Keep-alive outlives typical
+# check intervals so successive probes reuse one socket instead of paying
+# a TCP/TLS handshake each time.
+CONTINUOUS_CHECK_LIMITS = httpx.Limits(
+    max_connections=10, max_keepalive_connections=5, keepalive_expiry=300.0
+)
+
 
 @dataclass
 class HealthCheckResult:
@@ -27,10 +42,98 @@ class HealthCheckResult:
     details: Optional[dict[str, Any]] = None
 
 
+class CircuitState(Enum):
+    """Circuit breaker states."""
+
+    CLOSED = "closed"  # Probes flow normally
+    OPEN = "open"  # Probes are skipped until the cooldown elapses
+    HALF_OPEN = "half_open"  # Trial probes decide whether to close again
+
+
+@dataclass
+class CircuitBreaker:
+    """Skip health probes against an endpoint that keeps failing.
+
+    After ``failure_threshold`` consecutive failures the breaker opens and
+    probes are answered locally for ``open_duration_s``. It then half-opens,
+    letting one trial probe through at a time, and closes again after
+    ``half_open_success_threshold`` successes; any failure while half-open
+    reopens it. Only server-side failures count:
+    5xx responses and transport errors (timeouts, refused connections).
+    A 4xx means the server answered, so it does not trip the breaker.
+    """
+
+    failure_threshold: int = 5
+    open_duration_s: float = 30.0
+    half_open_success_threshold: int = 2
+    state: CircuitState = CircuitState.CLOSED
+    failure_count: int = 0
+    success_count: int = 0
+    opened_at: float = 0.0
+    trial_in_flight: bool = False
+
+    def allow(self) -> bool:
+        """Return whether a probe may be sent now.
+
+        While half-open, a True return claims the single trial slot until
+        ``record()`` or ``release()`` is called.
+        """
+        if self.state is CircuitState.OPEN:
+            if self.retry_in() > 0:
+                return False
+            self.state = CircuitState.HALF_OPEN
+            self.success_count = 0
+            self.trial_in_flight = False
+        if self.state is CircuitState.HALF_OPEN:
+            if self.trial_in_flight:
+                return False
+            self.trial_in_flight = True
+        return True
+
+    def retry_in(self) -> float:
+        """Return seconds until an open breaker lets a probe through."""
+        if self.state is not CircuitState.OPEN:
+            return 0.0
+        return max(0.0, self.opened_at + self.open_duration_s - time.monotonic())
+
+    def release(self) -> None:
+        """Free the trial slot of a probe that ended without a result."""
+        self.trial_in_flight = False
+
+    def record(self, result: HealthCheckResult) -> None:
+        """Update the breaker with the outcome of a probe."""
+        self.trial_in_flight = False
+        if result.status_code is None or result.status_code >= 500:
+            self.on_failure()
+        else:
+            self.on_success()
+
+    def on_success(self) -> None:
+        """Record a probe the server answered."""
+        if self.state is CircuitState.HALF_OPEN:
+            self.success_count += 1
+            if self.success_count < self.half_open_success_threshold:
+                return
+        self.state = CircuitState.CLOSED
+        self.failure_count = 0
+
+    def on_failure(self) -> None:
+        """Record a probe that failed server-side."""
+        self.failure_count += 1
+        if (
+            self.state is CircuitState.HALF_OPEN
+            or self.failure_count >= self.failure_threshold
+        ):
+            self.state = CircuitState.OPEN
+            self.opened_at = time.monotonic()
+
+
 async def check_health_async(
     url: str,
     timeout: float = 5.0,
     auth_token: Optional[str] = None,
+    client: Optional[httpx.AsyncClient] = None,
+    breaker: Optional[CircuitBreaker] = None,
 ) -> HealthCheckResult:
     """
     Perform an async health check against the MCP server.
@@ -39,23 +142,73 @@ async def check_health_async(
         url: Health check endpoint URL
         timeout: Request timeout in seconds
         auth_token: Optional bearer token for authentication
+        client: Optional client to reuse across checks; a one-off client
+            is opened and closed when omitted
+        breaker: Optional circuit breaker for this URL; while it is open
+            the check fails immediately without sending a request
+
+    Returns:
+        HealthCheckResult with success status and metrics
+    """
+    start_time = time.perf_counter()
+
+    if breaker is not None and not breaker.allow():
+        return HealthCheckResult(
+            success=False,
+            status_code=None,
+            response_time_ms=(time.perf_counter() - start_time) * 1000,
+            error="circuit open",
+        )
+
+    try:
+        if client is None:
+            async with httpx.AsyncClient(timeout=timeout) as one_off_client:
+                result = await _probe(one_off_client, url, timeout, auth_token)
+        else:
+            result = await _probe(client, url, timeout, auth_token)
+    except BaseException:
+        # Cancelled mid-probe: do not leave a half-open trial slot taken
+        if breaker is not None:
+            breaker.release()
+        raise
+
+    if breaker is not None:
+        breaker.record(result)
+    return result
+
+
+async def _probe(
+    client: httpx.AsyncClient,
+    url: str,
+    timeout: float,
+    auth_token: Optional[str],
+) -> HealthCheckResult:
+    """Send one health check request and classify the outcome.
+
+    Args:
+        client: Client to send the request with
+        url: Health check endpoint URL
+        timeout: Request timeout in seconds
+        auth_token: Optional bearer token for authentication
 
     Returns:
         HealthCheckResult with success status and metrics
     """
-    start_time = time.time()
+    start_time = time.perf_counter()
 
     headers = {}
     if auth_token:
         headers["Authorization"] = f"Bearer {auth_token}"
 
     try:
-        async with httpx.AsyncClient(timeout=timeout) as client:
-            response = await client.get(url, headers=headers)
-
-            response_time_ms = (time.time() - start_time) * 1000
-
+        # Stream so a failing server's (possibly large) error body is never
+        # downloaded beyond the snippet included in the error message
+        async with client.stream(
+            "GET", url, headers=headers, timeout=timeout
+        ) as response:
             if response.status_code == 200:
+                await response.aread()
+                response_time_ms = (time.perf_counter() - start_time) * 1000
                 try:
                     details = response.json()
                 except Exception:
@@ -67,16 +220,22 @@ async def check_health_async(
                     response_time_ms=response_time_ms,
                     details=details,
                 )
-            else:
-                return HealthCheckResult(
-                    success=False,
-                    status_code=response.status_code,
-                    response_time_ms=response_time_ms,
-                    error=f"HTTP {response.status_code}: {response.text[:100]}",
-                )
+
+            snippet = b""
+            async for chunk in response.aiter_bytes():
+                snippet = chunk[:100]
+                break
+            response_time_ms = (time.perf_counter() - start_time) * 1000
+            body = snippet.decode(response.encoding or "utf-8", errors="replace")
+            return HealthCheckResult(
+                success=False,
+                status_code=response.status_code,
+                response_time_ms=response_time_ms,
+                error=f"HTTP {response.status_code}: {body}",
+            )
 
     except httpx.TimeoutException:
-        response_time_ms = (time.time() - start_time) * 1000
+        response_time_ms = (time.perf_counter() - start_time) * 1000
         return HealthCheckResult(
             success=False,
             status_code=None,
@@ -85,7 +244,7 @@ async def check_health_async(
         )
 
     except httpx.ConnectError as e:
-        response_time_ms = (time.time() - start_time) * 1000
+        response_time_ms = (time.perf_counter() - start_time) * 1000
         return HealthCheckResult(
             success=False,
             status_code=None,
@@ -94,7 +253,7 @@ async def check_health_async(
         )
 
     except Exception as e:
-        response_time_ms = (time.time() - start_time) * 1000
+        response_time_ms = (time.perf_counter() - start_time) * 1000
         return HealthCheckResult(
             success=False,
             status_code=None,
@@ -122,60 +281,150 @@ def check_health(
     return asyncio.run(check_health_async(url, timeout, auth_token))
 
 
+async def check_health_many(
+    urls: list[str],
+    timeout: float = 5.0,
+    auth_token: Optional[str] = None,
+    client: Optional[httpx.AsyncClient] = None,
+) -> list[HealthCheckResult]:
+    """
+    Check several endpoints concurrently.
+
+    Total latency is that of the slowest endpoint rather than the sum.
+
+    Args:
+        urls: Health check endpoint URLs
+        timeout: Request timeout in seconds, applied to each check
+        auth_token: Optional bearer token for authentication
+        client: Optional client shared by all checks; one is opened for the
+            batch when omitted
+
+    Returns:
+        One HealthCheckResult per URL, in the order given
+    """
+    if client is None:
+        async with httpx.AsyncClient(
+            timeout=timeout, limits=CONTINUOUS_CHECK_LIMITS, http2=_HTTP2_ENABLED
+        ) as batch_client:
+            return await check_health_many(urls, timeout, auth_token, batch_client)
+
+    start_time = time.perf_counter()
+    outcomes = await asyncio.gather(
+        *(
+            # Outer bound in case a check hangs outside the request timeout
+            asyncio.wait_for(
+                check_health_async(url, timeout, auth_token, client),
+                timeout=timeout + 0.5,
+            )
+            for url in urls
+        ),
+        return_exceptions=True,
+    )
+
+    results = []
+    for outcome in outcomes:
+        if isinstance(outcome, BaseException):
+            outcome = HealthCheckResult(
+                success=False,
+                status_code=None,
+                response_time_ms=(time.perf_counter() - start_time) * 1000,
+                error=repr(outcome),
+            )
+        results.append(outcome)
+    return results
+
+
 async def continuous_health_check(
     url: str,
     interval: float = 10.0,
     timeout: float = 5.0,
     auth_token: Optional[str] = None,
     max_failures: int = 3,
+    breaker: Optional[CircuitBreaker] = None,
 ) -> None:
     """
     Continuously monitor server health with configurable failure threshold.
 
+    A circuit breaker backs off from a failing server: once it opens, the
+    monitor waits out the cooldown and then sends a single trial probe
+    instead of probing every interval. Only real probes count toward
+    ``max_failures``.
+
     Args:
         url: Health check endpoint URL
         interval: Seconds between checks
         timeout: Request timeout in seconds
         auth_token: Optional bearer token for authentication
         max_failures: Maximum consecutive failures before exiting
+        breaker: Circuit breaker to use; by default one that opens a
+            failure before ``max_failures`` is reached (after at most 5)
 
     Raises:
         RuntimeError: When max consecutive failures is reached
     """
     consecutive_failures = 0
     check_count = 0
+    if breaker is None:
+        breaker = CircuitBreaker(failure_threshold=max(1, min(5, max_failures - 1)))
 
     logger.info(f"Starting continuous health monitoring: {url}")
     logger.info(f"Check interval: {interval}s, Timeout: {timeout}s")
     logger.info(f"Max consecutive failures: {max_failures}")
 
-    while True:
-        check_count += 1
-        logger.info(f"Health check #{check_count}")
+    async with httpx.AsyncClient(
+        timeout=timeout, limits=CONTINUOUS_CHECK_LIMITS, http2=_HTTP2_ENABLED
+    ) as client:
+        # Checks are scheduled on a fixed monotonic cadence, so the time a
+        # probe takes is absorbed into the wait rather than added to it.
+        deadline = time.monotonic()
+        while True:
+            cooldown = breaker.retry_in()
+            if cooldown > 0:
+                logger.warning(
+                    f"Circuit open; waiting {cooldown:.1f}s before probing again"
+                )
+                await asyncio.sleep(cooldown)
+                deadline = time.monotonic()
+                continue
 
-        result = await check_health_async(url, timeout, auth_token)
+            check_count += 1
+            logger.info(f"Health check #{check_count}")
 
-        if result.success:
-            logger.info(
-                f"✓ Health check passed - Response time: {result.response_time_ms:.2f}ms"
-            )
-            consecutive_failures = 0
-        else:
-            consecutive_failures += 1
-            logger.error(
-                f"✗ Health check failed ({consecutive_failures}/{max_failures}) - "
-                f"Error: {result.error}"
-            )
+            result = await check_health_async(url, timeout, auth_token, client, breaker)
 
-            if consecutive_failures >= max_failures:
-                error_msg = (
-                    f"Health check failed {consecutive_failures} times consecutively. "
-                    f"Server appears to be down or unresponsive."
+            if result.success:
+                logger.info(
+                    f"✓ Health check passed - "
+                    f"Response time: {result.response_time_ms:.2f}ms"
+                )
+                consecutive_failures = 0
+            else:
+                consecutive_failures += 1
+                logger.error(
+                    f"✗ Health check failed ({consecutive_failures}/{max_failures}) - "
+                    f"Error: {result.error}"
                 )
-                logger.critical(error_msg)
-                raise RuntimeError(error_msg)
 
-        await asyncio.sleep(interval)
+                if consecutive_failures >= max_failures:
+                    error_msg = (
+                        f"Health check failed {consecutive_failures} times "
+                        f"consecutively. Server appears to be down or unresponsive."
+                    )
+                    logger.critical(error_msg)
+                    raise RuntimeError(error_msg)
+
+            deadline += interval
+            sleep_for = deadline - time.monotonic()
+            if sleep_for < 0:
+                if interval > 0:
+                    logger.warning(
+                        f"Health check #{check_count} overran the {interval}s "
+                        f"interval by {-sleep_for:.3f}s; starting next check now"
+                    )
+                # Resynchronize rather than firing a burst of catch-up checks
+                deadline -= sleep_for
+                sleep_for = 0.0
+            await asyncio.sleep(sleep_for)
 
 
 def main() -> int:
@@ -5,22 +5,42 @@ This module provides structured logging with rotation, detailed formatting,
 and separate log levels for different components.
 """
 
+import atexit
+import concurrent.futures
+import copy
 import logging
 import logging.handlers
+import os
+import queue
 import sys
-import shutil
+import time
 from pathlib import Path
 from datetime import datetime, timezone
 from typing import Any
-import json
+
+import orjson
+
+
+# Optional ``extra=`` fields copied into structured log entries
+_EXTRA_KEYS = ("account_id", "tool_name", "operation_id", "duration_ms")
 
 
 class StructuredFormatter(logging.Formatter):
-    """JSON structured formatter for machine-readable logs."""
+    """JSON structured formatter for machine-readable logs.
+
+    A record that reaches several JSON handlers (every ERROR goes to both
+    the all-logs and error-logs files) is serialized once; the line is
+    cached on the record, which is never reused for another event.
+    """
 
     def format(self, record: logging.LogRecord) -> str:
+        cached = getattr(record, "_structured_json", None)
+        if cached is not None:
+            return cached
+
         log_entry = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            # orjson serializes datetimes itself, in isoformat() form
+            "timestamp": datetime.now(timezone.utc),
             "level": record.levelname,
             "logger": record.name,
             "message": record.getMessage(),
@@ -29,16 +49,20 @@ class StructuredFormatter(logging.Formatter):
             "line": record.lineno,
         }
 
-        # Add extra fields if present
-        for key in ["account_id", "tool_name", "operation_id", "duration_ms"]:
-            if hasattr(record, key):
-                log_entry[key] = getattr(record, key)
+        # Add extra fields if present; extras land in the instance dict, so
+        # plain dict lookups replace hasattr/getattr
+        record_dict = record.__dict__
+        for key in _EXTRA_KEYS:
+            if key in record_dict:
+                log_entry[key] = record_dict[key]
 
         # Add exception info if present
         if record.exc_info:
             log_entry["exception"] = self.formatException(record.exc_info)
 
-        return json.dumps(log_entry)
+        formatted = orjson.dumps(log_entry).decode()
+        record._structured_json = formatted
+        return formatted
 
 
 class HumanReadableFormatter(logging.Formatter):
@@ -53,18 +77,49 @@ class HumanReadableFormatter(logging.Formatter):
         "RESET": "\033[0m",
     }
 
+    def __init__(self, *args: Any, use_color: bool | None = None, **kwargs: Any):
+        """Initialize the formatter.
+
+        Args:
+            use_color: Wrap level names in ANSI colors; defaults to whether
+                stderr is a terminal, checked once here rather than per record
+            *args: Passed to logging.Formatter
+            **kwargs: Passed to logging.Formatter
+        """
+        super().__init__(*args, **kwargs)
+        if use_color is None:
+            use_color = sys.stderr.isatty()
+        reset = self.COLORS["RESET"]
+        # Level name as printed; unknown levels fall back to the plain name
+        self._level_labels = {
+            level: f"{color}{level}{reset}" if use_color else level
+            for level, color in self.COLORS.items()
+            if level != "RESET"
+        }
+        # (whole second, "YYYY-mm-dd HH:MM:SS") of the last record; records
+        # arrive in bursts within the same second, so strftime rarely runs
+        self._second_cache: tuple[int, str] = (-1, "")
+
+    def _timestamp(self, record: logging.LogRecord) -> str:
+        """Return the record's local time with millisecond precision."""
+        second = int(record.created)
+        cached_second, prefix = self._second_cache
+        if second != cached_second:
+            prefix = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(second))
+            self._second_cache = (second, prefix)
+        return f"{prefix}.{int(record.msecs):03d}"
+
     def format(self, record: logging.LogRecord) -> str:
-        # Add color if outputting to terminal
-        if sys.stderr.isatty():
-            color = self.COLORS.get(record.levelname, self.COLORS["RESET"])
-            reset = self.COLORS["RESET"]
-            record.levelname = f"{color}{record.levelname}{reset}"
+        # The record is shared with other handlers, so the colored level
+        # name stays local instead of being written back to the record
+        level = self._level_labels.get(record.levelname, record.levelname)
 
         # Format: timestamp [LEVEL] logger.module.function:line - message
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
-        location = f"{record.module}.{record.funcName}:{record.lineno}"
-
-        formatted = f"{timestamp} [{record.levelname}] {record.name}.{location} - {record.getMessage()}"
+        formatted = (
+            f"{self._timestamp(record)} [{level}] {record.name}."
+            f"{record.module}.{record.funcName}:{record.lineno} - "
+            f"{record.getMessage()}"
+        )
 
         # Add exception info if present
         if record.exc_info:
@@ -73,6 +128,50 @@ class HumanReadableFormatter(logging.Formatter):
         return formatted
 
 
+class _DeferredFormattingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that leaves formatting to the listener's handlers.
+
+    The stock prepare() formats the record in the caller's thread and
+    drops exc_info, which would undo the point of the queue and lose the
+    structured "exception" field. This only resolves the message args.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+# Background thread that writes queued records to the real handlers
+_queue_listener: logging.handlers.QueueListener | None = None
+_queue_listener_atexit_registered = False
+
+
+def _stop_queue_listener() -> None:
+    """Flush queued records and stop the logging thread, if running."""
+    global _queue_listener
+    if _queue_listener is not None:
+        _queue_listener.stop()
+        for handler in _queue_listener.handlers:
+            handler.close()
+        _queue_listener = None
+
+
+_ARCHIVE_MAX_WORKERS = 8
+
+
+def _safe_move(src: Path, dest: Path) -> bool:
+    """Rename ``src`` to ``dest``, reporting failure instead of raising."""
+    try:
+        os.replace(src, dest)
+        return True
+    except Exception as e:
+        # Print to stderr since logging isn't setup yet
+        print(f"Warning: Failed to archive {src.name}: {e}", file=sys.stderr)
+        return False
+
+
 def archive_existing_logs(log_dir: Path) -> dict[str, Any]:
     """
     Archive existing log files to a timestamped folder.
@@ -94,8 +193,14 @@ def archive_existing_logs(log_dir: Path) -> dict[str, Any]:
     if not log_dir.exists():
         return result
 
-    # Check if any log files exist
-    log_files = list(log_dir.glob("*.log*")) + list(log_dir.glob("*.jsonl*"))
+    # Check if any log files exist (current and rotated *.log*/*.jsonl*);
+    # one scandir pass, with is_file() answered from the directory entry
+    with os.scandir(log_dir) as entries:
+        log_files = [
+            Path(entry.path)
+            for entry in entries
+            if (".log" in entry.name or ".jsonl" in entry.name) and entry.is_file()
+        ]
     if not log_files:
         return result
 
@@ -104,16 +209,18 @@ def archive_existing_logs(log_dir: Path) -> dict[str, Any]:
     archive_dir = log_dir / "archives" / archive_timestamp
     archive_dir.mkdir(parents=True, exist_ok=True)
 
-    # Move all log files to archive
-    archived_count = 0
-    for log_file in log_files:
-        try:
-            dest = archive_dir / log_file.name
-            shutil.move(str(log_file), str(dest))
-            archived_count += 1
-        except Exception as e:
-            # Print to stderr since logging isn't setup yet
-            print(f"Warning: Failed to archive {log_file.name}: {e}", file=sys.stderr)
+    # Move all log files to archive; archive_dir lives under log_dir, so a
+    # same-filesystem rename is all that is needed. Renames are dominated by
+    # metadata latency, so overlap them across a small pool.
+    workers = min(_ARCHIVE_MAX_WORKERS, len(log_files))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(
+            executor.map(
+                lambda log_file: _safe_move(log_file, archive_dir / log_file.name),
+                log_files,
+            )
+        )
+    archived_count = sum(results)
 
     result["archived"] = archived_count > 0
     result["archive_dir"] = (
@@ -136,12 +243,28 @@ def setup_logging(
     Existing log files are automatically archived to a timestamped folder
     under logs/archives/ on each startup, ensuring fresh logs for each run.
 
+    The root logger only enqueues records; a QueueListener thread formats
+    them and writes to the file and console handlers, so logging callers
+    never block on disk I/O.
+
+    Thread, process and asyncio task lookups are switched off for every
+    LogRecord, so the ``thread``, ``threadName``, ``process``,
+    ``processName`` and ``taskName`` fields are None. Neither formatter
+    emits them.
+
     Args:
         log_dir: Directory to store log files
         log_level: Minimum log level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         max_bytes: Maximum size of each log file before rotation
         backup_count: Number of backup log files to keep
     """
+    # Skip the per-record getpid()/current_thread() calls for unused fields
+    logging.logThreads = False
+    logging.logProcesses = False
+    logging.logMultiprocessing = False
+    if hasattr(logging, "logAsyncioTasks"):  # Python 3.12+
+        setattr(logging, "logAsyncioTasks", False)
+
     # Create log directory
     log_path = Path(log_dir)
     log_path.mkdir(exist_ok=True)
@@ -158,6 +281,7 @@ def setup_logging(
 
     # Remove existing handlers to avoid duplicates
     root_logger.handlers.clear()
+    _stop_queue_listener()
 
     # === File Handler: All logs (JSON structured) ===
     all_logs_file = log_path / "mcp_server_all.jsonl"
@@ -168,8 +292,8 @@ def setup_logging(
         encoding="utf-8",
     )
     all_handler.setLevel(logging.DEBUG)
-    all_handler.setFormatter(StructuredFormatter())
-    root_logger.addHandler(all_handler)
+    structured_formatter = StructuredFormatter()
+    all_handler.setFormatter(structured_formatter)
 
     # === File Handler: Error logs only (JSON structured) ===
     error_logs_file = log_path / "mcp_server_errors.jsonl"
@@ -180,8 +304,7 @@ def setup_logging(
         encoding="utf-8",
     )
     error_handler.setLevel(logging.ERROR)
-    error_handler.setFormatter(StructuredFormatter())
-    root_logger.addHandler(error_handler)
+    error_handler.setFormatter(structured_formatter)
 
     # === File Handler: Human-readable logs ===
     readable_logs_file = log_path / "mcp_server.log"
@@ -192,14 +315,29 @@ def setup_logging(
         encoding="utf-8",
     )
     readable_handler.setLevel(numeric_level)
-    readable_handler.setFormatter(HumanReadableFormatter())
-    root_logger.addHandler(readable_handler)
+    readable_handler.setFormatter(HumanReadableFormatter(use_color=False))
 
     # === Console Handler: Human-readable (stderr) ===
     console_handler = logging.StreamHandler(sys.stderr)
     console_handler.setLevel(numeric_level)
     console_handler.setFormatter(HumanReadableFormatter())
-    root_logger.addHandler(console_handler)
+
+    # === Queue: callers enqueue, one background thread writes ===
+    global _queue_listener, _queue_listener_atexit_registered
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    root_logger.addHandler(_DeferredFormattingQueueHandler(log_queue))
+    _queue_listener = logging.handlers.QueueListener(
+        log_queue,
+        all_handler,
+        error_handler,
+        readable_handler,
+        console_handler,
+        respect_handler_level=True,
+    )
+    _queue_listener.start()
+    if not _queue_listener_atexit_registered:
+        atexit.register(_stop_queue_listener)
+        _queue_listener_atexit_registered = True
 
     # Set specific log levels for noisy libraries
     logging.getLogger("httpx").setLevel(logging.WARNING)
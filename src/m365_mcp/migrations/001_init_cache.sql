@@ -18,7 +18,8 @@ CREATE TABLE IF NOT EXISTS cache_entries (
 
     -- Cache Data (encrypted at rest via SQLCipher)
     data_json TEXT NOT NULL,       -- JSON-serialized response data
-    is_compressed INTEGER NOT NULL DEFAULT 0,  -- 1 if gzip compressed, 0 if not
+    is_compressed INTEGER NOT NULL DEFAULT 0,  -- 1 if compressed, 0 if not
+    compression_codec INTEGER,     -- 1=gzip, 2=zstd; NULL on older gzip rows
     data_size_bytes INTEGER NOT NULL,          -- Size of cached data in bytes
 
     -- TTL Management (fresh/stale/expired states)
@@ -48,6 +49,49 @@ CREATE INDEX IF NOT EXISTS idx_cache_accessed
 CREATE INDEX IF NOT EXISTS idx_cache_account_fresh
     ON cache_entries(account_id, fresh_until);
 
+-- Serves account-scoped invalidation (account_id filter plus cache_key match)
+-- without visiting table rows
+CREATE INDEX IF NOT EXISTS idx_cache_account_key
+    ON cache_entries(account_id, cache_key);
+
+
+-- ============================================================================
+-- CACHE META TABLE
+-- ============================================================================
+-- Single-row running total of cache_entries.data_size_bytes, maintained by
+-- triggers so the cleanup check does not scan the whole table
+CREATE TABLE IF NOT EXISTS cache_meta (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    total_bytes INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_cache_entries_insert_bytes
+AFTER INSERT ON cache_entries
+BEGIN
+    UPDATE cache_meta SET total_bytes = total_bytes + NEW.data_size_bytes
+    WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_cache_entries_delete_bytes
+AFTER DELETE ON cache_entries
+BEGIN
+    UPDATE cache_meta SET total_bytes = total_bytes - OLD.data_size_bytes
+    WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_cache_entries_update_bytes
+AFTER UPDATE OF data_size_bytes ON cache_entries
+BEGIN
+    UPDATE cache_meta
+    SET total_bytes = total_bytes - OLD.data_size_bytes + NEW.data_size_bytes
+    WHERE id = 1;
+END;
+
+-- Seeds from existing entries when the table is first added, after the
+-- triggers so no write lands between the seed and its bookkeeping
+INSERT OR IGNORE INTO cache_meta (id, total_bytes)
+SELECT 1, COALESCE(SUM(data_size_bytes), 0) FROM cache_entries;
+
 
 -- ============================================================================
 -- CACHE TASKS TABLE
@@ -72,6 +116,7 @@ CREATE TABLE IF NOT EXISTS cache_tasks (
     retry_count INTEGER NOT NULL DEFAULT 0,
     max_retries INTEGER NOT NULL DEFAULT 3,
     last_error TEXT,               -- Error message from last failure
+    retry_after REAL,              -- Earliest time a failed task may be retried
 
     -- Timestamps
     created_at REAL NOT NULL,
@@ -89,8 +134,17 @@ CREATE TABLE IF NOT EXISTS cache_tasks (
 CREATE INDEX IF NOT EXISTS idx_tasks_status_priority
     ON cache_tasks(status, priority);
 
-CREATE INDEX IF NOT EXISTS idx_tasks_account
-    ON cache_tasks(account_id);
+-- Serves the worker's claim query (status filter, priority/created_at order)
+-- without a temp B-tree sort
+CREATE INDEX IF NOT EXISTS idx_tasks_queue
+    ON cache_tasks(status, priority, created_at);
+
+-- Serves list_tasks filtered by account (and optionally status) in
+-- created_at order; supersedes the single-column account index
+DROP INDEX IF EXISTS idx_tasks_account;
+
+CREATE INDEX IF NOT EXISTS idx_tasks_account_status_created
+    ON cache_tasks(account_id, status, created_at);
 
 CREATE INDEX IF NOT EXISTS idx_tasks_created
     ON cache_tasks(created_at);
@@ -135,10 +135,11 @@ async def _execute_cache_refresh_tool(
     if "use_cache" in signature.parameters:
         call_parameters.setdefault("use_cache", True)
 
-    result = tool_function(**call_parameters)
-    if asyncio.iscoroutine(result):
-        return await result
-    return result
+    if inspect.iscoroutinefunction(tool_function):
+        return await tool_function(**call_parameters)
+    # Tools make blocking Graph calls; running them in a worker thread keeps
+    # the event loop free and lets accounts warm concurrently
+    return await asyncio.to_thread(tool_function, **call_parameters)
 
 
 async def _execute_background_refresh(
@@ -175,7 +176,10 @@ async def _start_cache_runtime() -> CacheRuntime | None:
         active_logger.info("Cache warming/background refresh disabled")
         return None
 
-    cache_manager = cache_tools.get_cache_manager()
+    # Opening the cache reads the encryption key from the OS keyring (a
+    # blocking D-Bus/Keychain call) and runs schema setup; keep both off
+    # the event loop
+    cache_manager = await asyncio.to_thread(cache_tools.get_cache_manager)
     worker = BackgroundWorker(cache_manager, _execute_background_refresh)
     accounts = _get_cache_warming_accounts()
     warmer = CacheWarmer(cache_manager, _execute_warming_operation, accounts)
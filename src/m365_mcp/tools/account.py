@@ -146,32 +146,17 @@ def account_complete_auth(flow_cache: str) -> dict[str, str]:
         raise Exception(f"Authentication failed: {error_msg}")
 
     # Save the token cache
-    cache = app.token_cache
-    if isinstance(cache, auth.msal.SerializableTokenCache) and cache.has_state_changed:
-        auth._write_cache(cache.serialize())
+    auth._save_token_cache_if_changed(app)
 
     # Get the newly added account
-    accounts = app.get_accounts()
-    if accounts:
-        # Find the account that matches the token we just got
-        matched_account = None
-        for account in accounts:
-            if (
-                account.get("username", "").lower()
-                == result.get("id_token_claims", {})
-                .get("preferred_username", "")
-                .lower()
-            ):
-                matched_account = account
-                break
-
-        # If exact match not found, use the last account
-        if not matched_account:
-            matched_account = accounts[-1]
-
+    matched_account = auth._select_account(
+        app.get_accounts(), result, None, default_last=True
+    )
+    if matched_account is not None:
         # Detect and cache account type
         account_id = matched_account["home_account_id"]
         account_type = auth._get_account_type(account_id, matched_account["username"])
+        auth._flush_metadata()
 
         return {
             "status": "success",
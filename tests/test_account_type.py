@@ -70,6 +70,22 @@ class TestDetectAccountType:
 
         assert result == "work_school"
 
+    def test_detect_personal_upn_skips_token_decode(self, monkeypatch):
+        """Test that personal-domain UPNs short-circuit JWT decoding."""
+
+        def fail_decode(token):
+            raise AssertionError("token should not be decoded")
+
+        monkeypatch.setattr(
+            "src.m365_mcp.account_type._decode_token_unverified", fail_decode
+        )
+
+        result = detect_account_type(
+            "unused", {"userPrincipalName": "User@Hotmail.com"}
+        )
+
+        assert result == "personal"
+
     def test_detect_account_type_failure(self):
         """Test that ValueError is raised when detection fails."""
         # Use an invalid token and no userPrincipalName
@@ -120,9 +136,16 @@ class TestDecodeTokenUnverified:
         """Test that invalid tokens raise exception."""
         invalid_token = "completely.invalid.token"
 
-        with pytest.raises(jwt.DecodeError):
+        with pytest.raises(ValueError, match="malformed access token"):
             _decode_token_unverified(invalid_token)
 
+    def test_decode_non_object_payload(self):
+        """Test that a payload that is not a JSON object is rejected."""
+        token = "e30.WzFd.sig"  # payload segment decodes to [1]
+
+        with pytest.raises(ValueError, match="malformed access token"):
+            _decode_token_unverified(token)
+
     def test_decode_token_unknown_issuer(self):
         """Test that unknown issuer returns None."""
         token = jwt.encode(
@@ -135,6 +158,21 @@ class TestDecodeTokenUnverified:
 
         assert result is None
 
+    def test_decode_token_tenant_id_outside_path(self):
+        """Test that the personal tenant ID only counts in the issuer path."""
+        token = jwt.encode(
+            {
+                "iss": "https://example.com/9188040d-6c67-4c5b-b112-36a304b66dad/v2.0",
+                "sub": "test-user",
+            },
+            "secret",
+            algorithm="HS256",
+        )
+
+        result = _decode_token_unverified(token)
+
+        assert result is None
+
 
 class TestCheckUpnDomain:
     """Tests for UPN domain checking helper."""
@@ -188,3 +226,11 @@ class TestCheckUpnDomain:
         """Test that None UPN returns None."""
         result = _check_upn_domain(None)
         assert result is None
+
+    def test_repeated_upn_is_memoized(self):
+        """Test that repeated lookups for a UPN hit the memo cache."""
+        _check_upn_domain.cache_clear()
+        _check_upn_domain("user@fabrikam.com")
+        result = _check_upn_domain("user@fabrikam.com")
+        assert result == "work_school"
+        assert _check_upn_domain.cache_info().hits == 1
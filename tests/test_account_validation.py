@@ -1,15 +1,16 @@
 from __future__ import annotations
 
 import os
-import sys
 from collections.abc import Iterable
 from dataclasses import dataclass
 from pathlib import Path
-from types import ModuleType, SimpleNamespace
+from types import SimpleNamespace
 from typing import Any
 
+import msal
 import pytest
 
+from src.m365_mcp import cli
 from src.m365_mcp.tools import account as account_tools
 
 
@@ -67,7 +68,7 @@ def test_account_authenticate_returns_flow_details(
     assert result["device_code"] == flow["user_code"]
     assert result["verification_url"] == flow["verification_uri"]
     assert result["_flow_cache"] == str(flow)
-    assert fake_app.scopes == account_tools.auth.DEVICE_FLOW_SCOPES
+    assert fake_app.scopes == list(account_tools.auth.DEVICE_FLOW_SCOPES)
 
 
 def test_device_flow_scopes_exclude_msal_reserved_scopes() -> None:
@@ -206,7 +207,7 @@ def test_account_complete_auth_returns_success_and_writes_cache(
             return "base-cache"
 
     monkeypatch.setattr(
-        account_tools.auth.msal,
+        msal,
         "SerializableTokenCache",
         FakeCacheBase,
     )
@@ -256,6 +257,39 @@ def test_account_complete_auth_returns_success_and_writes_cache(
     assert writes == ["cache"]
 
 
+def test_account_complete_auth_falls_back_to_newest_account(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Without a username match, the account just added (the last) is used."""
+
+    class FakeApp:
+        token_cache = None
+
+        def acquire_token_by_device_flow(self, flow: dict[str, Any]) -> dict[str, Any]:
+            return {"id_token_claims": {"preferred_username": "alias@example.com"}}
+
+        def get_accounts(self) -> list[dict[str, str]]:
+            return [
+                {"username": "ada@example.com", "home_account_id": "acc-1"},
+                {"username": "grace@example.com", "home_account_id": "acc-2"},
+            ]
+
+    detected: list[str] = []
+
+    def fake_get_account_type(account_id: str, username: str) -> str:
+        detected.append(account_id)
+        return "work_school"
+
+    monkeypatch.setattr(account_tools.auth, "get_app", lambda: (FakeApp(), "common"))
+    monkeypatch.setattr(account_tools.auth, "_get_account_type", fake_get_account_type)
+    monkeypatch.setattr(account_tools.auth, "_flush_metadata", lambda: True)
+
+    result = account_tools.account_complete_auth.fn(str({"device_code": "IJKL"}))
+
+    assert result["account_id"] == "acc-2"
+    assert detected == ["acc-2"]
+
+
 def test_get_token_fails_fast_when_interactive_auth_disabled(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
@@ -270,7 +304,7 @@ def test_get_token_fails_fast_when_interactive_auth_disabled(
             scopes: list[str],
             account: dict[str, str] | None = None,
         ) -> None:
-            return None
+            pytest.fail("Silent acquisition should be skipped without accounts")
 
     def fail_device_flow(*args: Any, **kwargs: Any) -> None:
         pytest.fail("Device flow should not start when interactive auth is disabled")
@@ -369,7 +403,7 @@ def test_reauthenticate_account_force_refreshes_and_writes_cache(
     writes: list[str] = []
 
     monkeypatch.setattr(
-        account_tools.auth.msal,
+        msal,
         "SerializableTokenCache",
         FakeCacheBase,
     )
@@ -430,7 +464,7 @@ def test_remove_account_clears_tokens_metadata_and_database_cache(
     }
 
     monkeypatch.setattr(
-        account_tools.auth.msal,
+        msal,
         "SerializableTokenCache",
         FakeCacheBase,
     )
@@ -463,38 +497,28 @@ def test_authenticate_script_enables_interactive_auth(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     """The standalone authentication script should opt into interactive auth."""
-    import authenticate
-
-    fake_auth = ModuleType("m365_mcp.auth")
 
     def fake_list_accounts() -> list[Any]:
         assert os.environ[account_tools.auth.INTERACTIVE_AUTH_ENV_VAR] == "true"
         return []
 
-    fake_auth.list_accounts = fake_list_accounts  # type: ignore[attr-defined]
-    fake_package = ModuleType("m365_mcp")
-    fake_package.auth = fake_auth  # type: ignore[attr-defined]
-
     monkeypatch.delenv(account_tools.auth.INTERACTIVE_AUTH_ENV_VAR, raising=False)
     monkeypatch.setenv("M365_MCP_CLIENT_ID", "client-id")
-    monkeypatch.setitem(sys.modules, "m365_mcp", fake_package)
-    monkeypatch.setitem(sys.modules, "m365_mcp.auth", fake_auth)
+    monkeypatch.setattr(account_tools.auth, "list_accounts", fake_list_accounts)
     monkeypatch.setattr(
-        authenticate,
+        cli,
         "_parse_arguments",
         lambda: SimpleNamespace(env_file=Path("__missing_env__")),
     )
     monkeypatch.setattr("builtins.input", lambda prompt: "n")
 
-    authenticate.main()
+    cli.main()
 
 
 def test_authenticate_script_reauth_option(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     """The standalone script should route --re-auth to the refresh helper."""
-    import authenticate
-
     account = SimpleNamespace(
         username="ada@example.com",
         account_id="acc-1",
@@ -503,22 +527,17 @@ def test_authenticate_script_reauth_option(
     refresh_result = SimpleNamespace(account=account, expires_in=3600)
     calls: list[str] = []
 
-    fake_auth = ModuleType("m365_mcp.auth")
-    fake_auth.list_accounts = lambda: [account]  # type: ignore[attr-defined]
-
     def fake_reauthenticate_account(account_id: str) -> Any:
         calls.append(account_id)
         return refresh_result
 
-    fake_auth.reauthenticate_account = fake_reauthenticate_account  # type: ignore[attr-defined]
-    fake_package = ModuleType("m365_mcp")
-    fake_package.auth = fake_auth  # type: ignore[attr-defined]
-
     monkeypatch.setenv("M365_MCP_CLIENT_ID", "client-id")
-    monkeypatch.setitem(sys.modules, "m365_mcp", fake_package)
-    monkeypatch.setitem(sys.modules, "m365_mcp.auth", fake_auth)
+    monkeypatch.setattr(account_tools.auth, "list_accounts", lambda: [account])
+    monkeypatch.setattr(
+        account_tools.auth, "reauthenticate_account", fake_reauthenticate_account
+    )
     monkeypatch.setattr(
-        authenticate,
+        cli,
         "_parse_arguments",
         lambda: SimpleNamespace(
             env_file=Path("__missing_env__"),
@@ -528,7 +547,7 @@ def test_authenticate_script_reauth_option(
         ),
     )
 
-    assert authenticate.main() == 0
+    assert cli.main() == 0
     assert calls == ["acc-1"]
 
 
@@ -536,8 +555,6 @@ def test_authenticate_script_remove_option(
     monkeypatch: pytest.MonkeyPatch,
 ) -> None:
     """The standalone script should route --remove to account removal."""
-    import authenticate
-
     account = SimpleNamespace(
         username="ada@example.com",
         account_id="acc-1",
@@ -555,22 +572,15 @@ def test_authenticate_script_remove_option(
     )
     calls: list[str] = []
 
-    fake_auth = ModuleType("m365_mcp.auth")
-    fake_auth.list_accounts = lambda: [account]  # type: ignore[attr-defined]
-
     def fake_remove_account(account_id: str) -> Any:
         calls.append(account_id)
         return remove_result
 
-    fake_auth.remove_account = fake_remove_account  # type: ignore[attr-defined]
-    fake_package = ModuleType("m365_mcp")
-    fake_package.auth = fake_auth  # type: ignore[attr-defined]
-
     monkeypatch.setenv("M365_MCP_CLIENT_ID", "client-id")
-    monkeypatch.setitem(sys.modules, "m365_mcp", fake_package)
-    monkeypatch.setitem(sys.modules, "m365_mcp.auth", fake_auth)
+    monkeypatch.setattr(account_tools.auth, "list_accounts", lambda: [account])
+    monkeypatch.setattr(account_tools.auth, "remove_account", fake_remove_account)
     monkeypatch.setattr(
-        authenticate,
+        cli,
         "_parse_arguments",
         lambda: SimpleNamespace(
             env_file=Path("__missing_env__"),
@@ -580,5 +590,40 @@ def test_authenticate_script_remove_option(
         ),
     )
 
-    assert authenticate.main() == 0
+    assert cli.main() == 0
     assert calls == ["acc-1"]
+
+
+def test_get_token_uses_resolved_account_without_enumeration(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A pre-resolved MSAL account skips the cached-account scan."""
+    account = {"username": "ada@example.com", "home_account_id": "acc-1"}
+    captured: dict[str, Any] = {}
+
+    class FakeApp:
+        token_cache = object()
+
+        def get_accounts(self) -> list[dict[str, str]]:
+            pytest.fail("get_accounts should not be called")
+
+        def acquire_token_silent(
+            self,
+            scopes: list[str],
+            account: dict[str, str] | None = None,
+        ) -> dict[str, str]:
+            captured["account"] = account
+            return {"access_token": "cached-token"}
+
+    monkeypatch.setattr(account_tools.auth, "get_app", lambda: (FakeApp(), "common"))
+    monkeypatch.setattr(
+        account_tools.auth,
+        "_get_account_type",
+        lambda account_id, username: "personal",
+    )
+    monkeypatch.setattr(account_tools.auth, "_DETECTED_ACCOUNTS", set())
+
+    token = account_tools.auth.get_token("acc-1", account=account)
+
+    assert token == "cached-token"
+    assert captured["account"] is account
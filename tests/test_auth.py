@@ -0,0 +1,420 @@
+"""Unit tests for auth module caching helpers."""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+import msal
+import pytest
+
+from src.m365_mcp import auth
+
+
+class FakeApp:
+    """Minimal stand-in for msal.PublicClientApplication."""
+
+    def __init__(self, tenant_id: str) -> None:
+        self.tenant_id = tenant_id
+        self.token_cache = object()
+
+
+@pytest.fixture
+def isolated_auth(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> Iterator[list[str]]:
+    """Point auth at temporary files and record _build_app calls."""
+    builds: list[str] = []
+
+    def fake_build_app(tenant_id: str, cache: Any = None) -> FakeApp:
+        builds.append(tenant_id)
+        auth._read_cache()
+        return FakeApp(tenant_id)
+
+    monkeypatch.setattr(auth, "CACHE_FILE", tmp_path / "token_cache.json")
+    monkeypatch.setattr(auth, "METADATA_FILE", tmp_path / "metadata.json")
+    monkeypatch.setattr(auth, "_APP_SINGLETON", None)
+    monkeypatch.setattr(auth, "_CONSUMER_APP", None)
+    monkeypatch.setattr(auth, "_CACHE_SIGNATURE", None)
+    monkeypatch.setattr(auth, "_METADATA_CACHE", None)
+    monkeypatch.setattr(auth, "_PENDING_ACCOUNT_TYPES", {})
+    monkeypatch.setattr(auth, "_DETECTED_ACCOUNTS", set())
+    monkeypatch.setattr(auth, "_PENDING_CACHE", None)
+    monkeypatch.setattr(auth, "_LAST_FLUSH", float("-inf"))
+    monkeypatch.setattr(auth, "_build_app", fake_build_app)
+    monkeypatch.setenv("M365_MCP_CLIENT_ID", "client-1")
+    monkeypatch.setenv("M365_MCP_TENANT_ID", "common")
+    auth.reset_env_cache()
+    yield builds
+    auth.reset_env_cache()
+
+
+def test_get_app_reuses_application(isolated_auth: list[str]) -> None:
+    """Repeated calls return the same app without rebuilding it."""
+    first, tenant_id = auth.get_app()
+    second, _ = auth.get_app()
+
+    assert first is second
+    assert tenant_id == "common"
+    assert isolated_auth == ["common"]
+
+
+def test_get_app_rebuilds_when_tenant_changes(
+    isolated_auth: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Changing the tenant ID invalidates the cached app."""
+    first, _ = auth.get_app()
+    monkeypatch.setenv("M365_MCP_TENANT_ID", "consumers")
+    auth.reset_env_cache()
+    second, tenant_id = auth.get_app()
+
+    assert first is not second
+    assert tenant_id == "consumers"
+    assert isolated_auth == ["common", "consumers"]
+
+
+def test_get_app_uses_env_snapshot(
+    isolated_auth: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Environment changes are ignored until the env cache is reset."""
+    first, _ = auth.get_app()
+    monkeypatch.setenv("M365_MCP_TENANT_ID", "consumers")
+    second, tenant_id = auth.get_app()
+
+    assert first is second
+    assert tenant_id == "common"
+
+
+def test_env_config_requires_client_id(
+    isolated_auth: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """A missing client ID is reported, not cached."""
+    monkeypatch.delenv("M365_MCP_CLIENT_ID")
+    auth.reset_env_cache()
+
+    with pytest.raises(ValueError, match="M365_MCP_CLIENT_ID"):
+        auth.get_app()
+
+
+def test_consumer_app_is_reused_per_token_cache(isolated_auth: list[str]) -> None:
+    """The consumers fallback app is built once per shared token cache."""
+    cache = msal.SerializableTokenCache()
+
+    first = auth._consumer_app(cache)
+    second = auth._consumer_app(cache)
+    third = auth._consumer_app(msal.SerializableTokenCache())
+
+    assert first is second
+    assert third is not first
+    assert isolated_auth == ["consumers", "consumers"]
+
+
+def test_get_app_keeps_app_after_own_cache_write(
+    isolated_auth: list[str],
+) -> None:
+    """Writes made by this process do not force a rebuild."""
+    first, _ = auth.get_app()
+    auth._write_cache('{"AccessToken": {}}')
+    second, _ = auth.get_app()
+
+    assert first is second
+    assert isolated_auth == ["common"]
+
+
+def test_get_app_rebuilds_after_external_cache_write(
+    isolated_auth: list[str],
+) -> None:
+    """A token cache rewritten by another process is reloaded."""
+    first, _ = auth.get_app()
+    auth.CACHE_FILE.write_text('{"AccessToken": {"external": {}}}')
+    second, _ = auth.get_app()
+
+    assert first is not second
+    assert isolated_auth == ["common", "common"]
+
+
+def test_read_metadata_reuses_parsed_file(
+    isolated_auth: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Unchanged metadata is served from memory without re-parsing."""
+    auth._write_metadata({"acc-1": {"account_type": "personal"}})
+
+    def fail_read_bytes(*args: Any, **kwargs: Any) -> bytes:
+        raise AssertionError("metadata file should not be re-read")
+
+    monkeypatch.setattr(Path, "read_bytes", fail_read_bytes)
+
+    assert auth._read_metadata() == {"acc-1": {"account_type": "personal"}}
+
+
+def test_read_metadata_reloads_after_external_write(
+    isolated_auth: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Metadata rewritten by another process is picked up."""
+    auth._write_metadata({"acc-1": {"account_type": "personal"}})
+    auth.METADATA_FILE.write_text(
+        '{"acc-1": {"account_type": "personal"}, '
+        '"acc-2": {"account_type": "work_school"}}'
+    )
+
+    account_type = auth._read_metadata()["acc-2"]["account_type"]
+    assert account_type == "work_school"
+    assert account_type is auth._ACCOUNT_TYPES["work_school"]
+
+
+def test_list_accounts_reads_types_from_metadata(
+    isolated_auth: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Accounts without cached metadata are reported as unknown."""
+
+    class AccountsApp(FakeApp):
+        def get_accounts(self) -> list[dict[str, str]]:
+            return [
+                {"username": "ada@outlook.com", "home_account_id": "acc-1"},
+                {"username": "grace@contoso.com", "home_account_id": "acc-2"},
+            ]
+
+    monkeypatch.setattr(auth, "get_app", lambda: (AccountsApp("common"), "common"))
+    auth._write_metadata({"acc-1": {"account_type": "personal"}, "acc-2": {}})
+
+    assert auth.list_accounts() == [
+        auth.Account("ada@outlook.com", "acc-1", "personal"),
+        auth.Account("grace@contoso.com", "acc-2", "unknown"),
+    ]
+
+
+def test_get_account_type_batches_metadata_writes(
+    isolated_auth: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Detected types are served from memory and written in one batch."""
+    assert auth._get_account_type("acc-1", "ada@outlook.com") == "personal"
+    assert not auth.METADATA_FILE.exists()
+
+    def fail_read_bytes(*args: Any, **kwargs: Any) -> bytes:
+        raise AssertionError("metadata file should not be re-read")
+
+    monkeypatch.setattr(Path, "read_bytes", fail_read_bytes)
+
+    assert auth._get_account_type("acc-1", "ada@outlook.com") == "personal"
+    assert auth._flush_metadata() is True
+    assert auth._flush_metadata() is False
+    with open(auth.METADATA_FILE, encoding="utf-8") as metadata_file:
+        assert json.load(metadata_file) == {"acc-1": {"account_type": "personal"}}
+    assert not list(auth.METADATA_FILE.parent.glob("*.tmp"))
+
+
+def test_get_account_type_flushes_at_threshold(
+    isolated_auth: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Reaching the pending threshold writes every detected type at once."""
+    monkeypatch.setattr(auth, "METADATA_FLUSH_THRESHOLD", 2)
+    auth._write_metadata({"acc-0": {"account_type": "work_school"}})
+
+    auth._get_account_type("acc-1", "ada@outlook.com")
+    with open(auth.METADATA_FILE, encoding="utf-8") as metadata_file:
+        assert "acc-1" not in json.load(metadata_file)
+
+    auth._get_account_type("acc-2", "grace@contoso.com")
+    with open(auth.METADATA_FILE, encoding="utf-8") as metadata_file:
+        assert json.load(metadata_file) == {
+            "acc-0": {"account_type": "work_school"},
+            "acc-1": {"account_type": "personal"},
+            "acc-2": {"account_type": "work_school"},
+        }
+    assert auth._PENDING_ACCOUNT_TYPES == {}
+
+
+def test_write_cache_replaces_file_atomically(
+    isolated_auth: list[str], monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    """Token cache writes create missing directories once and leave no temp files."""
+    monkeypatch.setattr(auth, "CACHE_FILE", tmp_path / "nested" / "cache.json")
+    monkeypatch.setattr(auth, "_READY_DIRS", set())
+
+    auth._write_cache("first")
+    auth._write_cache("second")
+
+    assert auth.CACHE_FILE.read_text() == "second"
+    assert auth._READY_DIRS == {tmp_path / "nested"}
+    assert not list(auth.CACHE_FILE.parent.glob("*.tmp"))
+
+
+def test_get_token_defers_token_cache_writes(
+    isolated_auth: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Silent refreshes within the flush interval are written once at flush."""
+    cache = msal.SerializableTokenCache()
+
+    class TokenApp(FakeApp):
+        def get_accounts(self) -> list[dict[str, str]]:
+            return [{"username": "ada@example.com", "home_account_id": "acc-1"}]
+
+        def acquire_token_silent(
+            self, scopes: list[str], account: dict[str, str] | None = None
+        ) -> dict[str, str]:
+            cache.has_state_changed = True
+            return {"access_token": "token"}
+
+    app = TokenApp("common")
+    app.token_cache = cache
+    writes: list[str] = []
+    monkeypatch.setattr(auth, "get_app", lambda: (app, "common"))
+    monkeypatch.setattr(auth, "_get_account_type", lambda *args: "personal")
+    monkeypatch.setattr(auth, "_write_cache", lambda content: writes.append(content))
+    monkeypatch.setattr(auth.time, "monotonic", lambda: 100.0)
+
+    auth.get_token()
+    monkeypatch.setattr(auth, "_LAST_FLUSH", 100.0)
+    auth.get_token()
+    auth.get_token()
+
+    assert len(writes) == 1
+    assert auth._flush_token_cache() is True
+    assert len(writes) == 2
+    assert auth._flush_token_cache() is False
+
+
+def test_index_accounts_matches_ids_and_usernames() -> None:
+    """Accounts are indexed case-insensitively by ID and username, first wins."""
+    first = {"username": "Ada@Example.com", "home_account_id": "ACC-1"}
+    duplicate = {"username": "ada@example.com", "home_account_id": "acc-2"}
+
+    index = auth._index_accounts([first, duplicate])
+
+    assert index["acc-1"] is first
+    assert index["ada@example.com"] is first
+    assert index["acc-2"] is duplicate
+    assert auth._select_account([first, duplicate], {}, None, index) is first
+    assert (
+        auth._select_account(
+            [duplicate, first],
+            {"id_token_claims": {"preferred_username": "ADA@EXAMPLE.COM"}},
+            None,
+            index,
+        )
+        is first
+    )
+
+
+def test_select_account_matches_preferred_username_without_index() -> None:
+    """The preferred username is matched even when no index is supplied."""
+    accounts = [
+        {"username": "ada@example.com", "home_account_id": "acc-1"},
+        {"username": "grace@example.com", "home_account_id": "acc-2"},
+    ]
+    result = {"id_token_claims": {"preferred_username": "Grace@Example.com"}}
+
+    assert auth._select_account(accounts, result, None) is accounts[1]
+    assert auth._select_account(accounts, {}, None) is accounts[0]
+    assert auth._select_account([], result, None) is None
+    no_username = {"id_token_claims": {"preferred_username": None}}
+    assert auth._select_account(accounts, no_username, None) is accounts[0]
+
+
+def test_authenticate_new_account_falls_back_to_newest_account(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """A device-flow sign-in binds to the newest account when names differ."""
+    accounts = [
+        {"username": "ada@example.com", "home_account_id": "acc-1"},
+        {"username": "grace@example.com", "home_account_id": "acc-2"},
+    ]
+
+    class DeviceFlowApp:
+        def acquire_token_by_device_flow(self, flow: dict[str, Any]) -> dict[str, Any]:
+            return {"id_token_claims": {"preferred_username": "alias@example.com"}}
+
+        def get_accounts(self) -> list[dict[str, str]]:
+            return accounts
+
+    app = DeviceFlowApp()
+    monkeypatch.setattr(auth, "get_app", lambda: (app, "common"))
+    monkeypatch.setattr(
+        auth, "_initiate_device_flow", lambda app, tenant: (app, {"user_code": "X"})
+    )
+    monkeypatch.setattr(auth, "_save_token_cache_if_changed", lambda app: None)
+    monkeypatch.setattr(auth, "_get_account_type", lambda *args: "personal")
+    monkeypatch.setattr(auth, "_flush_metadata", lambda: True)
+
+    account = auth.authenticate_new_account()
+
+    assert account is not None
+    assert account.account_id == "acc-2"
+    # get_token() keeps preferring the first account
+    assert auth._select_account(accounts, {}, None) is accounts[0]
+
+
+def test_flush_metadata_keeps_entries_written_by_other_processes(
+    isolated_auth: list[str],
+) -> None:
+    """Pending types are merged into the file as it is at flush time."""
+    auth._write_metadata({"acc-0": {"account_type": "work_school"}})
+    auth._get_account_type("acc-1", "ada@outlook.com")
+    auth.METADATA_FILE.write_text(
+        '{"acc-0": {"account_type": "work_school"}, '
+        '"acc-9": {"account_type": "personal"}}'
+    )
+
+    assert auth._flush_metadata() is True
+    with open(auth.METADATA_FILE, encoding="utf-8") as metadata_file:
+        assert json.load(metadata_file) == {
+            "acc-0": {"account_type": "work_school"},
+            "acc-9": {"account_type": "personal"},
+            "acc-1": {"account_type": "personal"},
+        }
+
+
+def test_flush_metadata_replaces_corrupt_file_with_pending_types(
+    isolated_auth: list[str],
+) -> None:
+    """A corrupt metadata file does not swallow freshly detected types."""
+    auth.METADATA_FILE.write_text("{not json")
+    auth._get_account_type("acc-1", "ada@outlook.com")
+
+    assert auth._read_metadata() == {"acc-1": {"account_type": "personal"}}
+    assert auth._flush_metadata() is True
+    with open(auth.METADATA_FILE, encoding="utf-8") as metadata_file:
+        assert json.load(metadata_file) == {"acc-1": {"account_type": "personal"}}
+
+
+def test_atomic_write_skips_identical_content(tmp_path: Path) -> None:
+    """Rewriting a file with the same content leaves it untouched."""
+    target = tmp_path / "metadata.json"
+
+    assert auth._atomic_write_text(target, "same") is True
+    inode = target.stat().st_ino
+
+    assert auth._atomic_write_text(target, "same") is False
+    assert target.stat().st_ino == inode
+    assert auth._atomic_write_text(target, "different") is True
+    assert target.read_text() == "different"
+
+
+def test_get_token_detects_account_type_once(
+    isolated_auth: list[str], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Account type detection runs on the first token request only."""
+    detections: list[str] = []
+
+    class TokenApp(FakeApp):
+        def get_accounts(self) -> list[dict[str, str]]:
+            return [{"username": "ada@example.com", "home_account_id": "acc-1"}]
+
+        def acquire_token_silent(
+            self, scopes: list[str], account: dict[str, str] | None = None
+        ) -> dict[str, str]:
+            return {"access_token": "token"}
+
+    def fake_get_account_type(account_id: str, username: str) -> str:
+        detections.append(account_id)
+        return "work_school"
+
+    app = TokenApp("common")
+    monkeypatch.setattr(auth, "get_app", lambda: (app, "common"))
+    monkeypatch.setattr(auth, "_get_account_type", fake_get_account_type)
+
+    assert auth.get_token() == "token"
+    assert auth.get_token() == "token"
+    assert detections == ["acc-1"]
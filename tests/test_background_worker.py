@@ -5,6 +5,8 @@ Tests for background worker task queue system.
 import asyncio
 import pytest
 import tempfile
+import time
+import uuid
 from pathlib import Path
 
 from src.m365_mcp.cache import CacheManager
@@ -87,6 +89,43 @@ class TestTaskEnqueuing:
         tasks = cache_manager.list_tasks(limit=10)
         assert len(tasks) == 5
 
+    def test_enqueue_tasks_batch(self, cache_manager):
+        """Batch enqueueing should insert every task and notify once."""
+        notifications = []
+        cache_manager.add_task_listener(lambda: notifications.append(1))
+
+        task_ids = cache_manager.enqueue_tasks(
+            [
+                {
+                    "account_id": "batch-account",
+                    "operation": "email_list",
+                    "parameters": {"folder": "inbox"},
+                },
+                {
+                    "account_id": "batch-account",
+                    "operation": "folder_get_tree",
+                    "parameters": {},
+                    "priority": 2,
+                },
+            ]
+        )
+
+        assert len(task_ids) == 2
+        assert notifications == [1]
+        assert cache_manager.get_task_status(task_ids[0])["priority"] == 5
+        assert cache_manager.get_task_status(task_ids[1])["priority"] == 2
+        assert cache_manager.enqueue_tasks([]) == []
+
+    def test_task_ids_are_time_ordered_uuid7(self, cache_manager):
+        """Task IDs should be version 7 UUIDs that sort by creation time."""
+        first = cache_manager.enqueue_task("acc", "email_list", {})
+        time.sleep(0.002)
+        second = cache_manager.enqueue_task("acc", "email_list", {})
+
+        assert uuid.UUID(first).version == 7
+        assert uuid.UUID(first).variant == uuid.RFC_4122
+        assert first < second
+
 
 class TestTaskStatusTracking:
     """Test task status tracking."""
@@ -187,6 +226,26 @@ class TestBackgroundWorker:
         await worker.stop()
         assert worker.is_running is False
 
+    @pytest.mark.asyncio
+    async def test_idle_worker_wakes_on_enqueue(
+        self, cache_manager, mock_tool_executor
+    ):
+        """Test an idle worker picks up a new task without waiting to poll."""
+        worker = BackgroundWorker(cache_manager, mock_tool_executor, idle_timeout=60.0)
+        await worker.start()
+        try:
+            await asyncio.sleep(0.05)  # Let the loop find the queue empty
+            task_id = cache_manager.enqueue_task("acc", "op", {}, priority=1)
+
+            for _ in range(50):
+                if cache_manager.get_task_status(task_id)["status"] == "completed":
+                    break
+                await asyncio.sleep(0.02)
+
+            assert cache_manager.get_task_status(task_id)["status"] == "completed"
+        finally:
+            await asyncio.wait_for(worker.stop(), timeout=1.0)
+
     @pytest.mark.asyncio
     async def test_process_single_task(self, cache_manager, mock_tool_executor):
         """Test processing a single task."""
@@ -207,6 +266,22 @@ class TestBackgroundWorker:
         task = cache_manager.get_task_status(task_id)
         assert task["status"] == "completed"
 
+    @pytest.mark.asyncio
+    async def test_task_result_with_non_string_keys_is_stored(self, cache_manager):
+        """Test results keyed by integers are stored as JSON objects."""
+
+        async def executor(operation, parameters):
+            return {1: "one", "nested": {2: "two"}}
+
+        worker = BackgroundWorker(cache_manager, executor)
+        task_id = cache_manager.enqueue_task("acc", "op", {}, priority=1)
+
+        assert await worker.process_next_task() is True
+
+        task = cache_manager.get_task_status(task_id)
+        assert task["status"] == "completed"
+        assert '"1":"one"' in task["result"]
+
     @pytest.mark.asyncio
     async def test_concurrent_workers_claim_single_task_once(self, cache_manager):
         """Two workers racing for one queued task should process it only once."""
@@ -309,7 +384,9 @@ class TestRetryLogic:
         async def always_failing_executor(operation, parameters):
             raise Exception("Always fails")
 
-        worker = BackgroundWorker(cache_manager, always_failing_executor, max_retries=2)
+        worker = BackgroundWorker(
+            cache_manager, always_failing_executor, max_retries=2, initial_backoff=0
+        )
 
         task_id = cache_manager.enqueue_task("acc", "op", {}, 5)
 
@@ -321,3 +398,75 @@ class TestRetryLogic:
         task = cache_manager.get_task_status(task_id)
         assert task["status"] == "failed"
         assert task["error"] is not None
+
+    @pytest.mark.asyncio
+    async def test_backed_off_task_does_not_block_queue(self, cache_manager):
+        """Test a task waiting on retry backoff lets other tasks run."""
+        processed = []
+
+        async def executor(operation, parameters):
+            processed.append(operation)
+            if operation == "flaky":
+                raise Exception("Simulated failure")
+            return {"success": True}
+
+        worker = BackgroundWorker(cache_manager, executor, initial_backoff=60)
+
+        flaky_id = cache_manager.enqueue_task("acc", "flaky", {}, priority=1)
+        other_id = cache_manager.enqueue_task("acc", "other", {}, priority=5)
+
+        assert await worker.process_next_task() is True
+        flaky = cache_manager.get_task_status(flaky_id)
+        assert flaky["status"] == "queued"
+
+        assert await worker.process_next_task() is True
+        assert cache_manager.get_task_status(other_id)["status"] == "completed"
+        assert processed == ["flaky", "other"]
+
+        # Only the backed-off task is left, and it is not due yet
+        assert await worker.process_next_task() is False
+        delay = worker._next_retry_delay()
+        assert delay is not None
+        assert 30 <= delay <= 90
+
+    def test_next_retry_delay_reads_without_write_lock(
+        self, cache_manager, monkeypatch
+    ):
+        """Test the idle retry lookup runs outside a write transaction."""
+        worker = BackgroundWorker(cache_manager, None)
+        task_id = cache_manager.enqueue_task("acc", "op", {}, 5)
+        with cache_manager._db() as conn:
+            conn.execute(
+                "UPDATE cache_tasks SET retry_after = ? WHERE task_id = ?",
+                (time.time() + 60, task_id),
+            )
+
+        def no_write(*args, **kwargs):
+            raise AssertionError("write transaction opened")
+
+        monkeypatch.setattr(worker, "_db", no_write)
+        monkeypatch.setattr(cache_manager, "_db", no_write)
+
+        delay = worker._next_retry_delay()
+        assert delay is not None
+        assert 55 <= delay <= 60
+
+    def test_backoff_is_capped(self, cache_manager, monkeypatch):
+        """Test the backoff delay never exceeds the jittered cap."""
+        worker = BackgroundWorker(
+            cache_manager, None, max_retries=20, initial_backoff=1, max_backoff=10
+        )
+        monkeypatch.setattr(
+            "src.m365_mcp.background_worker.random.uniform", lambda a, b: b
+        )
+        task_id = cache_manager.enqueue_task("acc", "op", {}, 5)
+        task = {"task_id": task_id, "retry_count": 15}
+
+        before = time.time()
+        asyncio.run(worker._handle_task_failure(task, Exception("boom")))
+
+        with cache_manager._db() as conn:
+            retry_after = conn.execute(
+                "SELECT retry_after FROM cache_tasks WHERE task_id = ?", (task_id,)
+            ).fetchone()[0]
+        assert before + 10 <= retry_after <= time.time() + 15
@@ -2,11 +2,15 @@
 Tests for encrypted cache manager.
 """
 
+import gc
 import pytest
 import tempfile
 from pathlib import Path
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import replace
 from types import SimpleNamespace
 
 from src.m365_mcp import cache as cache_module
@@ -15,6 +19,7 @@ from src.m365_mcp.cache_config import (
     CONNECTION_POOL_SIZE,
     CONNECTION_TIMEOUT,
     SQLCIPHER_SETTINGS,
+    STATEMENT_CACHE_SIZE,
     generate_cache_key,
 )
 from src.m365_mcp.encryption import EncryptionKeyManager
@@ -52,8 +57,8 @@ def cache_manager_no_encryption(temp_cache_db):
 class TestCacheBasics:
     """Test basic cache operations."""
 
-    def test_cache_uses_configured_pool_size_by_default(self, temp_cache_db):
-        """Default pool size should come from cache configuration."""
+    def test_cache_uses_configured_read_cap_by_default(self, temp_cache_db):
+        """Default read connection cap should come from cache configuration."""
         manager = CacheManager(db_path=temp_cache_db, encryption_enabled=False)
 
         assert manager.max_connections == CONNECTION_POOL_SIZE
@@ -160,7 +165,7 @@ class TestCacheBasics:
         )
 
     def test_cache_operations_across_threads(self, tmp_path):
-        """Connections reused from the pool should work across worker threads."""
+        """The shared connection should work across worker threads."""
         manager = CacheManager(
             db_path=str(tmp_path / "threaded.db"),
             encryption_enabled=False,
@@ -183,26 +188,119 @@ class TestCacheBasics:
         assert results == [{"value": index} for index in range(24)]
         manager.close()
 
-    def test_erroring_connection_is_not_returned_to_pool(self, tmp_path):
-        """Connections that error should be discarded instead of reused."""
+    def test_plaintext_database_uses_larger_page_size(self, tmp_path):
+        """page_size must be applied before the schema is first written."""
         manager = CacheManager(
-            db_path=str(tmp_path / "poisoned.db"),
+            db_path=str(tmp_path / "pages.db"),
             encryption_enabled=False,
-            max_connections=1,
         )
 
-        with manager._db():
-            pass
+        with manager._db() as conn:
+            assert conn.execute("PRAGMA page_size").fetchone()[0] == 8192
+            assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        manager.close()
+
+    def test_shared_connection_is_reused_and_rolled_back(self, tmp_path):
+        """The shared connection survives errors that are not database errors."""
+        manager = CacheManager(
+            db_path=str(tmp_path / "shared.db"),
+            encryption_enabled=False,
+        )
 
-        assert len(manager._connection_pool) == 1
+        with manager._db() as conn:
+            first = conn
 
         with pytest.raises(RuntimeError, match="boom"):
-            with manager._db():
+            with manager._db() as conn:
+                conn.execute("DELETE FROM cache_entries")
                 raise RuntimeError("boom")
 
-        assert manager._connection_pool == []
+        assert manager._conn is first
+        assert not first.in_transaction
         manager.close()
 
+    def test_write_blocks_use_explicit_transactions(self, tmp_path):
+        """_db() opens one transaction that nested blocks join."""
+        manager = CacheManager(
+            db_path=str(tmp_path / "txn.db"),
+            encryption_enabled=False,
+        )
+
+        with manager._db() as conn:
+            assert conn.isolation_level is None
+            assert conn.in_transaction
+            with manager._db() as inner:
+                assert inner is conn
+                inner.execute("DELETE FROM cache_entries")
+            assert conn.in_transaction
+
+        assert not conn.in_transaction
+        manager.close()
+
+    def test_database_error_replaces_shared_connection(self, tmp_path):
+        """Connections that raise a database error should be reopened."""
+        manager = CacheManager(
+            db_path=str(tmp_path / "poisoned.db"),
+            encryption_enabled=False,
+        )
+
+        with manager._db() as conn:
+            first = conn
+
+        with pytest.raises(cache_module.sqlite3.OperationalError):
+            with manager._db() as conn:
+                conn.execute("SELECT * FROM missing_table")
+
+        assert manager._conn is None
+        with manager._db() as conn:
+            assert conn is not first
+        manager.close()
+
+    def test_read_connections_are_per_thread(self, tmp_path):
+        """Read-only queries use their own connection and see committed writes."""
+        manager = CacheManager(
+            db_path=str(tmp_path / "reads.db"),
+            encryption_enabled=False,
+        )
+        manager.set_cached("reader", "email_list", {}, {"value": 1})
+
+        with manager._db_read() as conn:
+            assert conn is not manager._conn
+            count = conn.execute("SELECT COUNT(*) FROM cache_entries").fetchone()[0]
+
+        assert count == 1
+        assert manager.get_stats()["entry_count"] == 1
+        assert len(manager._read_conns) == 1
+
+        manager.close()
+        assert manager._conn is None
+        assert manager._read_conns == {}
+
+    def test_read_connection_closed_when_thread_exits(self, tmp_path):
+        """A read connection opened by a finished thread should not linger."""
+        manager = CacheManager(
+            db_path=str(tmp_path / "thread_reads.db"),
+            encryption_enabled=False,
+        )
+        opened = []
+
+        def read() -> None:
+            with manager._db_read() as conn:
+                opened.append(conn)
+                conn.execute("SELECT 1").fetchone()
+
+        try:
+            worker = threading.Thread(target=read)
+            worker.start()
+            worker.join()
+            gc.collect()
+
+            assert manager._read_conns == {}
+            with pytest.raises(cache_module.sqlite3.ProgrammingError):
+                opened[0].execute("SELECT 1")
+        finally:
+            manager.close()
+
     def test_cache_initialization_recovers_corrupt_database(self, tmp_path):
         """Recoverable startup corruption should recreate an empty cache DB."""
         db_path = tmp_path / "corrupt.db"
@@ -217,6 +315,104 @@ class TestCacheBasics:
         finally:
             manager.close()
 
+    def test_cache_initialization_adds_missing_task_columns(self, tmp_path):
+        """Databases created before retry_after existed gain the column."""
+        db_path = tmp_path / "old.db"
+        conn = cache_module.sqlite3.connect(str(db_path))
+        conn.execute(
+            """
+            CREATE TABLE cache_tasks (
+                task_id TEXT PRIMARY KEY NOT NULL,
+                account_id TEXT NOT NULL,
+                operation TEXT NOT NULL,
+                parameters_json TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'queued',
+                priority INTEGER NOT NULL DEFAULT 5,
+                retry_count INTEGER NOT NULL DEFAULT 0,
+                max_retries INTEGER NOT NULL DEFAULT 3,
+                last_error TEXT,
+                created_at REAL NOT NULL,
+                started_at REAL,
+                completed_at REAL,
+                result_json TEXT,
+                version INTEGER NOT NULL DEFAULT 1
+            )
+            """
+        )
+        conn.commit()
+        conn.close()
+
+        manager = CacheManager(db_path=str(db_path), encryption_enabled=False)
+
+        try:
+            with manager._db() as conn:
+                columns = {
+                    row[1] for row in conn.execute("PRAGMA table_info(cache_tasks)")
+                }
+            assert "retry_after" in columns
+        finally:
+            manager.close()
+
+    def test_cache_initialization_skips_migration_when_schema_current(self, tmp_path):
+        """Reopening a current database should not re-run the migration script."""
+        db_path = tmp_path / "current.db"
+        CacheManager(db_path=str(db_path), encryption_enabled=False).close()
+
+        conn = cache_module.sqlite3.connect(str(db_path))
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == (
+            cache_module._SCHEMA_VERSION
+        )
+        conn.execute("DROP INDEX idx_cache_account_key")
+        conn.commit()
+        conn.close()
+
+        manager = CacheManager(db_path=str(db_path), encryption_enabled=False)
+        try:
+            with manager._db_read() as conn:
+                indexes = {
+                    row[0]
+                    for row in conn.execute(
+                        "SELECT name FROM sqlite_master WHERE type = 'index'"
+                    )
+                }
+            assert "idx_cache_account_key" not in indexes
+        finally:
+            manager.close()
+
+    def test_split_sql_statements_keeps_trigger_bodies_whole(self):
+        """Semicolons inside a trigger body should not end the statement."""
+        statements = cache_module._split_sql_statements(
+            "CREATE TABLE t (x INTEGER);\n"
+            "-- keeps a running count\n"
+            "CREATE TRIGGER trg AFTER INSERT ON t\n"
+            "BEGIN\n"
+            "    UPDATE t SET x = x + 1;\n"
+            "END;\n"
+        )
+
+        assert len(statements) == 2
+        assert statements[1].endswith("END;")
+
+    def test_cache_initialization_rolls_back_failed_migration(
+        self, tmp_path, monkeypatch
+    ):
+        """A migration that fails part way should leave no schema behind."""
+        db_path = tmp_path / "partial.db"
+
+        def fail(conn):
+            raise RuntimeError("migration interrupted")
+
+        monkeypatch.setattr(CacheManager, "_add_missing_columns", staticmethod(fail))
+        with pytest.raises(RuntimeError, match="migration interrupted"):
+            CacheManager(db_path=str(db_path), encryption_enabled=False)
+
+        conn = cache_module.sqlite3.connect(str(db_path))
+        try:
+            assert conn.execute("PRAGMA user_version").fetchone()[0] == 0
+            assert conn.execute("SELECT COUNT(*) FROM sqlite_master").fetchone() == (0,)
+        finally:
+            conn.close()
+
     @pytest.mark.skipif(
         not cache_module.USING_SQLCIPHER,
         reason="SQLCipher is required to exercise encrypted key mismatch recovery.",
@@ -346,6 +542,28 @@ class TestCacheCompression:
             row = cursor.fetchone()
             assert row["is_compressed"] == 0
 
+    def test_compression_kept_only_when_it_shrinks(self, cache_manager, monkeypatch):
+        """Compressed output that is not smaller should be discarded."""
+        monkeypatch.setattr(
+            cache_module,
+            "_compress",
+            lambda data: (data + b"pad", cache_module.CODEC_GZIP),
+        )
+        params = {"folder": "inbox"}
+        data = {"emails": ["x" * 100 for _ in range(1000)]}
+
+        cache_manager.set_cached("test-account", "email_list", params, data)
+
+        cache_key = generate_cache_key("test-account", "email_list", params)
+        with cache_manager._db() as conn:
+            row = conn.execute(
+                "SELECT is_compressed, compression_codec FROM cache_entries "
+                "WHERE cache_key = ?",
+                (cache_key,),
+            ).fetchone()
+        assert row["is_compressed"] == 0
+        assert row["compression_codec"] is None
+
     def test_large_entry_compression(self, cache_manager):
         """Test large entries are compressed."""
         account_id = "test-account"
@@ -373,6 +591,94 @@ class TestCacheCompression:
         cached_data, _ = result
         assert cached_data == data
 
+    def test_large_entry_uses_zstd_codec(self, cache_manager):
+        """Test large entries record the codec used to compress them."""
+        data = {"emails": [{"id": str(i), "subject": "X" * 1000} for i in range(100)]}
+        cache_manager.set_cached("test-account", "email_list", {}, data)
+
+        cache_key = generate_cache_key("test-account", "email_list", {})
+        with cache_manager._db() as conn:
+            row = conn.execute(
+                "SELECT compression_codec FROM cache_entries WHERE cache_key = ?",
+                (cache_key,),
+            ).fetchone()
+
+        expected = (
+            cache_module.CODEC_ZSTD
+            if cache_module.zstandard is not None
+            else cache_module.CODEC_GZIP
+        )
+        assert row["compression_codec"] == expected
+
+    def test_compression_runs_outside_write_lock(self, cache_manager, monkeypatch):
+        """Compressing and decompressing should not hold the write lock."""
+        lock_free = []
+
+        def lock_is_free() -> bool:
+            result = []
+
+            def probe():
+                acquired = cache_manager._write_lock.acquire(blocking=False)
+                if acquired:
+                    cache_manager._write_lock.release()
+                result.append(acquired)
+
+            thread = threading.Thread(target=probe)
+            thread.start()
+            thread.join()
+            return result[0]
+
+        real_compress = cache_module._compress
+        real_decompress = cache_module._decompress
+
+        def compress(data):
+            lock_free.append(lock_is_free())
+            return real_compress(data)
+
+        def decompress(data, codec):
+            lock_free.append(lock_is_free())
+            return real_decompress(data, codec)
+
+        monkeypatch.setattr(cache_module, "_compress", compress)
+        monkeypatch.setattr(cache_module, "_decompress", decompress)
+
+        data = {"emails": [{"id": str(i), "subject": "X" * 1000} for i in range(100)]}
+        cache_manager.set_cached("test-account", "email_list", {}, data)
+        cached_data, _state = cache_manager.get_cached("test-account", "email_list", {})
+
+        assert cached_data == data
+        assert lock_free == [True, True]
+
+    def test_legacy_gzip_entry_is_readable(self, cache_manager):
+        """Test compressed rows without a codec are decoded as gzip."""
+        import gzip
+        import json
+
+        data = {"emails": [{"id": "1", "subject": "legacy"}]}
+        cache_key = generate_cache_key("test-account", "email_list", {})
+        now = time.time()
+        with cache_manager._db() as conn:
+            conn.execute(
+                """
+                INSERT INTO cache_entries
+                (cache_key, account_id, resource_type, data_json, is_compressed,
+                 data_size_bytes, created_at, accessed_at, fresh_until, expires_at)
+                VALUES (?, 'test-account', 'email_list', ?, 1, 0, ?, ?, ?, ?)
+                """,
+                (
+                    cache_key,
+                    gzip.compress(json.dumps(data).encode("utf-8")),
+                    now,
+                    now,
+                    now + 300,
+                    now + 3600,
+                ),
+            )
+
+        result = cache_manager.get_cached("test-account", "email_list", {})
+        assert result is not None
+        assert result[0] == data
+
 
 class TestCacheTTL:
     """Test TTL and state detection."""
@@ -418,6 +724,27 @@ class TestCacheTTL:
         _, state = result
         assert state == CacheState.STALE
 
+    def test_get_fresh_keys_returns_only_fresh_entries(self, cache_manager):
+        """Bulk freshness check should match get_cached without side effects."""
+        resource_type = "folder_get_tree"  # fresh=1800s
+        fresh_key = generate_cache_key("acc", resource_type, {"folder_id": "a"})
+        stale_key = generate_cache_key("acc", resource_type, {"folder_id": "b"})
+        missing_key = generate_cache_key("acc", resource_type, {"folder_id": "c"})
+        cache_manager.set_cached("acc", resource_type, {"folder_id": "a"}, {"x": 1})
+        cache_manager.set_cached("acc", resource_type, {"folder_id": "b"}, {"x": 2})
+
+        with cache_manager._db() as conn:
+            conn.execute(
+                "UPDATE cache_entries SET created_at = ? WHERE cache_key = ?",
+                (time.time() - 3600, stale_key),
+            )
+
+        fresh = cache_manager.get_fresh_keys([fresh_key, stale_key, missing_key])
+
+        assert fresh == {fresh_key}
+        assert cache_manager._hit_buffer == {}
+        assert cache_manager.list_tasks() == []
+
     def test_expired_state(self, cache_manager):
         """Test expired cache returns None."""
         account_id = "test-account"
@@ -442,6 +769,36 @@ class TestCacheTTL:
         result = cache_manager.get_cached(account_id, resource_type, params)
         assert result is None
 
+    def test_expired_delete_keeps_concurrent_refresh(self, cache_manager, monkeypatch):
+        """A refresh written after the expired read must not be deleted."""
+        resource_type = "folder_get_tree"
+        params = {"folder_id": "root"}
+        cache_manager.set_cached("acc", resource_type, params, {"v": "old"})
+        cache_key = generate_cache_key("acc", resource_type, params)
+        with cache_manager._db() as conn:
+            conn.execute(
+                "UPDATE cache_entries SET created_at = ? WHERE cache_key = ?",
+                (time.time() - 10000, cache_key),
+            )
+
+        real_db_read = cache_manager._db_read
+
+        @contextmanager
+        def read_then_refresh():
+            with real_db_read() as conn:
+                yield conn
+            # A worker refresh lands between the read and the expiry delete
+            monkeypatch.setattr(cache_manager, "_db_read", real_db_read)
+            cache_manager.set_cached("acc", resource_type, params, {"v": "new"})
+
+        monkeypatch.setattr(cache_manager, "_db_read", read_then_refresh)
+
+        assert cache_manager.get_cached("acc", resource_type, params) is None
+        assert cache_manager.get_cached("acc", resource_type, params) == (
+            {"v": "new"},
+            CacheState.FRESH,
+        )
+
 
 class TestCacheInvalidation:
     """Test cache invalidation."""
@@ -494,6 +851,34 @@ class TestCacheInvalidation:
 
         assert count == 2
 
+    def test_invalidate_prefix_matches_literally(self, cache_manager):
+        """Prefix patterns treat "_" and "?" literally and stop at the prefix."""
+        cache_manager.set_cached("acc", "email_list", {}, {"emails": []})
+        cache_manager.set_cached("acc", "emailXlist", {}, {"emails": []})
+        cache_manager.set_cached("acc", "email_list2", {}, {"emails": []})
+        cache_manager.set_cached("acc", "email?list", {}, {"emails": []})
+
+        assert cache_manager.invalidate_pattern("email_list:*") == 1
+        assert cache_manager.invalidate_pattern("email?list:*") == 1
+        assert cache_manager.get_cached("acc", "emailXlist", {}) is not None
+        assert cache_manager.get_cached("acc", "email_list2", {}) is not None
+
+    def test_invalidate_prefix_uses_primary_key_range(self, cache_manager):
+        """Trailing-wildcard patterns should become a cache_key range."""
+        calls = []
+        with cache_manager._db() as conn:
+            conn.set_trace_callback(calls.append)
+        try:
+            cache_manager.invalidate_pattern("email_list:acc:*", account_id="acc")
+        finally:
+            with cache_manager._db() as conn:
+                conn.set_trace_callback(None)
+
+        assert any(
+            "cache_key >= 'email_list:acc:' AND cache_key < 'email_list:acc;'" in sql
+            for sql in calls
+        )
+
 
 class TestCacheCleanup:
     """Test cache cleanup functionality."""
@@ -529,6 +914,104 @@ class TestCacheCleanup:
         )
         assert result is None
 
+    def test_total_bytes_tracked_incrementally(self, cache_manager):
+        """cache_meta.total_bytes should follow inserts, replaces and deletes."""
+
+        def tracked_and_actual():
+            with cache_manager._db() as conn:
+                tracked = conn.execute(
+                    "SELECT total_bytes FROM cache_meta WHERE id = 1"
+                ).fetchone()[0]
+                actual = conn.execute(
+                    "SELECT COALESCE(SUM(data_size_bytes), 0) FROM cache_entries"
+                ).fetchone()[0]
+            return tracked, actual
+
+        cache_manager.set_cached("meta", "email_list", {"i": 1}, {"v": "a"})
+        cache_manager.set_cached("meta", "email_list", {"i": 2}, {"v": "bb"})
+        # Replacing an entry must not double-count its old size
+        cache_manager.set_cached("meta", "email_list", {"i": 1}, {"v": "a" * 50})
+        tracked, actual = tracked_and_actual()
+        assert tracked == actual > 0
+
+        cache_manager.invalidate_pattern("email_list:meta:*")
+        assert tracked_and_actual() == (0, 0)
+
+    def test_rewrite_updates_entry_in_place(self, cache_manager):
+        """Re-caching a key should update its row and reset the hit count."""
+        cache_key = generate_cache_key("acc", "email_list", {})
+
+        def row_state():
+            with cache_manager._db() as conn:
+                return tuple(
+                    conn.execute(
+                        "SELECT rowid, hit_count FROM cache_entries "
+                        "WHERE cache_key = ?",
+                        (cache_key,),
+                    ).fetchone()
+                )
+
+        cache_manager.set_cached("acc", "email_list", {}, {"v": 1})
+        cache_manager.get_cached("acc", "email_list", {})
+        cache_manager.flush_hit_counts()
+        rowid, hits = row_state()
+        assert hits == 1
+
+        cache_manager.set_cached("acc", "email_list", {}, {"v": 2})
+
+        assert row_state() == (rowid, 0)
+        cached_data, _state = cache_manager.get_cached("acc", "email_list", {})
+        assert cached_data == {"v": 2}
+
+    def test_size_check_runs_every_nth_write(self, cache_manager, monkeypatch):
+        """set_cached should only probe the cache size periodically."""
+        checks = []
+        monkeypatch.setattr(
+            cache_module,
+            "CACHE_LIMITS",
+            replace(cache_module.CACHE_LIMITS, cleanup_check_interval=3),
+        )
+        monkeypatch.setattr(cache_manager, "_check_cleanup", lambda: checks.append(1))
+
+        for index in range(7):
+            cache_manager.set_cached("acc", "email_list", {"i": index}, {"v": index})
+
+        # First write, then every third write after it
+        assert len(checks) == 3
+
+    def test_cleanup_to_target_evicts_least_recently_used(
+        self, cache_manager, monkeypatch
+    ):
+        """LRU cleanup should evict oldest-accessed entries until under target."""
+        for index in range(5):
+            cache_manager.set_cached("lru", "email_list", {"i": index}, {"v": index})
+
+        with cache_manager._db() as conn:
+            for index in range(5):
+                key = generate_cache_key("lru", "email_list", {"i": index})
+                conn.execute(
+                    "UPDATE cache_entries SET data_size_bytes = 100, "
+                    "accessed_at = ? WHERE cache_key = ?",
+                    (1000.0 + index, key),
+                )
+
+        # 500 bytes stored against a 250 byte target: evict the oldest three
+        monkeypatch.setattr(
+            cache_module,
+            "CACHE_LIMITS",
+            replace(cache_module.CACHE_LIMITS, max_total_bytes=500, cleanup_target=0.5),
+        )
+        cache_manager._cleanup_to_target()
+
+        with cache_manager._db() as conn:
+            remaining = {
+                row["cache_key"]
+                for row in conn.execute("SELECT cache_key FROM cache_entries")
+            }
+        assert remaining == {
+            generate_cache_key("lru", "email_list", {"i": index}) for index in (3, 4)
+        }
+
 
 class TestCacheStats:
     """Test cache statistics."""
@@ -569,6 +1052,7 @@ class TestCacheStats:
             cache_manager.get_cached(account_id, resource_type, params)
 
         # Check hit count in database
+        cache_manager.flush_hit_counts()
         cache_key = generate_cache_key(account_id, resource_type, params)
         with cache_manager._db() as conn:
             cursor = conn.execute(
@@ -577,6 +1061,30 @@ class TestCacheStats:
             row = cursor.fetchone()
             assert row["hit_count"] == 5
 
+    def test_hits_are_buffered_until_flushed(self, cache_manager, monkeypatch):
+        """Cache hits should be counted in memory and written in batches."""
+        monkeypatch.setattr(
+            cache_module,
+            "CACHE_LIMITS",
+            replace(cache_module.CACHE_LIMITS, hit_flush_max_keys=2),
+        )
+        cache_manager.set_cached("acc", "email_list", {"i": 1}, {"v": 1})
+        cache_manager.set_cached("acc", "email_list", {"i": 2}, {"v": 2})
+
+        def stored_hits():
+            with cache_manager._db() as conn:
+                rows = conn.execute("SELECT hit_count FROM cache_entries")
+                return sorted(row[0] for row in rows)
+
+        cache_manager.get_cached("acc", "email_list", {"i": 1})
+        cache_manager.get_cached("acc", "email_list", {"i": 1})
+        assert stored_hits() == [0, 0]
+
+        # A second distinct key reaches hit_flush_max_keys and flushes
+        cache_manager.get_cached("acc", "email_list", {"i": 2})
+        assert stored_hits() == [1, 2]
+        assert cache_manager._hit_buffer == {}
+
 
 class TestCacheEncryption:
     """Test encryption functionality."""
@@ -620,6 +1128,8 @@ class TestCacheEncryption:
         assert captured["kwargs"] == {
             "timeout": CONNECTION_TIMEOUT,
             "check_same_thread": False,
+            "isolation_level": None,
+            "cached_statements": STATEMENT_CACHE_SIZE,
         }
         assert (
             EncryptionKeyManager.sqlcipher_key_pragma(manager.encryption_key)
@@ -629,6 +1139,9 @@ class TestCacheEncryption:
             pragma_value = int(value) if isinstance(value, bool) else value
             assert f"PRAGMA {setting} = {pragma_value}" in statements
         assert "PRAGMA cipher_compatibility = 4" in statements
+        assert "PRAGMA mmap_size = 268435456" in statements
+        assert "PRAGMA wal_autocheckpoint = 1000" in statements
+        assert "PRAGMA page_size = 8192" not in statements
 
     def test_encryption_requires_sqlcipher(self, tmp_path, monkeypatch):
         """Encrypted mode should fail loudly without SQLCipher."""
@@ -20,7 +20,10 @@ from src.m365_mcp.cache_config import (
     get_ttl_policy,
     TTL_POLICIES,
     CACHE_LIMITS,
+    CACHE_WARMING_OPERATIONS,
     CacheState,
+    _hash_flat_parameters,
+    _validate_warming_operations,
 )
 
 
@@ -108,6 +111,7 @@ class TestDatabaseCreation:
             expected_tables = [
                 "cache_entries",
                 "cache_invalidation",
+                "cache_meta",
                 "cache_stats",
                 "cache_tasks",
                 "schema_version",
@@ -125,12 +129,14 @@ class TestDatabaseCreation:
             expected_indexes = [
                 "idx_cache_accessed",
                 "idx_cache_account_fresh",
+                "idx_cache_account_key",
                 "idx_cache_account_resource",
                 "idx_cache_expires",
                 "idx_invalidation_account_time",
                 "idx_stats_period",
-                "idx_tasks_account",
+                "idx_tasks_account_status_created",
                 "idx_tasks_created",
+                "idx_tasks_queue",
                 "idx_tasks_status_priority",
             ]
 
@@ -237,6 +243,43 @@ class TestCacheConfiguration:
         )
         assert key2 == key4
 
+    def test_single_scalar_parameter_key_matches_sorted_form(self):
+        """The unsorted fast path must hash exactly like the sorted form."""
+        import hashlib
+
+        import orjson
+
+        params = {"folder_id": "root"}
+        expected = hashlib.blake2b(
+            orjson.dumps(params, option=orjson.OPT_SORT_KEYS), digest_size=8
+        ).hexdigest()
+
+        key = generate_cache_key("acc-123", "folder_get_tree", params)
+
+        assert key == f"folder_get_tree:acc-123:{expected}"
+
+    def test_flat_parameter_hashes_are_memoized(self):
+        """Repeated flat parameters hit the memo; equal-but-distinct types don't."""
+        _hash_flat_parameters.cache_clear()
+
+        first = generate_cache_key("acc-1", "email_list", {"top": 1, "folder": "x"})
+        second = generate_cache_key("acc-2", "email_list", {"folder": "x", "top": 1})
+        as_bool = generate_cache_key(
+            "acc-1", "email_list", {"top": True, "folder": "x"}
+        )
+
+        assert first.rsplit(":", 1)[1] == second.rsplit(":", 1)[1]
+        assert first.rsplit(":", 1)[1] != as_bool.rsplit(":", 1)[1]
+        info = _hash_flat_parameters.cache_info()
+        assert (info.hits, info.misses) == (1, 2)
+
+    def test_nested_parameters_bypass_memo(self):
+        """Unhashable values are hashed directly and stay order-independent."""
+        key1 = generate_cache_key("acc", "search", {"q": {"a": 1, "b": [2]}})
+        key2 = generate_cache_key("acc", "search", {"q": {"b": [2], "a": 1}})
+
+        assert key1 == key2
+
     def test_parse_cache_key(self):
         """Test cache key parsing."""
         # Simple key
@@ -251,6 +294,11 @@ class TestCacheConfiguration:
         assert parsed["account_id"] == "acc-123"
         assert parsed["param_hash"] == "8f4b2c3d"
 
+        # Anything after the third field stays in param_hash
+        parsed = parse_cache_key("folder_get_tree:acc-123:8f4b:2c3d")
+        assert parsed["account_id"] == "acc-123"
+        assert parsed["param_hash"] == "8f4b:2c3d"
+
     def test_ttl_policies_defined(self):
         """Test that all expected TTL policies are defined."""
         expected_resources = [
@@ -306,3 +354,16 @@ class TestCacheConfiguration:
         assert CacheState.STALE.value == "stale"
         assert CacheState.EXPIRED.value == "expired"
         assert CacheState.MISSING.value == "missing"
+
+    def test_warming_operations_are_validated(self):
+        """Warming operations should be checked when the config loads."""
+        _validate_warming_operations(CACHE_WARMING_OPERATIONS)
+
+        with pytest.raises(ValueError, match="operation name"):
+            _validate_warming_operations([{"priority": 1}])
+        with pytest.raises(ValueError, match="params must be a dict"):
+            _validate_warming_operations([{"operation": "email_list", "params": []}])
+        with pytest.raises(ValueError, match="JSON-serializable"):
+            _validate_warming_operations(
+                [{"operation": "email_list", "params": {"since": object()}}]
+            )
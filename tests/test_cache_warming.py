@@ -4,6 +4,7 @@ This module tests the CacheWarmer class and cache warming operations.
 """
 
 import asyncio
+import httpx
 import pytest
 import tempfile
 from datetime import datetime, timezone
@@ -11,8 +12,12 @@ from pathlib import Path
 from typing import Any
 
 from src.m365_mcp.cache import CacheManager
-from src.m365_mcp.cache_warming import CacheWarmer, get_inactive_warming_status
-from src.m365_mcp.cache_config import CacheState
+from src.m365_mcp.cache_warming import (
+    CacheWarmer,
+    _throttled_retry_after,
+    get_inactive_warming_status,
+)
+from src.m365_mcp.cache_config import CacheState, generate_cache_key
 
 
 @pytest.fixture
@@ -149,10 +154,13 @@ class TestBuildWarmingQueue:
         assert len(queue) == 3
 
         # Check first operation
-        assert queue[0]["account_id"] == "account-1"
-        assert queue[0]["operation"] == "folder_get_tree"
-        assert queue[0]["priority"] == 1
-        assert queue[0]["throttle_sec"] == 5
+        assert queue[0].account_id == "account-1"
+        assert queue[0].operation == "folder_get_tree"
+        assert queue[0].priority == 1
+        assert queue[0].throttle_sec == 5
+        assert queue[0].cache_key == generate_cache_key(
+            "account-1", "folder_get_tree", queue[0].params
+        )
 
     def test_build_queue_with_multiple_accounts(
         self, cache_manager, mock_accounts, mock_tool_executor
@@ -166,7 +174,7 @@ class TestBuildWarmingQueue:
         assert len(queue) == 6
 
         # Verify both accounts are represented
-        account_ids = {item["account_id"] for item in queue}
+        account_ids = {item.account_id for item in queue}
         assert account_ids == {"account-1", "account-2"}
 
     def test_queue_sorted_by_priority(
@@ -178,7 +186,7 @@ class TestBuildWarmingQueue:
         queue = warmer._build_warming_queue()
 
         # Verify priorities are in ascending order (lower = higher priority)
-        priorities = [item["priority"] for item in queue]
+        priorities = [item.priority for item in queue]
         assert priorities == sorted(priorities)
 
     def test_build_queue_with_empty_accounts(self, cache_manager, mock_tool_executor):
@@ -297,6 +305,83 @@ class TestWarmingLoop:
         assert warmer.warming_completed_at is not None
         assert isinstance(warmer.warming_completed_at, datetime)
 
+    async def test_warming_loop_runs_accounts_concurrently(
+        self, cache_manager, monkeypatch
+    ):
+        """Accounts warm in parallel up to the limit, each in priority order."""
+        monkeypatch.setattr(
+            "src.m365_mcp.cache_warming._WARMING_TEMPLATES",
+            (("first", {}, 1, 0), ("second", {}, 2, 0)),
+        )
+        active: set[str] = set()
+        peak = 0
+        calls: list[tuple[str, str]] = []
+
+        async def executor(account_id: str, operation: str, params: dict[str, Any]):
+            nonlocal peak
+            active.add(account_id)
+            peak = max(peak, len(active))
+            calls.append((account_id, operation))
+            await asyncio.sleep(0.01)
+            active.discard(account_id)
+            return {"ok": True}
+
+        accounts = [{"account_id": f"account-{i}"} for i in range(3)]
+        warmer = CacheWarmer(
+            cache_manager, executor, accounts, max_concurrent_accounts=2
+        )
+
+        queue = warmer._build_warming_queue()
+        await warmer._warming_loop(queue)
+
+        assert peak == 2
+        assert warmer.operations_completed == 6
+        for account in accounts:
+            ops = [op for acc, op in calls if acc == account["account_id"]]
+            assert ops == ["first", "second"]
+
+
+class TestAdaptiveThrottle:
+    """Tests for the per-operation adaptive throttle."""
+
+    def test_success_tracks_latency_but_not_below_configured(
+        self, cache_manager, mock_tool_executor
+    ):
+        """Slow operations raise the delay; fast ones decay to the floor."""
+        warmer = CacheWarmer(cache_manager, mock_tool_executor, [])
+
+        slow = warmer._adjust_throttle("email_list", 1.0, latency_sec=11.0)
+        assert slow == pytest.approx(4.0)
+
+        for _ in range(30):
+            delay = warmer._adjust_throttle("email_list", 1.0, latency_sec=0.1)
+        assert delay == 1.0
+
+    def test_throttling_doubles_and_honors_retry_after(
+        self, cache_manager, mock_tool_executor
+    ):
+        """429s back off exponentially, at least as long as Retry-After."""
+        warmer = CacheWarmer(cache_manager, mock_tool_executor, [])
+
+        assert warmer._adjust_throttle("email_list", 2.0, 0.1, retry_after=0.0) == 4.0
+        assert warmer._adjust_throttle("email_list", 2.0, 0.1, retry_after=0.0) == 8.0
+        assert warmer._adjust_throttle("email_list", 2.0, 0.1, retry_after=30) == 30
+        assert warmer._adjust_throttle("email_list", 2.0, 0.1, retry_after=0.0) == 60
+        assert warmer._adjust_throttle("contact_list", 2.0, 0.1) == 2.0
+
+    def test_only_throttling_responses_carry_retry_after(self):
+        """429/503 HTTP errors map to a retry delay; other errors do not."""
+        request = httpx.Request("GET", "https://graph.microsoft.com/v1.0/me")
+
+        def status_error(code: int, headers: dict[str, str]) -> Exception:
+            response = httpx.Response(code, headers=headers, request=request)
+            return httpx.HTTPStatusError("error", request=request, response=response)
+
+        assert _throttled_retry_after(status_error(429, {"Retry-After": "7"})) == 7.0
+        assert _throttled_retry_after(status_error(503, {})) == 0.0
+        assert _throttled_retry_after(status_error(404, {})) is None
+        assert _throttled_retry_after(ValueError("boom")) is None
+
 
 @pytest.mark.asyncio
 class TestStartWarming:
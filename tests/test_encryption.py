@@ -11,6 +11,14 @@ from unittest.mock import patch, MagicMock
 from src.m365_mcp.encryption import EncryptionKeyManager
 
 
+@pytest.fixture(autouse=True)
+def clear_key_memo():
+    """Give each test a fresh key lookup instead of a memoized key."""
+    EncryptionKeyManager.clear_cached_key()
+    yield
+    EncryptionKeyManager.clear_cached_key()
+
+
 class TestKeyGeneration:
     """Test encryption key generation functionality."""
 
@@ -251,6 +259,24 @@ class TestGetOrCreateKey:
         assert result == test_key
         mock_keyring.get_password.assert_called_once()
 
+    def test_get_or_create_key_memoizes_resolved_key(self):
+        """Repeat calls reuse the key until the keyring entry is deleted."""
+        test_key = EncryptionKeyManager.generate_key()
+        mock_keyring = MagicMock()
+        mock_keyring.get_password.return_value = test_key
+
+        with patch.dict("sys.modules", {"keyring": mock_keyring}):
+            with patch.dict(os.environ, {}, clear=True):
+                first = EncryptionKeyManager.get_or_create_key()
+                second = EncryptionKeyManager.get_or_create_key()
+                assert mock_keyring.get_password.call_count == 1
+
+                EncryptionKeyManager.delete_key_from_keyring()
+                EncryptionKeyManager.get_or_create_key()
+
+        assert first == second == test_key
+        assert mock_keyring.get_password.call_count == 2
+
     def test_get_or_create_key_from_env_when_keyring_unavailable(self):
         """Test get_or_create_key falls back to environment variable."""
         test_key = EncryptionKeyManager.generate_key()
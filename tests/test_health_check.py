@@ -0,0 +1,322 @@
+"""Tests for the health check utility."""
+
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+import pytest
+
+from src.m365_mcp import health_check
+
+
+def _client(handler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+@pytest.mark.asyncio
+async def test_check_health_async_reuses_given_client() -> None:
+    """A supplied client serves every check and is left open."""
+    calls: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.headers.get("Authorization", ""))
+        return httpx.Response(200, json={"status": "ok"})
+
+    async with _client(handler) as client:
+        first = await health_check.check_health_async(
+            "http://test/health", auth_token="tok", client=client
+        )
+        second = await health_check.check_health_async(
+            "http://test/health", client=client
+        )
+        assert not client.is_closed
+
+    assert first.success and second.success
+    assert first.details == {"status": "ok"}
+    assert calls == ["Bearer tok", ""]
+
+
+@pytest.mark.asyncio
+async def test_check_health_async_reports_http_errors() -> None:
+    """Non-200 responses are failures carrying the status code."""
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(503, text="unavailable")
+
+    async with _client(handler) as client:
+        result = await health_check.check_health_async(
+            "http://test/health", client=client
+        )
+
+    assert result.success is False
+    assert result.status_code == 503
+    assert result.error == "HTTP 503: unavailable"
+
+
+@pytest.mark.asyncio
+async def test_continuous_health_check_uses_one_client(monkeypatch) -> None:
+    """Continuous monitoring opens a single pooled client for all probes."""
+    created: list[dict] = []
+    real_client = httpx.AsyncClient
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("refused", request=request)
+
+    def make_client(**kwargs) -> httpx.AsyncClient:
+        created.append(kwargs)
+        return real_client(transport=httpx.MockTransport(handler))
+
+    monkeypatch.setattr(health_check.httpx, "AsyncClient", make_client)
+
+    with pytest.raises(RuntimeError, match="3 times"):
+        await health_check.continuous_health_check(
+            "http://test/health",
+            interval=0,
+            max_failures=3,
+            breaker=health_check.CircuitBreaker(open_duration_s=0.0),
+        )
+
+    assert len(created) == 1
+    assert created[0]["limits"] is health_check.CONTINUOUS_CHECK_LIMITS
+    assert created[0]["http2"] is health_check._HTTP2_ENABLED
+
+
+@pytest.mark.asyncio
+async def test_continuous_health_check_waits_out_open_circuit(
+    monkeypatch, caplog
+) -> None:
+    """An open breaker pauses probing; only real probes count as failures."""
+    requests: list[httpx.Request] = []
+    real_client = httpx.AsyncClient
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(500, json={})
+
+    def make_client(**kwargs) -> httpx.AsyncClient:
+        return real_client(transport=httpx.MockTransport(handler))
+
+    monkeypatch.setattr(health_check.httpx, "AsyncClient", make_client)
+    breaker = health_check.CircuitBreaker(failure_threshold=2, open_duration_s=0.05)
+
+    with caplog.at_level("WARNING", logger=health_check.__name__):
+        with pytest.raises(RuntimeError, match="4 times"):
+            await health_check.continuous_health_check(
+                "http://test/health", interval=0, max_failures=4, breaker=breaker
+            )
+
+    assert len(requests) == 4
+    assert caplog.text.count("Circuit open; waiting") == 2
+
+
+def test_open_breaker_reports_remaining_cooldown() -> None:
+    """An open breaker reports how long until the next probe may be sent."""
+    breaker = health_check.CircuitBreaker(failure_threshold=2)
+    for _ in range(2):
+        breaker.record(health_check.HealthCheckResult(False, 503, 1.0))
+    assert breaker.state is health_check.CircuitState.OPEN
+    assert 0 < breaker.retry_in() <= breaker.open_duration_s
+
+
+def test_half_open_breaker_allows_one_trial_probe() -> None:
+    """While half-open, further probes wait for the trial's result."""
+    breaker = health_check.CircuitBreaker(failure_threshold=1)
+    breaker.record(health_check.HealthCheckResult(False, None, 1.0))
+    breaker.opened_at -= breaker.open_duration_s + 1  # cooldown elapsed
+
+    assert breaker.allow() is True
+    assert breaker.state is health_check.CircuitState.HALF_OPEN
+    assert breaker.allow() is False
+
+    breaker.record(health_check.HealthCheckResult(True, 200, 1.0))
+    assert breaker.allow() is True
+    breaker.release()
+    assert breaker.allow() is True
+
+
+@pytest.mark.asyncio
+async def test_circuit_breaker_skips_requests_while_open() -> None:
+    """After repeated 5xx the breaker answers locally until the cooldown ends."""
+    requests: list[httpx.Request] = []
+    status = [500]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(status[0], json={})
+
+    breaker = health_check.CircuitBreaker(
+        failure_threshold=2, open_duration_s=30.0, half_open_success_threshold=2
+    )
+    async with _client(handler) as client:
+
+        async def probe() -> health_check.HealthCheckResult:
+            return await health_check.check_health_async(
+                "http://test/health", client=client, breaker=breaker
+            )
+
+        await probe()
+        await probe()
+        assert breaker.state is health_check.CircuitState.OPEN
+
+        skipped = await probe()
+        assert skipped.error == "circuit open"
+        assert len(requests) == 2
+
+        breaker.opened_at -= 31  # cooldown elapsed
+        status[0] = 200
+        await probe()
+        assert breaker.state is health_check.CircuitState.HALF_OPEN
+        await probe()
+        assert breaker.state is health_check.CircuitState.CLOSED
+        assert len(requests) == 4
+
+
+def test_circuit_breaker_ignores_client_errors() -> None:
+    """4xx responses mean the server is up and must not trip the breaker."""
+    breaker = health_check.CircuitBreaker(failure_threshold=1)
+
+    breaker.record(health_check.HealthCheckResult(False, 404, 1.0))
+    assert breaker.state is health_check.CircuitState.CLOSED
+
+    breaker.record(health_check.HealthCheckResult(False, None, 1.0))
+    assert breaker.state is health_check.CircuitState.OPEN
+
+
+@pytest.mark.asyncio
+async def test_continuous_health_check_keeps_fixed_cadence(monkeypatch) -> None:
+    """Probe latency is subtracted from the wait instead of added to it."""
+    real_sleep = asyncio.sleep
+    real_client = httpx.AsyncClient
+    sleeps: list[float] = []
+    probes = [0]
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        probes[0] += 1
+        await real_sleep(0.05)
+        status = 200 if probes[0] < 3 else 503
+        return httpx.Response(status, json={})
+
+    def make_client(**kwargs) -> httpx.AsyncClient:
+        return real_client(transport=httpx.MockTransport(handler))
+
+    async def record_sleep(delay: float) -> None:
+        sleeps.append(delay)
+        await real_sleep(delay)
+
+    monkeypatch.setattr(health_check.httpx, "AsyncClient", make_client)
+    monkeypatch.setattr(health_check.asyncio, "sleep", record_sleep)
+
+    with pytest.raises(RuntimeError):
+        await health_check.continuous_health_check(
+            "http://test/health", interval=0.2, max_failures=1
+        )
+
+    assert len(sleeps) == 2
+    assert all(0.0 < delay <= 0.16 for delay in sleeps)
+
+
+@pytest.mark.asyncio
+async def test_continuous_health_check_warns_when_probe_overruns(
+    monkeypatch, caplog
+) -> None:
+    """A probe slower than the interval starts the next check immediately."""
+    real_sleep = asyncio.sleep
+    real_client = httpx.AsyncClient
+    sleeps: list[float] = []
+    probes = [0]
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        probes[0] += 1
+        await real_sleep(0.05)
+        return httpx.Response(200 if probes[0] == 1 else 503, json={})
+
+    def make_client(**kwargs) -> httpx.AsyncClient:
+        return real_client(transport=httpx.MockTransport(handler))
+
+    async def record_sleep(delay: float) -> None:
+        sleeps.append(delay)
+        await real_sleep(delay)
+
+    monkeypatch.setattr(health_check.httpx, "AsyncClient", make_client)
+    monkeypatch.setattr(health_check.asyncio, "sleep", record_sleep)
+
+    with caplog.at_level("WARNING", logger=health_check.__name__):
+        with pytest.raises(RuntimeError):
+            await health_check.continuous_health_check(
+                "http://test/health", interval=0.01, max_failures=1
+            )
+
+    assert sleeps == [0.0]
+    assert "overran the 0.01s interval" in caplog.text
+
+
+@pytest.mark.asyncio
+async def test_check_health_many_runs_checks_concurrently() -> None:
+    """All URLs are probed at once and results keep the input order."""
+    in_flight = [0]
+    peak = [0]
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(0.02)
+        in_flight[0] -= 1
+        if request.url.host == "down":
+            return httpx.Response(503, text="down")
+        return httpx.Response(200, json={"host": request.url.host})
+
+    async with _client(handler) as client:
+        results = await health_check.check_health_many(
+            ["http://a/health", "http://down/health", "http://b/health"],
+            client=client,
+        )
+
+    assert peak[0] == 3
+    assert [r.success for r in results] == [True, False, True]
+    assert results[0].details == {"host": "a"}
+    assert results[1].status_code == 503
+
+
+@pytest.mark.asyncio
+async def test_check_health_many_converts_exceptions(monkeypatch) -> None:
+    """An exception escaping one check becomes a failed result."""
+    real_check = health_check.check_health_async
+
+    async def flaky_check(url, *args, **kwargs):
+        if "bad" in url:
+            raise ValueError("boom")
+        return await real_check(url, *args, **kwargs)
+
+    monkeypatch.setattr(health_check, "check_health_async", flaky_check)
+
+    async with _client(lambda request: httpx.Response(200, json={})) as client:
+        results = await health_check.check_health_many(
+            ["http://ok/health", "http://bad/health"], client=client
+        )
+
+    assert results[0].success is True
+    assert results[1].success is False
+    assert results[1].error == "ValueError('boom')"
+
+
+@pytest.mark.asyncio
+async def test_check_health_async_reads_only_error_snippet() -> None:
+    """A failing server's body is cut off after the first chunk."""
+    sent: list[int] = []
+
+    async def body():
+        for _ in range(50):
+            sent.append(1)
+            yield b"x" * 1024
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(500, content=body())
+
+    async with _client(handler) as client:
+        result = await health_check.check_health_async(
+            "http://test/health", client=client
+        )
+
+    assert result.error == "HTTP 500: " + "x" * 100
+    assert len(sent) < 50
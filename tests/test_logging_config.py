@@ -0,0 +1,174 @@
+"""Tests for logging formatters and setup."""
+
+from __future__ import annotations
+
+import logging
+import time
+from datetime import datetime
+from pathlib import Path
+
+import orjson
+import pytest
+
+from src.m365_mcp import logging_config
+from src.m365_mcp.logging_config import HumanReadableFormatter, StructuredFormatter
+
+
+def _record(msg: str = "hello %s", args: tuple = ("world",), **extra):
+    record = logging.LogRecord(
+        name="m365_mcp.test",
+        level=logging.INFO,
+        pathname=__file__,
+        lineno=42,
+        msg=msg,
+        args=args,
+        exc_info=None,
+        func="do_work",
+    )
+    for key, value in extra.items():
+        setattr(record, key, value)
+    return record
+
+
+def test_structured_formatter_emits_json_line() -> None:
+    """Each record becomes one JSON object with the expected fields."""
+    line = StructuredFormatter().format(_record(account_id="acc-1", ignored="x"))
+
+    entry = orjson.loads(line)
+    assert entry["message"] == "hello world"
+    assert entry["level"] == "INFO"
+    assert entry["logger"] == "m365_mcp.test"
+    assert entry["function"] == "do_work"
+    assert entry["line"] == 42
+    assert entry["account_id"] == "acc-1"
+    assert "ignored" not in entry
+    offset = datetime.fromisoformat(entry["timestamp"]).utcoffset()
+    assert offset is not None
+    assert offset.total_seconds() == 0
+    assert "\n" not in line
+
+
+def test_structured_formatter_serializes_each_record_once(monkeypatch) -> None:
+    """A second handler formatting the same record reuses the cached line."""
+    formatter = StructuredFormatter()
+    record = _record()
+    first = formatter.format(record)
+
+    monkeypatch.setattr(
+        logging_config.orjson, "dumps", lambda *a, **k: pytest.fail("re-encoded")
+    )
+
+    assert formatter.format(record) is first
+    assert StructuredFormatter().format(record) is first
+
+
+def test_human_readable_timestamp_uses_record_time(monkeypatch) -> None:
+    """Timestamps come from the record and reuse the formatted second."""
+    formatter = HumanReadableFormatter()
+    calls: list[float] = []
+    real_strftime = time.strftime
+
+    def counting_strftime(fmt, t):
+        calls.append(t)
+        return real_strftime(fmt, t)
+
+    monkeypatch.setattr(time, "strftime", counting_strftime)
+    first = _record()
+    first.created, first.msecs = 1_700_000_000.25, 250.0
+    second = _record()
+    second.created, second.msecs = 1_700_000_000.987, 987.0
+
+    line1 = formatter.format(first)
+    line2 = formatter.format(second)
+
+    expected = real_strftime("%Y-%m-%d %H:%M:%S", time.localtime(1_700_000_000))
+    assert line1.startswith(f"{expected}.250 ")
+    assert line2.startswith(f"{expected}.987 ")
+    assert len(calls) == 1
+
+
+def test_human_readable_color_does_not_mutate_record() -> None:
+    """Colored output leaves levelname intact for other handlers."""
+    record = _record()
+
+    colored = HumanReadableFormatter(use_color=True).format(record)
+    plain = HumanReadableFormatter(use_color=False).format(record)
+
+    assert "[\033[32mINFO\033[0m]" in colored
+    assert "[INFO] m365_mcp.test." in plain
+    assert plain.endswith("do_work:42 - hello world")
+    assert record.levelname == "INFO"
+
+
+def test_setup_logging_writes_through_queue_listener(tmp_path, monkeypatch) -> None:
+    """Records are handed to a background listener and keep exception info."""
+    for flag in ("logThreads", "logProcesses", "logMultiprocessing"):
+        monkeypatch.setattr(logging, flag, True)
+    monkeypatch.setattr(logging, "logAsyncioTasks", True, raising=False)
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    try:
+        logging_config.setup_logging(log_dir=str(tmp_path), log_level="INFO")
+        assert [type(h) for h in root.handlers] == [
+            logging_config._DeferredFormattingQueueHandler
+        ]
+        probe = _record()
+        assert probe.thread is None and probe.process is None
+
+        try:
+            raise ValueError("boom")
+        except ValueError:
+            logging.getLogger("m365_mcp.test").exception("failed %s", "op")
+    finally:
+        logging_config._stop_queue_listener()
+        root.handlers[:] = saved_handlers
+        root.setLevel(saved_level)
+
+    errors = (tmp_path / "mcp_server_errors.jsonl").read_text().splitlines()
+    entry = orjson.loads(errors[-1])
+    assert entry["message"] == "failed op"
+    assert "ValueError: boom" in entry["exception"]
+    assert "failed op" in (tmp_path / "mcp_server.log").read_text()
+
+
+def test_archive_existing_logs_moves_only_log_files(tmp_path) -> None:
+    """Current and rotated logs are archived; other entries stay put."""
+    for name in ("mcp_server.log", "mcp_server.log.1", "mcp_server_all.jsonl"):
+        (tmp_path / name).write_text(name)
+    (tmp_path / "notes.txt").write_text("keep")
+    (tmp_path / "old.log.d").mkdir()
+
+    result = logging_config.archive_existing_logs(tmp_path)
+
+    assert result["archived"] is True
+    assert result["file_count"] == 3
+    archive_dir = tmp_path / result["archive_dir"]
+    assert sorted(p.name for p in archive_dir.iterdir()) == [
+        "mcp_server.log",
+        "mcp_server.log.1",
+        "mcp_server_all.jsonl",
+    ]
+    assert (tmp_path / "notes.txt").exists()
+    assert (tmp_path / "old.log.d").is_dir()
+
+
+def test_archive_existing_logs_counts_only_successful_moves(
+    tmp_path, monkeypatch, capsys
+) -> None:
+    """A failed rename is reported and excluded from the archived count."""
+    for index in range(5):
+        (tmp_path / f"mcp_server.log.{index}").write_text("x")
+    real_replace = logging_config.os.replace
+
+    def flaky_replace(src, dest) -> None:
+        if Path(src).name == "mcp_server.log.3":
+            raise PermissionError("locked")
+        real_replace(src, dest)
+
+    monkeypatch.setattr(logging_config.os, "replace", flaky_replace)
+
+    result = logging_config.archive_existing_logs(tmp_path)
+
+    assert result["file_count"] == 4
+    assert (tmp_path / "mcp_server.log.3").exists()
+    assert "Failed to archive mcp_server.log.3: locked" in capsys.readouterr().err
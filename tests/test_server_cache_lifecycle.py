@@ -1,5 +1,7 @@
 from __future__ import annotations
 
+import threading
+from types import SimpleNamespace
 from unittest.mock import MagicMock
 
 import pytest
@@ -37,13 +39,20 @@ async def test_cache_runtime_enabled_reports_worker_and_stops_cleanly(
         encryption_enabled=False,
     )
     monkeypatch.setattr(cache_config, "CACHE_WARMING_ENABLED", True)
-    monkeypatch.setattr(cache_tools, "get_cache_manager", lambda: manager)
+    opened_on: list[threading.Thread] = []
+
+    def open_manager() -> CacheManager:
+        opened_on.append(threading.current_thread())
+        return manager
+
+    monkeypatch.setattr(cache_tools, "get_cache_manager", open_manager)
     monkeypatch.setattr(server, "_get_cache_warming_accounts", lambda: [])
 
     runtime = await server._start_cache_runtime()
 
     assert runtime is not None
     try:
+        assert opened_on and opened_on[0] is not threading.main_thread()
         assert runtime.worker.is_running is True
         assert cache_tools._warming_status_provider is runtime.worker
 
@@ -55,3 +64,26 @@ async def test_cache_runtime_enabled_reports_worker_and_stops_cleanly(
 
     assert runtime.worker.is_running is False
     assert cache_tools._warming_status_provider is None
+
+
+@pytest.mark.asyncio
+async def test_cache_refresh_runs_sync_tools_off_event_loop(monkeypatch) -> None:
+    """Blocking tool functions should execute in a worker thread."""
+    from src.m365_mcp.tools import contact
+
+    seen: dict[str, object] = {}
+
+    def fake_contact_list(account_id: str, limit: int) -> list[dict[str, str]]:
+        seen["thread"] = threading.current_thread()
+        seen["kwargs"] = {"account_id": account_id, "limit": limit}
+        return [{"id": "c1"}]
+
+    monkeypatch.setattr(contact, "contact_list", SimpleNamespace(fn=fake_contact_list))
+
+    result = await server._execute_cache_refresh_tool(
+        "acc-1", "contact_list", {"limit": 5}
+    )
+
+    assert result == [{"id": "c1"}]
+    assert seen["kwargs"] == {"account_id": "acc-1", "limit": 5}
+    assert seen["thread"] is not threading.main_thread()